@@ -1,9 +1,26 @@
 import asyncio
-import json
 import logging
+import random
 import re
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import weakref
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
 
 import aiohttp
 import discord
@@ -15,12 +32,28 @@ from discord.member import Member
 from discord.role import Role
 from discord.user import User
 
-from . import data
+from . import cache, data, formatters, tables, upstreams
 from .settings import (
     BUGOUT_BROOD_URL,
     BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
     BUGOUT_RESOURCE_TYPE_DISCORD_BOT_USER_IDENTIFIER,
     COLORS,
+    LEADERBOARD_BROOD_RESOURCES_PAGE_SIZE,
+    LEADERBOARD_BROOD_RESOURCES_PAGES_IN_FLIGHT,
+    LEADERBOARD_HTTP_DNS_CACHE_TTL,
+    LEADERBOARD_HTTP_KEEPALIVE_TIMEOUT,
+    LEADERBOARD_HTTP_POOL_LIMIT,
+    LEADERBOARD_HTTP_POOL_LIMIT_PER_HOST,
+    LEADERBOARD_HTTP_RETRIES,
+    LEADERBOARD_HTTP_RETRY_BACKOFF,
+    LEADERBOARD_HTTP_RETRY_MAX_DELAY,
+    LEADERBOARD_INFO_CACHE_SIZE,
+    LEADERBOARD_INFO_CACHE_STALE_TTL,
+    LEADERBOARD_INFO_CACHE_TTL,
+    LEADERBOARD_RANKING_EMBEDS_CACHE_SIZE,
+    LEADERBOARD_RANKING_EMBEDS_CACHE_TTL,
+    LEADERBOARD_SCORES_CACHE_SIZE,
+    LEADERBOARD_SCORES_CACHE_TTL,
     MOONSTREAM_APPLICATION_ID,
     MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
     MOONSTREAM_ENGINE_API_URL,
@@ -30,6 +63,48 @@ logger = logging.getLogger(__name__)
 
 QUERY_REGEX = re.compile("[\[\]@#$%^&?;`/]")
 
+IDEMPOTENT_METHODS = {
+    data.RequestMethods.GET,
+    data.RequestMethods.PUT,
+    data.RequestMethods.DELETE,
+}
+
+# Long-lived session shared by all upstream calls, owned by bot or API application
+_http_session: Optional[aiohttp.ClientSession] = None
+
+# Serialize read-modify-write of same server configuration resource
+_server_config_locks: "weakref.WeakValueDictionary[uuid.UUID, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+leaderboard_info_cache: cache.TTLCache[data.LeaderboardInfo] = cache.TTLCache(
+    name="leaderboard_info",
+    maxsize=LEADERBOARD_INFO_CACHE_SIZE,
+    ttl=LEADERBOARD_INFO_CACHE_TTL,
+    stale_ttl=LEADERBOARD_INFO_CACHE_STALE_TTL,
+)
+_leaderboard_info_refreshes: Dict[uuid.UUID, asyncio.Task] = {}
+
+# In-flight GET requests by url with params and credentials
+_inflight_requests: Dict[
+    Tuple[str, str, Optional[str]], "asyncio.Future[Optional[Any]]"
+] = {}
+coalesced_requests_count = 0
+
+# Versioned by leaderboard last_updated_at
+leaderboard_scores_cache: cache.TTLCache[List[data.Score]] = cache.TTLCache(
+    name="leaderboard_scores",
+    maxsize=LEADERBOARD_SCORES_CACHE_SIZE,
+    ttl=LEADERBOARD_SCORES_CACHE_TTL,
+)
+
+# Finished embed payloads of /ranking, versioned by rendered data
+ranking_embeds_cache: cache.TTLCache[Dict[str, Any]] = cache.TTLCache(
+    name="ranking_embeds",
+    maxsize=LEADERBOARD_RANKING_EMBEDS_CACHE_SIZE,
+    ttl=LEADERBOARD_RANKING_EMBEDS_CACHE_TTL,
+)
+
 
 class QueryNotValid(Exception):
     """
@@ -37,13 +112,54 @@ class QueryNotValid(Exception):
     """
 
 
+class ResourcesNotFetched(Exception):
+    """
+    Raised when page of Brood resources could not be fetched.
+    """
+
+
+class ServerConfigConflict(Exception):
+    """
+    Raised when server configuration in Brood changed since it was read
+    or requested change does not apply to it anymore.
+    """
+
+    def __init__(self, message: str, resource: BugoutResource):
+        super().__init__(message)
+        self.resource = resource
+
+
+PageProvider = Callable[[int, int], Awaitable[List[List[Any]]]]
+
+
+def list_page_provider(wrapped_fields: List[List[Any]]) -> PageProvider:
+    async def provider(offset: int, limit: int) -> List[List[Any]]:
+        return wrapped_fields[offset : offset + limit]
+
+    return provider
+
+
 class PaginationView(discord.ui.View):
+    """
+    Paginated embed fields. Pages are requested from page provider by
+    (offset, limit) when shown, next page is prefetched and few recent
+    pages are kept, so only visible pages are held in memory.
+
+    With wrapped_fields list pages are sliced from it as before. Without
+    total_items number of pages is unknown and next button is enabled
+    while pages are full.
+    """
+
     def __init__(
         self,
         title: str,
         description: str,
-        wrapped_fields: List[List[Any]],
+        wrapped_fields: Optional[List[List[Any]]] = None,
         ephemeral: bool = False,
+        page_provider: Optional[PageProvider] = None,
+        total_items: Optional[int] = None,
+        page_size: int = 5,
+        pages_cache_size: int = 3,
         *args,
         **kwargs,
     ):
@@ -54,27 +170,114 @@ class PaginationView(discord.ui.View):
         self.title = title
         self.description = description
         self.wrapped_fields = wrapped_fields
+        if page_provider is None:
+            page_provider = list_page_provider(
+                wrapped_fields if wrapped_fields is not None else []
+            )
+            if total_items is None:
+                total_items = len(wrapped_fields) if wrapped_fields is not None else 0
+        self.page_provider = page_provider
 
         self.current_page: int = 1
-        self.offset: int = 5
-        fields_len = len(wrapped_fields)
-        self.total_pages = int(fields_len / self.offset)
-        if fields_len == 0:
-            self.total_pages = self.current_page
-        elif fields_len % self.offset != 0:
-            self.total_pages += 1
+        self.offset: int = max(page_size, 1)
+        self.total_pages: Optional[int] = None
+        if total_items is not None:
+            self.total_pages = int(total_items / self.offset)
+            if total_items == 0:
+                self.total_pages = self.current_page
+            elif total_items % self.offset != 0:
+                self.total_pages += 1
+
+        self.pages_cache_size = max(pages_cache_size, 1)
+        self._pages: "OrderedDict[int, List[List[Any]]]" = OrderedDict()
+        self._page_loads: Dict[int, asyncio.Task] = {}
 
         self.ephemeral = ephemeral
 
     async def send(self, interaction: discord.Interaction):
         await interaction.response.send_message(view=self, ephemeral=self.ephemeral)
         self.message = await interaction.original_response()
-        await self.update_view(self.wrapped_fields[: self.offset])
+        await self.show_page(self.current_page)
+
+    def _cache_page(self, page: int, wrapped_fields: List[List[Any]]) -> None:
+        self._pages[page] = wrapped_fields
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.pages_cache_size:
+            self._pages.popitem(last=False)
+
+    def _load_page(self, page: int) -> "asyncio.Task[List[List[Any]]]":
+        task = self._page_loads.get(page)
+        if task is not None:
+            return task
+
+        task = asyncio.create_task(
+            self.page_provider((page - 1) * self.offset, self.offset)
+        )
+        self._page_loads[page] = task
+
+        def loaded(task: "asyncio.Task[List[List[Any]]]") -> None:
+            self._page_loads.pop(page, None)
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                logger.warning(f"Unable to load page {page}, err: {task.exception()}")
+                return
+            self._cache_page(page, task.result())
+
+        task.add_done_callback(loaded)
+        return task
 
-    async def update_view(self, wrapped_fields: List[List[Any]]):
+    async def get_page(self, page: int) -> List[List[Any]]:
+        """
+        Page from cache, in-flight prefetch or page provider.
+        """
+        wrapped_fields = self._pages.get(page)
+        if wrapped_fields is not None:
+            self._pages.move_to_end(page)
+            return wrapped_fields
+        return await asyncio.shield(self._load_page(page))
+
+    def has_next_page(self, wrapped_fields: List[List[Any]]) -> bool:
+        if self.total_pages is not None:
+            return self.current_page < self.total_pages
+        return len(wrapped_fields) >= self.offset
+
+    def prefetch_page(self, page: int) -> None:
+        if page not in self._pages:
+            self._load_page(page)
+
+    async def show_page(self, page: int) -> None:
+        try:
+            wrapped_fields = await self.get_page(page)
+        except Exception:
+            # Stay at current page, it is most likely cached
+            page = self.current_page
+            try:
+                wrapped_fields = await self.get_page(page)
+            except Exception:
+                wrapped_fields = []
+        else:
+            if len(wrapped_fields) == 0 and self.total_pages is None and page > 1:
+                # Previous page was the last one, number of pages is known now
+                self.total_pages = page - 1
+                page = self.total_pages
+                wrapped_fields = await self.get_page(page)
+
+        self.current_page = page
+        has_next = self.has_next_page(wrapped_fields)
+        await self.update_view(wrapped_fields, has_next=has_next)
+        if has_next:
+            self.prefetch_page(self.current_page + 1)
+
+    async def update_view(
+        self, wrapped_fields: List[List[Any]], has_next: Optional[bool] = None
+    ):
         """
         Update current view and navigation buttons to handle pagination.
         """
+        if has_next is None:
+            has_next = self.has_next_page(wrapped_fields)
+
         if self.current_page == 1:
             self.button_previous.disabled = True
             self.button_previous.style = discord.ButtonStyle.gray
@@ -82,7 +285,7 @@ class PaginationView(discord.ui.View):
             self.button_previous.disabled = False
             self.button_previous.style = discord.ButtonStyle.primary
 
-        if self.current_page == self.total_pages:
+        if not has_next:
             self.button_next.disabled = True
             self.button_next.style = discord.ButtonStyle.gray
         else:
@@ -100,27 +303,24 @@ class PaginationView(discord.ui.View):
             view=self,
         )
 
+    async def on_timeout(self) -> None:
+        for task in list(self._page_loads.values()):
+            task.cancel()
+        self._pages.clear()
+
     @discord.ui.button(label="<", row=2)
     async def button_previous(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         await interaction.response.defer()
-        self.current_page -= 1
-        until_item = self.current_page * self.offset
-        await self.update_view(
-            wrapped_fields=self.wrapped_fields[until_item - self.offset : until_item]
-        )
+        await self.show_page(max(self.current_page - 1, 1))
 
     @discord.ui.button(label=">", row=2)
     async def button_next(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         await interaction.response.defer()
-        self.current_page += 1
-        until_item = self.current_page * self.offset
-        await self.update_view(
-            wrapped_fields=self.wrapped_fields[until_item - self.offset : until_item]
-        )
+        await self.show_page(self.current_page + 1)
 
 
 def score_converter(
@@ -146,6 +346,20 @@ def prepare_log_message(
     return msg
 
 
+def get_interaction_option(
+    interaction: discord.Interaction, name: str
+) -> Optional[Any]:
+    """
+    Raw value of slash command option, available before command is invoked.
+    """
+    if interaction.data is None:
+        return None
+    for option in interaction.data.get("options", []):
+        if option.get("name") == name:
+            return option.get("value")
+    return None
+
+
 def query_input_validation(query_input: str) -> str:
     """
     Sanitize provided input for query.
@@ -174,10 +388,13 @@ def prepare_dynamic_embed_with_pagination(
     description: str,
     wrapped_fields: List[List[Any]],
     current_page: int,
-    total_pages: int,
+    total_pages: Optional[int] = None,
 ) -> Embed:
     description += "\n"
-    description += f"Page: {current_page}/{total_pages}"
+    if total_pages is not None:
+        description += f"Page: {current_page}/{total_pages}"
+    else:
+        description += f"Page: {current_page}"
     embed = Embed(
         title=title,
         description=description,
@@ -233,60 +450,402 @@ def auth_middleware(
     return False
 
 
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create client session with keep-alive connection pool and DNS cache.
+    Should be called from running event loop.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=LEADERBOARD_HTTP_POOL_LIMIT,
+        limit_per_host=LEADERBOARD_HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=LEADERBOARD_HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=LEADERBOARD_HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+def set_http_session(session: Optional[aiohttp.ClientSession]) -> None:
+    """
+    Register session to be used by caller, pass None to unregister it.
+    """
+    global _http_session
+    _http_session = session
+
+
+async def open_http_session() -> aiohttp.ClientSession:
+    """
+    Create and register shared session, existing opened session will be reused.
+    """
+    if _http_session is not None and not _http_session.closed:
+        return _http_session
+
+    session = create_http_session()
+    set_http_session(session)
+    logger.debug("Opened shared HTTP session")
+
+    return session
+
+
+async def close_http_session() -> None:
+    """
+    Close shared session and release pooled connections.
+    """
+    session = _http_session
+    set_http_session(None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.debug("Closed shared HTTP session")
+
+
 async def caller(
     url: str,
-    semaphore: asyncio.Semaphore,
     method: data.RequestMethods = data.RequestMethods.GET,
     request_data: Optional[Dict[str, Any]] = None,
     token: Optional[str] = None,
     auth_schema: str = "Bearer",
     timeout: int = 5,
+    upstream: Optional[data.Upstreams] = None,
+    coalesce: bool = True,
 ) -> Optional[Any]:
-    async with semaphore:
+    """
+    Request upstream with shared concurrency limit, upstream is detected
+    from url if not specified.
+
+    Concurrent identical GET requests (same url with params and credentials)
+    are coalesced and share one in-flight request and its response.
+    """
+    if method != data.RequestMethods.GET or coalesce is False:
+        return await limited_caller(
+            url=url,
+            method=method,
+            request_data=request_data,
+            token=token,
+            auth_schema=auth_schema,
+            timeout=timeout,
+            upstream=upstream,
+        )
+
+    key = (url, auth_schema, token)
+    future = _inflight_requests.get(key)
+    if future is None:
+        future = asyncio.ensure_future(
+            limited_caller(
+                url=url,
+                method=method,
+                token=token,
+                auth_schema=auth_schema,
+                timeout=timeout,
+                upstream=upstream,
+            )
+        )
+        _inflight_requests[key] = future
+
+        def forget_request(f: "asyncio.Future[Optional[Any]]") -> None:
+            if _inflight_requests.get(key) is f:
+                del _inflight_requests[key]
+
+        future.add_done_callback(forget_request)
+    else:
+        global coalesced_requests_count
+        coalesced_requests_count += 1
+        logger.debug(f"Coalesced request to {url}")
+
+    # Shield shared request from cancellation of one of waiters
+    return await asyncio.shield(future)
+
+
+async def breaker_request(
+    breaker: upstreams.CircuitBreaker,
+    url: str,
+    method: data.RequestMethods = data.RequestMethods.GET,
+    request_data: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    auth_schema: str = "Bearer",
+    timeout: int = 5,
+) -> Optional[Any]:
+    """
+    Request allowed by circuit breaker. Outcome is recorded by caller, only
+    cancelled probe is released here, otherwise circuit stays half-open.
+    """
+    is_probe = breaker.before_request()
+    try:
+        return await session_request(
+            url=url,
+            method=method,
+            request_data=request_data,
+            token=token,
+            auth_schema=auth_schema,
+            timeout=timeout,
+        )
+    except asyncio.CancelledError:
+        if is_probe:
+            breaker.abort_probe()
+        raise
+
+
+async def limited_caller(
+    url: str,
+    method: data.RequestMethods = data.RequestMethods.GET,
+    request_data: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    auth_schema: str = "Bearer",
+    timeout: int = 5,
+    upstream: Optional[data.Upstreams] = None,
+) -> Optional[Any]:
+    """
+    Request upstream guarded by upstream limiter and host circuit breaker.
+    Idempotent requests are retried with jittered exponential backoff.
+
+    Retried DELETE responded with 404 returns empty response, resource was
+    removed by previous attempt with lost response.
+    """
+    if upstream is None:
+        upstream = upstreams.detect_upstream(url)
+    limiter = upstreams.get_limiter(upstream) if upstream is not None else None
+    breaker = upstreams.get_breaker(url)
+
+    retries = LEADERBOARD_HTTP_RETRIES if method in IDEMPOTENT_METHODS else 0
+    for attempt in range(retries + 1):
         try:
-            async with aiohttp.ClientSession() as session:
-                request_method = getattr(session, method.value, session.get)
-                request_kwargs: Dict[str, Any] = {"timeout": timeout, "headers": {}}
-                if (
-                    method == data.RequestMethods.POST
-                    or method == data.RequestMethods.PUT
-                ):
-                    request_kwargs["json"] = request_data
-                    request_kwargs["headers"]["Content-Type"] = "application/json"
-                if token is not None:
-                    request_kwargs["headers"][
-                        "Authorization"
-                    ] = f"{auth_schema} {token}"
-                async with request_method(url, **request_kwargs) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
-                    return json_response
-        except Exception as e:
-            logger.error(str(e))
+            if limiter is None:
+                response = await breaker_request(
+                    breaker=breaker,
+                    url=url,
+                    method=method,
+                    request_data=request_data,
+                    token=token,
+                    auth_schema=auth_schema,
+                    timeout=timeout,
+                )
+            else:
+                # Slot is taken before circuit check, so request rejected by
+                # limiter never holds half-open probe
+                async with limiter:
+                    response = await breaker_request(
+                        breaker=breaker,
+                        url=url,
+                        method=method,
+                        request_data=request_data,
+                        token=token,
+                        auth_schema=auth_schema,
+                        timeout=timeout,
+                    )
+            breaker.record_success()
+            return response
+        except (upstreams.CircuitOpen, upstreams.UpstreamLimitExceeded) as e:
+            logger.warning(str(e))
             return None
+        except Exception as e:
+            if attempt > 0 and is_already_deleted(method=method, error=e):
+                breaker.record_success()
+                logger.info(f"Resource at {url} is deleted by previous attempt")
+                return {}
+
+            is_retryable = is_retryable_error(e)
+            if is_retryable:
+                breaker.record_failure(e)
+            else:
+                # Upstream responded, so host is alive
+                breaker.record_success()
+
+            if not is_retryable or attempt >= retries:
+                logger.error(str(e) if str(e) != "" else type(e).__name__)
+                return None
+
+            delay = retry_delay(attempt=attempt, error=e)
+            logger.warning(
+                f"Request {method.value.upper()} {url} failed with {type(e).__name__} {e}, retry {attempt + 1}/{retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
 
+    return None
 
-async def get_leaderboard_info(l_id: uuid.UUID) -> Optional[data.LeaderboardInfo]:
+
+def is_already_deleted(method: data.RequestMethods, error: Exception) -> bool:
+    return (
+        method == data.RequestMethods.DELETE
+        and isinstance(error, aiohttp.ClientResponseError)
+        and error.status == 404
+    )
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Connection problems, timeouts, throttling and server errors are worth retrying.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def retry_delay(attempt: int, error: Optional[Exception] = None) -> float:
+    """
+    Delay before next attempt, Retry-After header of response is respected,
+    otherwise exponential backoff with full jitter.
+    """
+    if isinstance(error, aiohttp.ClientResponseError) and error.headers is not None:
+        retry_after = parse_retry_after(error.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, LEADERBOARD_HTTP_RETRY_MAX_DELAY)
+
+    return random.uniform(
+        0,
+        min(
+            LEADERBOARD_HTTP_RETRY_MAX_DELAY,
+            LEADERBOARD_HTTP_RETRY_BACKOFF * 2**attempt,
+        ),
+    )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After header could be in seconds or HTTP date.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+    except Exception:
+        return None
+
+
+async def session_request(
+    url: str,
+    method: data.RequestMethods = data.RequestMethods.GET,
+    request_data: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    auth_schema: str = "Bearer",
+    timeout: int = 5,
+) -> Any:
+    session = _http_session
+    if session is None or session.closed:
+        # Fallback for one-off calls outside of bot or API application (cli)
+        async with aiohttp.ClientSession() as one_off_session:
+            return await request(
+                session=one_off_session,
+                url=url,
+                method=method,
+                request_data=request_data,
+                token=token,
+                auth_schema=auth_schema,
+                timeout=timeout,
+            )
+
+    return await request(
+        session=session,
+        url=url,
+        method=method,
+        request_data=request_data,
+        token=token,
+        auth_schema=auth_schema,
+        timeout=timeout,
+    )
+
+
+async def request(
+    session: aiohttp.ClientSession,
+    url: str,
+    method: data.RequestMethods = data.RequestMethods.GET,
+    request_data: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    auth_schema: str = "Bearer",
+    timeout: int = 5,
+) -> Any:
+    request_method = getattr(session, method.value, session.get)
+    request_kwargs: Dict[str, Any] = {
+        "timeout": aiohttp.ClientTimeout(total=timeout),
+        "headers": {},
+    }
+    if method == data.RequestMethods.POST or method == data.RequestMethods.PUT:
+        request_kwargs["json"] = request_data
+        request_kwargs["headers"]["Content-Type"] = "application/json"
+    if token is not None:
+        request_kwargs["headers"]["Authorization"] = f"{auth_schema} {token}"
+    async with request_method(url, **request_kwargs) as response:
+        response.raise_for_status()
+        json_response = await response.json()
+        return json_response
+
+
+async def fetch_leaderboard_info(l_id: uuid.UUID) -> Optional[data.LeaderboardInfo]:
     l_info: Optional[data.LeaderboardInfo] = None
     response = await caller(
         url=f"{MOONSTREAM_ENGINE_API_URL}/leaderboard/info?leaderboard_id={str(l_id)}",
-        semaphore=asyncio.Semaphore(1),
     )
     if response is not None:
         logger.debug(f"Received info for leaderboard with ID: {response.get('id')}")
         l_info = data.LeaderboardInfo(**response)
+        leaderboard_info_cache.set(l_id, l_info)
     return l_info
 
 
-async def get_scores(l_id: uuid.UUID) -> Optional[List[data.Score]]:
-    l_scores: Optional[List[data.Score]] = None
+async def refresh_leaderboard_info(l_id: uuid.UUID) -> None:
+    try:
+        await fetch_leaderboard_info(l_id)
+    finally:
+        _leaderboard_info_refreshes.pop(l_id, None)
+
+
+def schedule_leaderboard_info_refresh(l_id: uuid.UUID) -> None:
+    """
+    Refresh stale leaderboard info in background, one refresh per leaderboard at time.
+    """
+    if l_id in _leaderboard_info_refreshes:
+        return
+    _leaderboard_info_refreshes[l_id] = asyncio.create_task(
+        refresh_leaderboard_info(l_id)
+    )
+
+
+async def get_leaderboard_info(l_id: uuid.UUID) -> Optional[data.LeaderboardInfo]:
+    """
+    Returns leaderboard info from cache, stale info is returned immediately
+    and refreshed in background.
+    """
+    entry, is_fresh = leaderboard_info_cache.lookup(l_id)
+    if entry is not None:
+        if not is_fresh:
+            schedule_leaderboard_info_refresh(l_id)
+        return entry.value
+
+    return await fetch_leaderboard_info(l_id)
+
+
+async def get_scores_page(
+    l_id: uuid.UUID, offset: int = 0, limit: int = 10
+) -> Optional[List[data.Score]]:
+    """
+    Returns page of leaderboard scores from engine API without caching.
+    """
     response = await caller(
-        url=f"{MOONSTREAM_ENGINE_API_URL}/leaderboard/?leaderboard_id={str(l_id)}&limit=10&offset=0",
-        semaphore=asyncio.Semaphore(1),
+        url=f"{MOONSTREAM_ENGINE_API_URL}/leaderboard/?leaderboard_id={str(l_id)}&limit={limit}&offset={offset}",
         timeout=30,
     )
-    if response is not None:
-        l_scores = [data.Score(**s) for s in response]
+    if response is None:
+        return None
+    return [data.Score(**s) for s in response]
+
+
+async def get_scores(
+    l_id: uuid.UUID, version: Optional[datetime] = None
+) -> Optional[List[data.Score]]:
+    """
+    Returns top scores of leaderboard. If version (leaderboard last_updated_at)
+    provided, scores are cached until leaderboard recomputed.
+    """
+    if version is not None:
+        cached_scores = leaderboard_scores_cache.get(l_id, version=version)
+        if cached_scores is not None:
+            return cached_scores
+
+    l_scores = await get_scores_page(l_id, offset=0, limit=10)
+    if l_scores is not None and version is not None:
+        leaderboard_scores_cache.set(l_id, l_scores, version=version)
     return l_scores
 
 
@@ -302,18 +861,79 @@ async def process_leaderboard_info_with_scores(
         logger.error(e)
         return None, None
 
+    entry, is_fresh = leaderboard_info_cache.lookup(leaderboard_id)
+    if entry is not None:
+        if not is_fresh:
+            schedule_leaderboard_info_refresh(leaderboard_id)
+        l_info: Optional[data.LeaderboardInfo] = entry.value
+        l_scores = await get_scores(
+            leaderboard_id,
+            version=l_info.last_updated_at if l_info is not None else None,
+        )
+        return l_info, l_scores
+
+    # Nothing known about leaderboard version yet, fetch both at once
     l_info, l_scores = await asyncio.gather(
-        get_leaderboard_info(leaderboard_id), get_scores(leaderboard_id)
+        fetch_leaderboard_info(leaderboard_id), get_scores(leaderboard_id)
     )
+    if (
+        l_info is not None
+        and l_info.last_updated_at is not None
+        and l_scores is not None
+    ):
+        leaderboard_scores_cache.set(
+            leaderboard_id, l_scores, version=l_info.last_updated_at
+        )
 
     return l_info, l_scores
 
 
+def get_cached_leaderboard_info_with_scores(
+    l_id: str,
+) -> Tuple[Optional[data.LeaderboardInfo], Optional[List[data.Score]]]:
+    """
+    Leaderboard info and scores only from caches, without upstream requests.
+    """
+    try:
+        leaderboard_id = uuid.UUID(query_input_validation(l_id))
+    except Exception:
+        return None, None
+
+    entry, _ = leaderboard_info_cache.lookup(leaderboard_id)
+    if entry is None or entry.value.last_updated_at is None:
+        return None, None
+    l_scores = leaderboard_scores_cache.get(
+        leaderboard_id, version=entry.value.last_updated_at
+    )
+    return entry.value, l_scores
+
+
+def ranking_embed_version(
+    l_info: data.LeaderboardInfo, l_scores: Optional[List[data.Score]] = None
+) -> Tuple[Any, ...]:
+    """
+    Version of rendered leaderboard. Scores are cached by last_updated_at, so
+    they are hashed only for leaderboards without it.
+    """
+    scores_version: Any = l_info.last_updated_at
+    if scores_version is None and l_scores is not None:
+        scores_version = hash(tuple((s.rank, s.address, s.score) for s in l_scores))
+    return (scores_version, l_scores is None, l_info.title, l_info.description)
+
+
+def caches_stats() -> List[data.CacheStats]:
+    return [
+        leaderboard_info_cache.stats(),
+        leaderboard_scores_cache.stats(),
+        ranking_embeds_cache.stats(),
+        formatters.score_formatters_cache.stats(),
+    ]
+
+
 async def get_score(l_id: uuid.UUID, address: str) -> Optional[data.Score]:
     l_score: Optional[data.Score] = None
     response = await caller(
         url=f"{MOONSTREAM_ENGINE_API_URL}/leaderboard/position?leaderboard_id={str(l_id)}&address={address}&normalize_addresses=False&window_size=0&limit=10&offset=0",
-        semaphore=asyncio.Semaphore(1),
     )
     if response is not None:
         l_scores = [data.Score(**s) for s in response]
@@ -332,6 +952,131 @@ async def process_leaderboard_info_with_score(
     return l_info, l_score
 
 
+async def get_resources_page(
+    params: Dict[str, Any], limit: int, offset: int
+) -> Optional[List[BugoutResource]]:
+    """
+    Fetch and parse one page of Brood resources.
+    """
+    response = await caller(
+        url=f"{BUGOUT_BROOD_URL}/resources/?{urlencode({**params, 'limit': limit, 'offset': offset})}",
+        token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
+        timeout=30,
+        # Not needed pages are cancelled by iterator
+        coalesce=False,
+    )
+    if response is None:
+        return None
+
+    resources: List[BugoutResource] = []
+    for r in response.get("resources", []):
+        try:
+            resources.append(BugoutResource(**r))
+        except Exception as e:
+            logger.warning(f"Malformed resource with ID: {r.get('id')}, err: {e}")
+    return resources
+
+
+async def iterate_resources(
+    resource_type: str,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = LEADERBOARD_BROOD_RESOURCES_PAGE_SIZE,
+    pages_in_flight: int = LEADERBOARD_BROOD_RESOURCES_PAGES_IN_FLIGHT,
+) -> AsyncIterator[List[BugoutResource]]:
+    """
+    Yields pages of application resources of specified type in order,
+    next pages are requested while current one is processed.
+
+    Raises ResourcesNotFetched if any page failed, so caller do not
+    mistake partial result for complete one.
+    """
+    request_params: Dict[str, Any] = {
+        "application_id": MOONSTREAM_APPLICATION_ID,
+        "type": resource_type,
+    }
+    if params is not None:
+        request_params.update(params)
+
+    pending: Deque[asyncio.Task] = deque()
+    next_offset = 0
+
+    def schedule_page() -> None:
+        nonlocal next_offset
+        pending.append(
+            asyncio.create_task(
+                get_resources_page(
+                    params=request_params, limit=page_size, offset=next_offset
+                )
+            )
+        )
+        next_offset += page_size
+
+    for _ in range(max(pages_in_flight, 1)):
+        schedule_page()
+
+    # First resource ID of each page, protects from endless loop if upstream ignores offset
+    seen_page_heads: Set[uuid.UUID] = set()
+    try:
+        while len(pending) != 0:
+            page = await pending.popleft()
+            if page is None:
+                raise ResourcesNotFetched(
+                    f"Unable to fetch page of {resource_type} resources at offset {next_offset - page_size * (len(pending) + 1)}"
+                )
+
+            if len(page) != 0:
+                if page[0].id in seen_page_heads:
+                    return
+                seen_page_heads.add(page[0].id)
+                yield page
+
+            # Page is not full or upstream returned everything at once
+            if len(page) != page_size:
+                return
+
+            schedule_page()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def get_filtered_resources(
+    resource_type: str, params: Dict[str, Any]
+) -> Optional[List[BugoutResource]]:
+    """
+    Fetch all resources matching resource data filter, None if request failed.
+    """
+    resources: List[BugoutResource] = []
+    try:
+        async for page in iterate_resources(
+            resource_type=resource_type, params=params, pages_in_flight=1
+        ):
+            resources.extend(page)
+    except ResourcesNotFetched as e:
+        logger.error(f"{e}, filter: {params}")
+        return None
+
+    return resources
+
+
+async def get_user_identities_resources(
+    discord_user_id: int,
+) -> Optional[List[BugoutResource]]:
+    return await get_filtered_resources(
+        resource_type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_USER_IDENTIFIER,
+        params={"discord_user_id": discord_user_id},
+    )
+
+
+async def get_server_config_resources(
+    discord_server_id: int,
+) -> Optional[List[BugoutResource]]:
+    return await get_filtered_resources(
+        resource_type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
+        params={"discord_server_id": discord_server_id},
+    )
+
+
 async def push_user_identity(
     discord_user_id: int,
     identifier: str,
@@ -340,7 +1085,6 @@ async def push_user_identity(
     resource: Optional[BugoutResource] = None
     response = await caller(
         url=f"{BUGOUT_BROOD_URL}/resources",
-        semaphore=asyncio.Semaphore(1),
         method=data.RequestMethods.POST,
         request_data={
             "application_id": MOONSTREAM_APPLICATION_ID,
@@ -367,13 +1111,13 @@ async def remove_user_identity(resource_id: uuid.UUID) -> Optional[uuid.UUID]:
     removed_resource_id: Optional[uuid.UUID] = None
     response = await caller(
         url=f"{BUGOUT_BROOD_URL}/resources/{str(resource_id)}",
-        semaphore=asyncio.Semaphore(1),
         method=data.RequestMethods.DELETE,
         token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
     )
 
     if response is not None:
-        removed_resource_id = uuid.UUID(response["id"])
+        # Empty response of retried request, resource is already removed
+        removed_resource_id = uuid.UUID(response.get("id", str(resource_id)))
         logger.info(
             f"Removed user identity represented as resource with ID: {str(removed_resource_id)}"
         )
@@ -381,6 +1125,114 @@ async def remove_user_identity(resource_id: uuid.UUID) -> Optional[uuid.UUID]:
     return removed_resource_id
 
 
+def serialize_config_leaderboard(
+    leaderboard: data.ConfigLeaderboard,
+) -> Dict[str, Any]:
+    """
+    Leaderboard as stored in Brood resource, leaderboard info is not stored.
+    """
+    return {
+        "leaderboard_id": str(leaderboard.leaderboard_id),
+        "short_name": leaderboard.short_name,
+        "channel_ids": list(leaderboard.channel_ids),
+    }
+
+
+def server_config_lock(resource_id: uuid.UUID) -> asyncio.Lock:
+    lock = _server_config_locks.get(resource_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _server_config_locks[resource_id] = lock
+    return lock
+
+
+async def get_resource(resource_id: uuid.UUID) -> Optional[BugoutResource]:
+    response = await caller(
+        url=f"{BUGOUT_BROOD_URL}/resources/{str(resource_id)}",
+        token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
+        # Read before write should not share response with other writers
+        coalesce=False,
+    )
+    if response is None:
+        return None
+
+    return BugoutResource(**response)
+
+
+async def patch_server_config_leaderboards(
+    resource_id: uuid.UUID,
+    add_leaderboard: Optional[data.ConfigLeaderboard] = None,
+    remove_leaderboard_id: Optional[uuid.UUID] = None,
+    expected_updated_at: Optional[datetime] = None,
+) -> Optional[BugoutResource]:
+    """
+    Link or unlink one leaderboard at latest version of server configuration.
+
+    Brood replaces top-level keys of resource data, so leaderboards list is
+    read, changed and written back under per resource lock. With
+    expected_updated_at ServerConfigConflict is raised if resource was
+    changed since caller read it.
+    """
+    async with server_config_lock(resource_id):
+        resource = await get_resource(resource_id=resource_id)
+        if resource is None:
+            logger.error(
+                f"Unable to fetch server config resource with ID: {resource_id}"
+            )
+            return None
+
+        if (
+            expected_updated_at is not None
+            and resource.updated_at != expected_updated_at
+        ):
+            raise ServerConfigConflict(
+                f"Server config resource with ID: {resource_id} changed at {resource.updated_at}, expected {expected_updated_at}",
+                resource=resource,
+            )
+
+        leaderboards: List[Dict[str, Any]] = []
+        is_removed = False
+        for l in resource.resource_data.get("leaderboards", []):
+            l_id = str(l.get("leaderboard_id"))
+            if add_leaderboard is not None and l_id == str(
+                add_leaderboard.leaderboard_id
+            ):
+                raise ServerConfigConflict(
+                    f"Leaderboard with ID: {l_id} already linked in resource with ID: {resource_id}",
+                    resource=resource,
+                )
+            if remove_leaderboard_id is not None and l_id == str(remove_leaderboard_id):
+                is_removed = True
+                continue
+            leaderboards.append(l)
+
+        if remove_leaderboard_id is not None and not is_removed:
+            raise ServerConfigConflict(
+                f"Leaderboard with ID: {remove_leaderboard_id} not linked in resource with ID: {resource_id}",
+                resource=resource,
+            )
+        if add_leaderboard is not None:
+            leaderboards.append(serialize_config_leaderboard(add_leaderboard))
+
+        response = await caller(
+            url=f"{BUGOUT_BROOD_URL}/resources/{str(resource_id)}",
+            method=data.RequestMethods.PUT,
+            request_data={"update": {"leaderboards": leaderboards}, "drop_keys": []},
+            token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
+        )
+
+    if response is None:
+        logger.error(f"Unable to update server config resource with ID: {resource_id}")
+        return None
+
+    updated_resource = BugoutResource(**response)
+    logger.info(
+        f"Updated leaderboards of server config at resource with ID: {updated_resource.id}"
+    )
+
+    return updated_resource
+
+
 async def create_or_update_server_config(
     discord_server_id: int,
     leaderboards: Optional[List[data.ConfigLeaderboard]] = None,
@@ -426,19 +1278,12 @@ async def create_server_config(
 ):
     resource: Optional[BugoutResource] = None
 
-    light_leaderboards: List[str] = []
+    light_leaderboards: List[Dict[str, Any]] = []
     if leaderboards is not None:
-        for l in leaderboards:
-            light_l = data.ConfigLeaderboard(
-                leaderboard_id=l.leaderboard_id,
-                short_name=l.short_name,
-                channel_ids=l.channel_ids,
-            )
-            light_leaderboards.append(json.loads(light_l.json(exclude_unset=True)))
+        light_leaderboards = [serialize_config_leaderboard(l) for l in leaderboards]
 
     response = await caller(
         url=f"{BUGOUT_BROOD_URL}/resources",
-        semaphore=asyncio.Semaphore(1),
         method=data.RequestMethods.POST,
         request_data={
             "application_id": MOONSTREAM_APPLICATION_ID,
@@ -474,27 +1319,20 @@ async def update_server_config(
 
     request_data: Dict[str, Any] = {"update": {}, "drop_keys": []}
     if leaderboards is not None:
-        light_leaderboards: List[str] = []
-        for l in leaderboards:
-            light_l = data.ConfigLeaderboard(
-                leaderboard_id=l.leaderboard_id,
-                short_name=l.short_name,
-                channel_ids=l.channel_ids,
-            )
-            light_leaderboards.append(json.loads(light_l.json(exclude_unset=True)))
-
-        request_data["update"]["leaderboards"] = light_leaderboards
+        request_data["update"]["leaderboards"] = [
+            serialize_config_leaderboard(l) for l in leaderboards
+        ]
 
     if roles is not None:
         request_data["update"]["discord_auth_roles"] = [r.dict() for r in roles]
 
-    response = await caller(
-        url=f"{BUGOUT_BROOD_URL}/resources/{str(resource_id)}",
-        semaphore=asyncio.Semaphore(1),
-        method=data.RequestMethods.PUT,
-        request_data=request_data,
-        token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
-    )
+    async with server_config_lock(resource_id):
+        response = await caller(
+            url=f"{BUGOUT_BROOD_URL}/resources/{str(resource_id)}",
+            method=data.RequestMethods.PUT,
+            request_data=request_data,
+            token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
+        )
 
     if response is not None:
         resource = BugoutResource(**response)
@@ -504,66 +1342,31 @@ async def update_server_config(
 
 
 class TabularData:
-    def __init__(self) -> None:
-        self.max_len = 30  # Mobile discord max width is 30 if thumbnail not set
+    """
+    Score table builder, values are kept by columns and rendered by
+    tables.render_rst at once.
+    """
 
-        self._widths: List[int] = []
-        self._columns: List[str] = []
-        self._rows: List[List[str]] = []
+    def __init__(self, layout: data.TableLayouts = data.TableLayouts.MOBILE) -> None:
+        self.max_len = tables.TABLE_WIDTHS[layout]
 
-    def set_columns(self, columns: List[str]) -> None:
-        self._columns = columns
+        self._columns: List[tables.TableColumn] = []
+        self._values: List[List[str]] = []
 
-        columns_lens = [len(c) for c in columns]
-        self._widths = columns_lens
+    def set_columns(self, columns: List[Union[str, tables.TableColumn]]) -> None:
+        self._columns = [
+            c if isinstance(c, tables.TableColumn) else tables.score_columns([c])[0]
+            for c in columns
+        ]
+        self._values = [[] for _ in self._columns]
 
     def add_row(self, row_raw: List[str]) -> None:
-        row = [r for r in row_raw]
-        self._rows.append(row)
+        for column_values, value in zip(self._values, row_raw):
+            column_values.append(value)
 
     def add_scores(self, scores: List[data.Score]) -> None:
-        shortcut = "..."
-        rows = []
-        for score in scores:
-            row = [str(score.rank), str(score.address), str(score.score)]
-            for i, elem in enumerate(row):
-                if len(elem) > self._widths[i]:
-                    self._widths[i] = len(elem)
-            rows.append(row)
-
-        available: Optional[int] = None
-        if sum(self._widths) > self.max_len:
-            available = self.max_len - self._widths[0] - self._widths[2] - len(shortcut)
-            self._widths[1] = available + len(shortcut)
-
-        for row in rows:
-            if available is not None:
-                row[1] = f"{row[1][0:available//2]}{shortcut}{row[1][-available//2:]}"
-            self.add_row(row)
+        for column, column_values in zip(self._columns, self._values):
+            column_values.extend(column.values(scores))
 
     def render_rst(self) -> str:
-        """Renders a table in rST format.
-
-        +----+---------------------+-----+
-         rank        address        score
-        +----+---------------------+-----+
-          1    0x15650b...ffb56321   16
-          2    0x825080...3052a123    9
-        """
-
-        sep = "+".join("-" * w for w in self._widths)
-        sep = f"+{sep}+"
-
-        to_draw = [sep]
-
-        def get_entry(d: List[str]) -> str:
-            elem = " ".join(f"{e:^{self._widths[i]}}" for i, e in enumerate(d))
-            return f" {elem} "
-
-        to_draw.append(get_entry(self._columns))
-        to_draw.append(sep)
-
-        for row in self._rows:
-            to_draw.append(get_entry(row))
-
-        return "\n".join(to_draw)
+        return tables.render_rst(self._columns, self._values, max_width=self.max_len)
@@ -3,13 +3,13 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 
-from bugout.data import BugoutResources
+from bugout.data import BugoutResource
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
 from .. import actions as bot_actions
+from .. import upstreams
 from ..settings import (
-    BUGOUT_BROOD_URL,
     BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
     DISCORD_API_URL,
     LEADERBOARD_DISCORD_BOT_TOKEN,
@@ -23,7 +23,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def get_configs(semaphore: asyncio.Semaphore):
+async def get_configs():
     """
     Returns map of guild, channel and linked to it leaderboards.
     If leaderboard does not linked to any channel, it returns under key channel_id = "".
@@ -33,65 +33,68 @@ async def get_configs(semaphore: asyncio.Semaphore):
     """
     configs_dict: Dict[str, Dict[str, List[data.LeaderboardResponse]]] = {}
 
-    url = f"{BUGOUT_BROOD_URL}/resources/?application_id={MOONSTREAM_APPLICATION_ID}&type={BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG}"
-    response = await bot_actions.caller(
-        url=url, semaphore=semaphore, token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN
-    )
-    if response is None:
-        return configs_dict
+    async for resources in bot_actions.iterate_resources(
+        resource_type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG
+    ):
+        for r in resources:
+            extend_configs_with_resource(configs_dict=configs_dict, resource=r)
 
-    resources = BugoutResources(**response)
+    return configs_dict
 
-    for r in resources.resources:
-        guild_id = r.resource_data.get("discord_server_id")
 
-        if guild_id is None:
-            logger.warning(f"Incorrect config resource with ID: {r.id}")
+def extend_configs_with_resource(
+    configs_dict: Dict[str, Dict[str, List[data.LeaderboardResponse]]],
+    resource: BugoutResource,
+) -> None:
+    """
+    Add leaderboards of config resource to map of guild, channel and linked to it leaderboards.
+    """
+    guild_id = resource.resource_data.get("discord_server_id")
+
+    if guild_id is None:
+        logger.warning(f"Incorrect config resource with ID: {resource.id}")
+        return
+
+    leaderboards = resource.resource_data.get("leaderboards", [])
+    for l in leaderboards:
+        guild_id_str = str(guild_id)
+
+        # Ensure the guild ID exists in the dictionary
+        if guild_id_str not in configs_dict:
+            configs_dict[guild_id_str] = {}
+
+        channel_ids = l.get("channel_ids", [])
+        if len(channel_ids) == 0:
+            # Ensure empty channel exists in the dictionary
+            if "" not in configs_dict[guild_id_str]:
+                configs_dict[guild_id_str][""] = []
+            # Append leaderboard without channel
+            configs_dict[guild_id_str][""].append(
+                data.LeaderboardResponse(
+                    leaderboard_id=l.get("leaderboard_id", ""),
+                    short_name=l.get("short_name", ""),
+                )
+            )
             continue
 
-        leaderboards = r.resource_data.get("leaderboards", [])
-        for l in leaderboards:
-            guild_id_str = str(guild_id)
-
-            # Ensure the guild ID exists in the dictionary
-            if guild_id_str not in configs_dict:
-                configs_dict[guild_id_str] = {}
-
-            channel_ids = l.get("channel_ids", [])
-            if len(channel_ids) == 0:
-                # Ensure empty channel exists in the dictionary
-                if "" not in configs_dict[guild_id_str]:
-                    configs_dict[guild_id_str][""] = []
-                # Append leaderboard without channel
-                configs_dict[guild_id_str][""].append(
-                    data.LeaderboardResponse(
-                        leaderboard_id=l.get("leaderboard_id", ""),
-                        short_name=l.get("short_name", ""),
-                    )
+        for ch in channel_ids:
+            ch_str = str(ch)
+            # Ensure the channel ID exists in the dictionary
+            if ch_str not in configs_dict[guild_id_str]:
+                configs_dict[guild_id_str][ch_str] = []
+            # Append leaderboard to its channel
+            configs_dict[guild_id_str][ch_str].append(
+                data.LeaderboardResponse(
+                    leaderboard_id=l.get("leaderboard_id", ""),
+                    short_name=l.get("short_name", ""),
                 )
-                continue
-
-            for ch in channel_ids:
-                ch_str = str(ch)
-                # Ensure the channel ID exists in the dictionary
-                if ch_str not in configs_dict[guild_id_str]:
-                    configs_dict[guild_id_str][ch_str] = []
-                # Append leaderboard to its channel
-                configs_dict[guild_id_str][ch_str].append(
-                    data.LeaderboardResponse(
-                        leaderboard_id=l.get("leaderboard_id", ""),
-                        short_name=l.get("short_name", ""),
-                    )
-                )
-
-    return configs_dict
+            )
 
 
-async def get_guilds(semaphore: asyncio.Semaphore):
+async def get_guilds():
     guilds = data.GuildsResponse(guilds=[])
     response = await bot_actions.caller(
         url=f"{DISCORD_API_URL}/users/@me/guilds",
-        semaphore=semaphore,
         token=LEADERBOARD_DISCORD_BOT_TOKEN,
         auth_schema="Bot",
     )
@@ -136,13 +139,11 @@ def guild_extender(
 
 
 async def extent_guild_with_channels(
-    semaphore: asyncio.Semaphore,
     guild: data.GuildResponse,
     config: Dict[str, List[data.LeaderboardResponse]],
 ):
     response = await bot_actions.caller(
         url=f"{DISCORD_API_URL}/guilds/{guild.id}/channels",
-        semaphore=semaphore,
         token=LEADERBOARD_DISCORD_BOT_TOKEN,
         auth_schema="Bot",
     )
@@ -155,13 +156,11 @@ async def extent_guild_with_channels(
 
 
 async def extent_guild_with_threads(
-    semaphore: asyncio.Semaphore,
     guild: data.GuildResponse,
     config: Dict[str, List[data.LeaderboardResponse]],
 ):
     response = await bot_actions.caller(
         url=f"{DISCORD_API_URL}/guilds/{guild.id}/threads/active",
-        semaphore=semaphore,
         token=LEADERBOARD_DISCORD_BOT_TOKEN,
         auth_schema="Bot",
     )
@@ -212,6 +211,15 @@ def run_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.on_event("startup")
+    async def startup_event() -> None:
+        # Shared HTTP session with connection pool for Discord and Brood calls
+        await bot_actions.open_http_session()
+
+    @app.on_event("shutdown")
+    async def shutdown_event() -> None:
+        await bot_actions.close_http_session()
+
     @app.get("/ping", response_model=data.PingResponse)
     async def get_ping_handler() -> data.PingResponse:
         return data.PingResponse(status="ok")
@@ -220,14 +228,21 @@ def run_app() -> FastAPI:
     async def get_version_handler() -> data.VersionResponse:
         return data.VersionResponse(version=LEADERBOARD_DISCORD_BOT_API_VERSION)
 
+    @app.get("/upstreams", response_model=data.UpstreamsResponse)
+    async def get_upstreams_handler() -> data.UpstreamsResponse:
+        return data.UpstreamsResponse(
+            limiters=upstreams.limiters_metrics(),
+            breakers=upstreams.breakers_metrics(),
+            coalesced_requests=bot_actions.coalesced_requests_count,
+        )
+
     @app.get("/integrations", response_model=data.GuildsResponse)
     async def get_integrations_handler():
         guilds = data.GuildsResponse(guilds=[])
 
-        semaphore = asyncio.Semaphore(4)
         try:
-            guilds_task = asyncio.create_task(get_guilds(semaphore=semaphore))
-            configs_task = asyncio.create_task(get_configs(semaphore=semaphore))
+            guilds_task = asyncio.create_task(get_guilds())
+            configs_task = asyncio.create_task(get_configs())
             guilds = await guilds_task
             configs = await configs_task
         except Exception as e:
@@ -242,16 +257,12 @@ def run_app() -> FastAPI:
                     continue
                 tasks.append(
                     asyncio.create_task(
-                        extent_guild_with_channels(
-                            semaphore=semaphore, guild=g, config=config
-                        )
+                        extent_guild_with_channels(guild=g, config=config)
                     )
                 )
                 tasks.append(
                     asyncio.create_task(
-                        extent_guild_with_threads(
-                            semaphore=semaphore, guild=g, config=config
-                        )
+                        extent_guild_with_threads(guild=g, config=config)
                     )
                 )
             await asyncio.gather(*tasks)
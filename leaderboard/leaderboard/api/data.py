@@ -2,6 +2,8 @@ from typing import Any, Dict, List
 
 from pydantic import BaseModel, Field
 
+from ..data import CircuitBreakerMetrics, UpstreamLimiterMetrics
+
 
 class PingResponse(BaseModel):
     status: str
@@ -30,3 +32,9 @@ class GuildResponse(BaseModel):
 
 class GuildsResponse(BaseModel):
     guilds: List[GuildResponse] = Field(default_factory=list)
+
+
+class UpstreamsResponse(BaseModel):
+    limiters: List[UpstreamLimiterMetrics] = Field(default_factory=list)
+    breakers: List[CircuitBreakerMetrics] = Field(default_factory=list)
+    coalesced_requests: int = 0
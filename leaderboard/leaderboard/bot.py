@@ -1,38 +1,69 @@
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import (
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+)
 
 import discord
-from bugout.data import BugoutResource, BugoutResources
+from bugout.data import BugoutResource
 from discord import app_commands
 from discord.ext import commands
-from discord.guild import Guild
 from discord.message import Message
 
-from . import actions, data
+from . import actions, configs, data, indexes
 from .cogs.configure import ConfigureCog
 from .cogs.leaderboards import LeaderboardsCog
 from .cogs.profile import ProfileCog
 from .cogs.rank import RankCog
 from .cogs.ranking import RankingCog
+from .executor import BackgroundExecutor
+from .identities import IdentityRecord, IdentityStore
 from .settings import (
-    BUGOUT_BROOD_URL,
     BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
     BUGOUT_RESOURCE_TYPE_DISCORD_BOT_USER_IDENTIFIER,
     COLORS,
     LEADERBOARD_DISCORD_BOT_ACTIVITY_STATUS,
+    LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE,
+    LEADERBOARD_DISCORD_BOT_CONFIG_LOAD_TIMEOUT,
+    LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_DELAY,
+    LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_MAX_DELAY,
+    LEADERBOARD_DISCORD_BOT_CONFIGS_REFRESH_INTERVAL,
+    LEADERBOARD_DISCORD_BOT_CONFIGS_TTL,
+    LEADERBOARD_DISCORD_BOT_LAZY_CONFIGS,
+    LEADERBOARD_DISCORD_BOT_LAZY_USERS,
+    LEADERBOARD_DISCORD_BOT_METRICS_INTERVAL,
     LEADERBOARD_DISCORD_BOT_NAME,
+    LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE,
+    LEADERBOARD_DISCORD_BOT_SNAPSHOT_INTERVAL,
+    LEADERBOARD_DISCORD_BOT_SYNC_CONCURRENCY,
+    LEADERBOARD_DISCORD_BOT_TASK_DRAIN_TIMEOUT,
+    LEADERBOARD_DISCORD_BOT_USERS_CACHE_SIZE,
     MOONSTREAM_APPLICATION_ID,
     MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
     MOONSTREAM_DISCORD_LINK,
-    MOONSTREAM_ENGINE_API_URL,
     MOONSTREAM_LOGO_URL,
 )
 from .settings import bugout_client as bc
+from .throttling import CommandThrottler
 from .version import VERSION
 
 logger = logging.getLogger(__name__)
 
+COMMANDS_FINGERPRINT_GLOBAL_KEY = "global"
+
 
 def configure_intents() -> discord.flags.Intents:
     intents = discord.Intents.default()
@@ -41,17 +72,68 @@ def configure_intents() -> discord.flags.Intents:
     return intents
 
 
+class LeaderboardCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not isinstance(self.client, LeaderboardDiscordBot):
+            return True
+
+        # Only invoked commands are limited, autocomplete is served from memory
+        if interaction.type == discord.InteractionType.application_command:
+            scope = self.client.throttler.acquire(
+                interaction.user.id, interaction.guild_id
+            )
+            if scope is not None:
+                await self.client.respond_throttled(interaction, scope)
+                return False
+
+        # First interaction of user, including autocomplete, warms up identities
+        self.client.prefetch_user_identities(interaction.user.id)
+        if interaction.guild_id is not None:
+            self.client.prefetch_server_config(interaction.guild_id)
+        return True
+
+
 class LeaderboardDiscordBot(commands.Bot):
     def __init__(self, *args, **kwargs):
+        kwargs.setdefault("tree_cls", LeaderboardCommandTree)
         super().__init__(*args, **kwargs)
 
         self.bugout_connection_init()
 
-        self._server_configs: Dict[int, data.ResourceConfig] = {}
-        self._user_idents: Dict[int, List[data.UserIdentity]] = {}
+        self._config_store = configs.ConfigStore()
+        # In lazy mode configurations are fetched per guild at first interaction
+        self.lazy_configs = LEADERBOARD_DISCORD_BOT_LAZY_CONFIGS
+        self._server_configs_fetched_at: Dict[int, float] = {}
+        self._guilds_active_at: Dict[int, float] = {}
+        self._server_config_loads: Dict[int, asyncio.Task] = {}
+        self._registered_renames: Dict[int, Dict[str, List[str]]] = {}
+        # In lazy mode identities are fetched per user at first use and kept in LRU
+        self.users_maxsize: Optional[int] = (
+            LEADERBOARD_DISCORD_BOT_USERS_CACHE_SIZE
+            if LEADERBOARD_DISCORD_BOT_LAZY_USERS
+            else None
+        )
+        self._user_idents = IdentityStore(maxsize=self.users_maxsize)
+        self._user_loads: Dict[int, asyncio.Task] = {}
+        self.channel_index = indexes.ChannelLeaderboardsIndex()
+        self.leaderboards_search: indexes.SearchIndexes[data.ConfigLeaderboard] = (
+            indexes.SearchIndexes(keys_func=lambda l: [l.short_name])
+        )
+        self._config_store.subscribe(self.handle_server_config_change)
 
         self.available_cogs_map: List[data.CogMap] = []
 
+        # Until loaded commands should not treat missing data as absent
+        self.configs_loaded = False
+        self.users_loaded = LEADERBOARD_DISCORD_BOT_LAZY_USERS
+        self.snapshot_loaded = False
+        self._commands_fingerprints: Optional[Dict[str, str]] = None
+        self._commands_registered = False
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Slash commands background work, bounded per kind of command
+        self.executor = BackgroundExecutor()
+        self.throttler = CommandThrottler()
+
     def bugout_connection_init(self):
         if MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN == "":
             raise Exception(
@@ -77,50 +159,258 @@ class LeaderboardDiscordBot(commands.Bot):
             )
 
     @property
-    def server_configs(self):
-        return self._server_configs
+    def config_store(self) -> configs.ConfigStore:
+        return self._config_store
+
+    @property
+    def server_configs(self) -> Mapping[int, data.ResourceConfig]:
+        """
+        Current immutable snapshot of server configurations.
+        """
+        return self._config_store.snapshot
+
+    def set_server_config(
+        self, guild_id: int, server_config: data.ResourceConfig
+    ) -> None:
+        self._config_store.set(guild_id, server_config)
+
+    def remove_server_config(self, guild_id: int) -> None:
+        self._config_store.remove(guild_id)
+
+    def handle_server_config_change(self, change: configs.ConfigChange) -> None:
+        if change.guild_id is None:
+            self.channel_index.rebuild(self.server_configs)
+            self.leaderboards_search.clear()
+            return
+        self.channel_index.update_guild(change.guild_id, change.new)
+        self.leaderboards_search.invalidate(change.guild_id)
+
+    def is_server_config_loaded(self, guild_id: int) -> bool:
+        """
+        Absent configuration of loaded guild means guild is not configured.
+        """
+        if self.lazy_configs:
+            return guild_id in self._server_configs_fetched_at
+        return self.configs_loaded
+
+    def prefetch_server_config(self, guild_id: int) -> Optional[asyncio.Task]:
+        """
+        In lazy mode start fetch of guild configuration if it is not loaded
+        or expired, concurrent calls for same guild share one fetch.
+        """
+        if not self.lazy_configs:
+            return None
+
+        now = time.monotonic()
+        self._guilds_active_at[guild_id] = now
+        fetched_at = self._server_configs_fetched_at.get(guild_id)
+        if (
+            fetched_at is not None
+            and now - fetched_at < LEADERBOARD_DISCORD_BOT_CONFIGS_TTL
+        ):
+            return None
+
+        task = self._server_config_loads.get(guild_id)
+        if task is None:
+            task = self.create_background_task(self.fetch_server_config(guild_id))
+            self._server_config_loads[guild_id] = task
+            task.add_done_callback(
+                lambda _: self._server_config_loads.pop(guild_id, None)
+            )
+        return task
+
+    async def get_server_config(
+        self,
+        guild_id: int,
+        timeout: Optional[float] = LEADERBOARD_DISCORD_BOT_CONFIG_LOAD_TIMEOUT,
+    ) -> Optional[data.ResourceConfig]:
+        """
+        Server configuration of guild, in lazy mode not loaded one is awaited
+        with timeout and expired one is served while refreshed in background.
+        """
+        task = self.prefetch_server_config(guild_id)
+        if task is not None and not self.is_server_config_loaded(guild_id):
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Configuration of guild with ID: {guild_id} is not loaded in {timeout} seconds"
+                )
+        return self._config_store.get(guild_id)
+
+    async def fetch_server_config(self, guild_id: int) -> bool:
+        resources = await actions.get_server_config_resources(guild_id)
+        if resources is None:
+            return False
+
+        fetched: Dict[int, data.ResourceConfig] = {}
+        for r in resources:
+            self.set_server_configs_from_resource(resource=r, server_configs=fetched)
+        server_config = fetched.get(guild_id)
+
+        if server_config is None:
+            self.remove_server_config(guild_id)
+        else:
+            self._carry_over_known_infos(guild_id, server_config)
+            self.set_server_config(guild_id, server_config)
+        self._server_configs_fetched_at[guild_id] = time.monotonic()
+        logger.debug(
+            f"Fetched configuration of guild with ID: {guild_id}, configured: {server_config is not None}"
+        )
+
+        if server_config is not None:
+            await self.load_leaderboards_info(
+                [
+                    l.leaderboard_id
+                    for l in server_config.resource_data.leaderboards
+                    if l.leaderboard_info is None
+                ]
+            )
+
+        if self.update_guild_commands(guild_id) and self.is_ready():
+            await self.sync_commands(guild_ids=[guild_id])
+
+        return True
+
+    async def warm_server_configs_periodically(self) -> None:
+        """
+        Refresh configurations of active guilds before they are requested and
+        forget configurations of guilds without interactions.
+        """
+        while True:
+            await asyncio.sleep(LEADERBOARD_DISCORD_BOT_CONFIGS_TTL)
+
+            threshold = time.monotonic() - LEADERBOARD_DISCORD_BOT_CONFIGS_TTL
+            num_of_warmed = 0
+            num_of_evicted = 0
+            for guild_id in list(self._server_configs_fetched_at.keys()):
+                if self._guilds_active_at.get(guild_id, float("-inf")) >= threshold:
+                    self.prefetch_server_config(guild_id)
+                    num_of_warmed += 1
+                elif guild_id not in self._server_config_loads:
+                    self.remove_server_config(guild_id)
+                    self._server_configs_fetched_at.pop(guild_id, None)
+                    self._guilds_active_at.pop(guild_id, None)
+                    num_of_evicted += 1
+            logger.info(
+                f"Warming {num_of_warmed} active guild configurations, evicted {num_of_evicted}"
+            )
+
+    def _carry_over_known_infos(
+        self, guild_id: int, server_config: data.ResourceConfig
+    ) -> None:
+        """
+        Keep known infos of guild leaderboards, they are not managed in Brood.
+        Fetched configuration is not published yet, so it is modified in place.
+        """
+        known_infos: Dict[uuid.UUID, data.LeaderboardInfo] = {}
+        current_config = self._config_store.get(guild_id)
+        if current_config is not None:
+            for l in current_config.resource_data.leaderboards:
+                if l.leaderboard_info is not None:
+                    known_infos[l.leaderboard_id] = l.leaderboard_info
+        for l in server_config.resource_data.leaderboards:
+            l.leaderboard_info = known_infos.get(l.leaderboard_id)
 
-    def set_server_configs_from_resource(self, resource: BugoutResource):
+    def set_server_configs_from_resource(
+        self,
+        resource: BugoutResource,
+        server_configs: Optional[Dict[int, data.ResourceConfig]] = None,
+    ):
         try:
             discord_server_id = resource.resource_data["discord_server_id"]
-            self._server_configs[discord_server_id] = data.ResourceConfig(
-                id=resource.id, resource_data=data.Config(**resource.resource_data)
+            server_config = data.ResourceConfig(
+                id=resource.id,
+                resource_data=data.Config(**resource.resource_data),
+                updated_at=resource.updated_at,
             )
+            if server_configs is None:
+                self._carry_over_known_infos(discord_server_id, server_config)
+                self.set_server_config(discord_server_id, server_config)
+            else:
+                server_configs[discord_server_id] = server_config
         except KeyError:
             logger.warning(f"Malformed resource with ID: {str(resource.id)}")
         except Exception as e:
             logger.error(e)
 
-    def set_server_configs_leaderboard_info(
-        self, leaderboard: data.ConfigLeaderboard, leaderboard_info: Any
-    ):
-        try:
-            leaderboard.leaderboard_info = data.LeaderboardInfo(**leaderboard_info)
-        except Exception as e:
-            logger.error(e)
-
     @property
-    def user_idents(self):
+    def user_idents(self) -> IdentityStore:
         return self._user_idents
 
-    def set_user_idents_from_resource(self, resource: BugoutResource):
+    def set_user_idents_from_resource(
+        self,
+        resource: BugoutResource,
+        user_idents: Optional[IdentityStore] = None,
+    ):
+        if user_idents is None:
+            user_idents = self._user_idents
         try:
             discord_user_id = resource.resource_data["discord_user_id"]
-            fetched_identity = data.UserIdentity(
+            fetched_identity = IdentityRecord(
                 resource_id=resource.id,
                 identifier=resource.resource_data["identifier"],
                 name=resource.resource_data["name"],
             )
-            existing_identities = self._user_idents.get(discord_user_id)
-            if existing_identities is None:
-                self._user_idents[discord_user_id] = [fetched_identity]
-            else:
-                self._user_idents[discord_user_id].append(fetched_identity)
+            if not user_idents.add(discord_user_id, fetched_identity):
+                logger.warning(
+                    f"Duplicated identity {fetched_identity.identifier} for user with ID: {discord_user_id} in resource with ID: {str(resource.id)}"
+                )
         except KeyError:
             logger.warning(f"Malformed resource with ID: {str(resource.id)}")
         except Exception as e:
             logger.error(e)
 
+    def prefetch_user_identities(self, discord_user_id: int) -> Optional[asyncio.Task]:
+        """
+        Start fetch of user identities if they are not in store, concurrent
+        calls for same user share one fetch.
+        """
+        if self._user_idents.is_loaded(discord_user_id):
+            return None
+
+        task = self._user_loads.get(discord_user_id)
+        if task is None:
+            task = self.create_background_task(
+                self.fetch_user_identities(discord_user_id)
+            )
+            self._user_loads[discord_user_id] = task
+            task.add_done_callback(
+                lambda _: self._user_loads.pop(discord_user_id, None)
+            )
+        return task
+
+    async def fetch_user_identities(self, discord_user_id: int) -> bool:
+        resources = await actions.get_user_identities_resources(discord_user_id)
+        if resources is None:
+            return False
+
+        fetched = IdentityStore()
+        for r in resources:
+            self.set_user_idents_from_resource(resource=r, user_idents=fetched)
+        self._user_idents.set_user(discord_user_id, fetched.get(discord_user_id))
+        logger.debug(
+            f"Fetched {len(resources)} identities for user with ID: {discord_user_id}"
+        )
+        return True
+
+    async def load_user_identities(
+        self, discord_user_id: int, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Wait until user identities are in store, False if fetch failed or
+        did not finish in timeout.
+        """
+        task = self.prefetch_user_identities(discord_user_id)
+        if task is None:
+            return True
+
+        try:
+            # Shield keeps fetch running for next call after timeout
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+
     async def on_ready(self):
         logger.info(
             f"Logged in {COLORS.BLUE}{str(len(self.guilds))}{COLORS.RESET} guilds on as {COLORS.BLUE}{self.user} - {self.user.id}{COLORS.RESET}"
@@ -132,14 +422,158 @@ class LeaderboardDiscordBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
 
-        for guild in self.guilds:
-            await self.tree.sync(guild=discord.Object(id=guild.id))
+        # Called at every reconnect, only changed command sets are synced
+        num_of_synced = await self.sync_commands(
+            guild_ids=[guild.id for guild in self.guilds], prune=True
+        )
+
+        logger.info(
+            f"Slash commands synced for {num_of_synced} of {len(self.guilds)} guilds and global"
+        )
+
+    def commands_fingerprint(self, guild_id: Optional[int] = None) -> str:
+        """
+        Hash of command tree payload for guild (global if None), the same
+        payload is sent to Discord during sync, so it covers renamed commands.
+        """
+        guild = discord.Object(id=guild_id) if guild_id is not None else None
+        payload = sorted(
+            [c.to_dict(self.tree) for c in self.tree.get_commands(guild=guild)],
+            key=lambda c: c["name"],
+        )
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def load_commands_fingerprints(self) -> Dict[str, str]:
+        if LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE == "":
+            return {}
+        try:
+            with open(LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE) as ifp:
+                fingerprints = data.CommandsFingerprints(**json.load(ifp))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Unable to load commands fingerprints, err: {e}")
+            return {}
+
+        # Fingerprints of other Discord application are not valid for this one
+        if fingerprints.application_id != self.application_id:
+            return {}
+
+        return fingerprints.fingerprints
+
+    def save_commands_fingerprints(self) -> None:
+        if LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE == "":
+            return
+        try:
+            fingerprints_dir = os.path.dirname(
+                LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE
+            )
+            if fingerprints_dir != "":
+                os.makedirs(fingerprints_dir, exist_ok=True)
+            tmp_path = f"{LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE}.tmp"
+            with open(tmp_path, "w") as ofp:
+                ofp.write(
+                    data.CommandsFingerprints(
+                        application_id=self.application_id,
+                        fingerprints=self._commands_fingerprints,
+                    ).json()
+                )
+            os.replace(tmp_path, LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE)
+        except Exception as e:
+            logger.error(f"Unable to save commands fingerprints, err: {e}")
+
+    async def sync_commands(
+        self, guild_ids: List[int], force: bool = False, prune: bool = False
+    ) -> int:
+        """
+        Sync command tree for guilds and global commands if their fingerprint
+        differs from the last synced one. Syncs run concurrently with limit,
+        rate limits are handled by discord.py HTTP client.
+
+        With prune fingerprints of guilds not in list are forgotten, so command
+        set is synced again if bot rejoins guild.
+        """
+        if self._commands_fingerprints is None:
+            self._commands_fingerprints = self.load_commands_fingerprints()
+        fingerprints = self._commands_fingerprints
+
+        if prune:
+            known_keys = set([str(g_id) for g_id in guild_ids])
+            known_keys.add(COMMANDS_FINGERPRINT_GLOBAL_KEY)
+            for key in list(fingerprints.keys()):
+                if key not in known_keys:
+                    del fingerprints[key]
 
-        await self.tree.sync()
+        semaphore = asyncio.Semaphore(LEADERBOARD_DISCORD_BOT_SYNC_CONCURRENCY)
 
-        logger.info(f"Slash commands synced for {len(self.guilds)} guilds")
+        async def sync(guild_id: Optional[int]) -> bool:
+            key = (
+                str(guild_id)
+                if guild_id is not None
+                else COMMANDS_FINGERPRINT_GLOBAL_KEY
+            )
+            fingerprint = self.commands_fingerprint(guild_id=guild_id)
+            if not force and fingerprints.get(key) == fingerprint:
+                return False
+
+            async with semaphore:
+                try:
+                    await self.tree.sync(
+                        guild=(
+                            discord.Object(id=guild_id)
+                            if guild_id is not None
+                            else None
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Unable to sync commands for {key}, err: {e}")
+                    fingerprints.pop(key, None)
+                    return False
+
+            fingerprints[key] = fingerprint
+            logger.debug(f"Synced commands for {key}")
+            return True
+
+        results = await asyncio.gather(*[sync(g_id) for g_id in [*guild_ids, None]])
+        self.save_commands_fingerprints()
+
+        return len([r for r in results if r is True])
 
     async def setup_hook(self):
+        # Shared HTTP session for upstream calls, lives until bot is closed
+        await actions.open_http_session()
+        self.executor.start()
+
+        if self.lazy_configs:
+            # Configurations from snapshot are served until first interaction of
+            # guild refreshes them, other guilds are fetched at first interaction
+            self.load_snapshot()
+            self.configs_loaded = True
+            self.create_background_task(self.load_configs_details())
+            self.create_background_task(self.warm_server_configs_periodically())
+        elif self.load_snapshot():
+            # Warm start, reconcile snapshot with Brood in background
+            self.create_background_task(self.load_configs())
+        else:
+            # Configurations are required to register renamed commands, leaderboard
+            # infos and user identities are loaded when bot is already online
+            await self.load_bugout_configs()
+            if self.configs_loaded:
+                self.create_background_task(self.load_configs_details())
+            else:
+                self.create_background_task(self.load_configs_with_retries())
+        if (
+            not self.lazy_configs
+            and LEADERBOARD_DISCORD_BOT_CONFIGS_REFRESH_INTERVAL > 0
+        ):
+            self.create_background_task(self.refresh_configs_periodically())
+        if LEADERBOARD_DISCORD_BOT_SNAPSHOT_INTERVAL > 0:
+            self.create_background_task(self.save_snapshot_periodically())
+        if LEADERBOARD_DISCORD_BOT_METRICS_INTERVAL > 0:
+            self.create_background_task(self.log_metrics_periodically())
+
         # Prepare list of cog instances
         for cog in [
             ConfigureCog(self),
@@ -169,41 +603,166 @@ class LeaderboardDiscordBot(commands.Bot):
 
             await self.add_cog(cog)
 
-        # Fetch list of guilds server connected to
-        known_guilds: List[Guild] = []
-        async for guild in self.fetch_guilds():
-            self.tree.clear_commands(guild=guild)
-            known_guilds.append(guild)
+        self.register_commands()
+
+    def guild_command_renames(self) -> Dict[int, Dict[str, List[str]]]:
+        """
+        Map of guild to renamed commands by origin command name, built in
+        single pass over server configurations.
+        """
+        renames: Dict[int, Dict[str, List[str]]] = {}
+        for guild_id, server_config in self.server_configs.items():
+            guild_renames = self.server_config_command_renames(server_config)
+            if len(guild_renames) != 0:
+                renames[guild_id] = guild_renames
+        return renames
+
+    @staticmethod
+    def server_config_command_renames(
+        server_config: Optional[data.ResourceConfig],
+    ) -> Dict[str, List[str]]:
+        guild_renames: Dict[str, List[str]] = {}
+        if server_config is None:
+            return guild_renames
+        for command in server_config.resource_data.commands:
+            guild_renames.setdefault(command.origin, []).append(command.renamed)
+        return guild_renames
 
-        # Generate commands for specified guild and add it to command tree
+    def update_guild_commands(self, guild_id: int) -> bool:
+        """
+        Register guild commands again if renames in its configuration differ
+        from registered ones, returns True if guild commands should be synced.
+        """
+        guild_renames = self.server_config_command_renames(
+            self._config_store.get(guild_id)
+        )
+        if guild_renames == self._registered_renames.get(guild_id, {}):
+            return False
+
+        self.register_guild_commands(guild_id=guild_id, guild_renames=guild_renames)
+        logger.info(f"Updated renamed commands of guild with ID: {guild_id}")
+        return True
+
+    def register_commands(self) -> None:
+        """
+        Register common commands globally, they are shared by all guilds.
+        Only guilds with renamed commands get own copies of these commands.
+        """
         for cog in self.available_cogs_map:
-            for guild in known_guilds:
-                is_command_for_guild_registered = False
-
-                guild_config = self.server_configs.get(guild.id)
-                if guild_config is not None:
-                    for command in guild_config.resource_data.commands:
-                        if command.origin == cog.slash_command_name:
-                            # Generate unique slash command based on server configuration and register it
-                            await self.add_command_to_tree(
-                                name=command.renamed, cog=cog, guild=guild
-                            )
-                            is_command_for_guild_registered = True
-                            logger.debug(
-                                f"Registered unique command  {command.renamed} at {guild.name}"
-                            )
-                if is_command_for_guild_registered is False:
-                    # Register common command in guild
-                    await self.add_command_to_tree(
-                        name=cog.slash_command_name, cog=cog, guild=guild
-                    )
-                    logger.debug(
-                        f"Registered command {cog.slash_command_name} at {guild.name}"
-                    )
+            self.tree.add_command(
+                self.prepare_command(name=cog.slash_command_name, cog=cog)
+            )
+
+        renames = self.guild_command_renames()
+        for guild_id, guild_renames in renames.items():
+            self.register_guild_commands(guild_id=guild_id, guild_renames=guild_renames)
+
+        self._commands_registered = True
+        logger.info(
+            f"Registered {len(self.available_cogs_map)} common commands and renamed commands for {len(renames)} guilds"
+        )
+
+    async def reconcile_guild_commands(self, guild_ids: Iterable[int]) -> List[int]:
+        """
+        Register commands again for guilds with changed renames and sync them
+        if bot is online, otherwise they are synced at on_ready. Returns IDs
+        of guilds with changed commands.
+        """
+        if not self._commands_registered:
+            # Commands are registered from current configurations at setup
+            return []
+
+        renamed_guild_ids = [
+            g_id for g_id in guild_ids if self.update_guild_commands(g_id)
+        ]
+        if len(renamed_guild_ids) != 0 and self.is_ready():
+            await self.sync_commands(guild_ids=renamed_guild_ids)
+        return renamed_guild_ids
+
+    def register_guild_commands(
+        self, guild_id: int, guild_renames: Dict[str, List[str]]
+    ) -> None:
+        """
+        Replace guild specific commands with renamed ones.
+        """
+        guild = discord.Object(id=guild_id)
+        self.tree.clear_commands(guild=guild)
+        if len(guild_renames) != 0:
+            self._registered_renames[guild_id] = guild_renames
+        else:
+            self._registered_renames.pop(guild_id, None)
+
+        cogs_by_name = {c.slash_command_name: c for c in self.available_cogs_map}
+        for origin, names in guild_renames.items():
+            cog = cogs_by_name.get(origin)
+            if cog is None:
+                logger.warning(
+                    f"Unknown command {origin} to rename in guild with ID: {guild_id}"
+                )
+                continue
+            for name in names:
+                # Generate unique slash command based on server configuration and register it
+                self.tree.add_command(
+                    self.prepare_command(name=name, cog=cog), guild=guild
+                )
+                logger.debug(f"Registered unique command {name} at {guild_id}")
+
+    async def close(self):
+        # Let accepted slash commands answer before session is closed
+        await self.executor.drain(timeout=LEADERBOARD_DISCORD_BOT_TASK_DRAIN_TIMEOUT)
+        for task in self._background_tasks:
+            task.cancel()
+        self.save_snapshot()
+
+        await super().close()
+        await actions.close_http_session()
+
+    async def respond_throttled(
+        self, interaction: discord.Interaction, scope: data.ThrottleScopes
+    ) -> None:
+        """
+        Answer throttled command with cached response of its cog if there is
+        one, otherwise with short ephemeral message.
+        """
+        logger.info(
+            actions.prepare_log_message(
+                f"/{interaction.command.name if interaction.command is not None else '-'}",
+                f"THROTTLED {scope.value.upper()}",
+                interaction.user,
+                interaction.guild,
+                interaction.channel,
+            )
+        )
+
+        embed: Optional[discord.Embed] = None
+        # Cog callbacks are bound methods, command keeps cog as its binding
+        cog = getattr(interaction.command, "binding", None)
+        throttled_response = getattr(cog, "throttled_response", None)
+        if throttled_response is not None:
+            try:
+                embed = throttled_response(interaction)
+            except Exception as e:
+                logger.warning(f"Unable to prepare cached response, err: {e}")
+        if embed is None:
+            embed = discord.Embed(description=data.MESSAGE_THROTTLED)
+
+        try:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except discord.HTTPException as e:
+            logger.warning(f"Unable to respond to throttled command, err: {e}")
+
+    def create_background_task(self, coro: Coroutine) -> asyncio.Task:
+        """
+        Start task bound to bot lifetime, it is cancelled at bot close.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
 
-    async def add_command_to_tree(self, name: str, cog, guild: Optional[Guild] = None):
+    def prepare_command(self, name: str, cog: data.CogMap) -> app_commands.Command:
         """
-        Add application command to the command tree.
+        Generate application command for cog with specified name.
         """
         com: app_commands.Command = app_commands.Command(
             name=name,
@@ -215,20 +774,16 @@ class LeaderboardDiscordBot(commands.Bot):
                 cog.slash_command_autocompletion
             )
 
-        self.tree.add_command(com, guild=guild)
+        return com
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
         logger.info(
             f"Joined to new guild {COLORS.BLUE}{guild} - {guild.id}{COLORS.RESET}"
         )
-        for cog in self.available_cogs_map:
-            # Register common command in guild
-            await self.add_command_to_tree(
-                name=cog.slash_command_name, cog=cog, guild=guild
-            )
-            logger.debug(f"Registered command {cog.slash_command_name} at {guild.name}")
-        await self.tree.sync(guild=guild)
+        # Common commands are global, commands of previous membership in guild
+        # could be left at Discord, so guild command set is synced anyway
+        await self.sync_commands(guild_ids=[guild.id], force=True)
 
     async def on_message(self, message: Message):
         logger.debug(
@@ -243,78 +798,312 @@ class LeaderboardDiscordBot(commands.Bot):
 
         await self.process_commands(message)
 
-    async def load_bugout_configs(self, semaphore: asyncio.Semaphore) -> int:
-        url = f"{BUGOUT_BROOD_URL}/resources/?application_id={MOONSTREAM_APPLICATION_ID}&type={BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG}"
-        response = await actions.caller(
-            url=url, semaphore=semaphore, token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN
+    async def load_bugout_configs(self) -> int:
+        """
+        Fetch all server configurations and replace current ones, already known
+        leaderboard infos are kept until they are reloaded. Commands of guilds
+        with changed renames are registered again and synced.
+        """
+        server_configs = await self.fetch_bugout_configs()
+        if server_configs is None:
+            return 0
+
+        # Fetched configurations are not published yet and could be modified
+        known_infos = self._config_store.leaderboard_infos()
+        for server_config in server_configs.values():
+            for l in server_config.resource_data.leaderboards:
+                l.leaderboard_info = known_infos.get(l.leaderboard_id)
+
+        self._config_store.replace_all(server_configs)
+        self.configs_loaded = True
+
+        # Renames could change while bot was down, removed guilds drop renames
+        renamed_guild_ids = await self.reconcile_guild_commands(
+            set(server_configs) | set(self._registered_renames)
+        )
+
+        num_of_configs = len(server_configs)
+        logger.info(
+            f"Fetched {num_of_configs} Discord server configurations, {len(renamed_guild_ids)} guilds with changed commands"
         )
 
-        if response is None:
-            logger.warning("Unable to fetch configurations from Bugout resources")
+        return num_of_configs
+
+    async def fetch_bugout_configs(self) -> Optional[Dict[int, data.ResourceConfig]]:
+        """
+        Fetch all server configurations, None if any page is not fetched.
+        """
+        server_configs: Dict[int, data.ResourceConfig] = {}
+        try:
+            async for resources in actions.iterate_resources(
+                resource_type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG
+            ):
+                for r in resources:
+                    self.set_server_configs_from_resource(
+                        resource=r, server_configs=server_configs
+                    )
+                logger.debug(f"Fetched page of {len(resources)} server configurations")
+        except actions.ResourcesNotFetched as e:
+            logger.error(f"{e}, current configurations are kept")
+            return None
+
+        return server_configs
+
+    async def refresh_configs(self) -> int:
+        """
+        Fetch server configurations and apply only changed ones. Infos are
+        fetched only for newly linked leaderboards and commands are synced
+        only for guilds with changed renames.
+        """
+        fetched = await self.fetch_bugout_configs()
+        if fetched is None:
             return 0
 
-        resources = BugoutResources(**response)
-        num_of_configs = len(resources.resources)
-        logger.info(f"Fetched {num_of_configs} Discord server configurations")
+        current = self.server_configs
+        known_infos = self._config_store.leaderboard_infos()
+        updates: Dict[int, Optional[data.ResourceConfig]] = {}
+        new_leaderboard_ids: List[uuid.UUID] = []
+        for guild_id, server_config in fetched.items():
+            current_config = current.get(guild_id)
+            if current_config is not None and configs.is_same_config(
+                current_config, server_config
+            ):
+                continue
 
-        if num_of_configs == 0:
-            return num_of_configs
+            # Fetched configuration is not published yet and could be modified
+            for l in server_config.resource_data.leaderboards:
+                l.leaderboard_info = known_infos.get(l.leaderboard_id)
+                if l.leaderboard_info is None:
+                    new_leaderboard_ids.append(l.leaderboard_id)
+            updates[guild_id] = server_config
+        for guild_id in current:
+            if guild_id not in fetched:
+                updates[guild_id] = None
 
-        for r in resources.resources:
-            self.set_server_configs_from_resource(resource=r)
+        num_of_changed = self._config_store.apply(updates)
+        if num_of_changed == 0:
+            logger.debug("Server configurations are up to date")
+            return 0
 
-        return num_of_configs
+        if len(new_leaderboard_ids) != 0:
+            await self.load_leaderboards_info(new_leaderboard_ids)
 
-    async def load_bugout_users_tasks(
-        self, semaphore: asyncio.Semaphore
-    ) -> List[asyncio.Task]:
-        async def load_bugout_users() -> None:
-            response = await actions.caller(
-                url=f"{BUGOUT_BROOD_URL}/resources/?application_id={MOONSTREAM_APPLICATION_ID}&type={BUGOUT_RESOURCE_TYPE_DISCORD_BOT_USER_IDENTIFIER}",
-                semaphore=semaphore,
-                token=MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN,
-            )
-            if response is not None:
-                resources = BugoutResources(**response)
-                logger.info(f"Fetched {len(resources.resources)} identities for users")
-                for r in resources.resources:
-                    self.set_user_idents_from_resource(resource=r)
+        renamed_guild_ids = await self.reconcile_guild_commands(updates.keys())
 
-        return [asyncio.create_task(load_bugout_users())]
+        logger.info(
+            f"Refreshed {num_of_changed} server configurations, {len(new_leaderboard_ids)} new leaderboards, {len(renamed_guild_ids)} guilds with changed commands"
+        )
 
-    async def load_leaderboards_info_tasks(
-        self, semaphore: asyncio.Semaphore
-    ) -> List[asyncio.Task]:
-        async def load_leaderboard_info(leaderboard: data.ConfigLeaderboard) -> None:
-            url = f"{MOONSTREAM_ENGINE_API_URL}/leaderboard/info?leaderboard_id={str(leaderboard.leaderboard_id)}"
-            response = await actions.caller(url=url, semaphore=semaphore)
-            if response is not None:
-                self.set_server_configs_leaderboard_info(
-                    leaderboard=leaderboard, leaderboard_info=response
-                )
+        return num_of_changed
 
-        all_leaderboards: List[data.ConfigLeaderboard] = []
-        for g_id in self.server_configs:
-            leaderboards = self.server_configs[g_id].resource_data.leaderboards
-            all_leaderboards.extend(leaderboards)
+    async def refresh_configs_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(LEADERBOARD_DISCORD_BOT_CONFIGS_REFRESH_INTERVAL)
+            try:
+                if not self.configs_loaded:
+                    # Initial load is retried by load_configs_with_retries
+                    continue
+                await self.refresh_configs()
+            except Exception as e:
+                logger.error(f"Unable to refresh server configurations, err: {e}")
+
+    async def load_bugout_users_tasks(self) -> List[asyncio.Task]:
+        if self._user_idents.is_partial:
+            logger.info("User identities are loaded on demand")
+            return []
 
-        tasks = []
-        for l in all_leaderboards:
-            task = asyncio.create_task(load_leaderboard_info(leaderboard=l))
-            tasks.append(task)
+        async def load_bugout_users() -> None:
+            user_idents = IdentityStore()
+            num_of_identities = 0
+            # Writes of /profile while pages are fetched go to current store,
+            # they are replayed over fetched identities before swap
+            current_idents = self._user_idents
+            current_idents.track_changes()
+            try:
+                async for resources in actions.iterate_resources(
+                    resource_type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_USER_IDENTIFIER
+                ):
+                    for r in resources:
+                        self.set_user_idents_from_resource(
+                            resource=r, user_idents=user_idents
+                        )
+                    num_of_identities += len(resources)
+                    logger.debug(
+                        f"Fetched page of {len(resources)} identities for users"
+                    )
+            except actions.ResourcesNotFetched as e:
+                logger.error(f"{e}, current user identities are kept")
+                return
+            finally:
+                changed_users = current_idents.stop_tracking_changes()
+
+            user_idents.replay_users(current_idents, changed_users)
+            self._user_idents = user_idents
+            self.users_loaded = True
+            logger.info(f"Fetched {num_of_identities} identities for users")
+
+        return [asyncio.create_task(load_bugout_users())]
+
+    async def load_leaderboards_info(
+        self, leaderboard_ids: Optional[List[uuid.UUID]] = None
+    ) -> int:
+        """
+        Fetch infos of leaderboards, by default of all linked ones, and apply
+        them to configurations in one write.
+        """
+        if leaderboard_ids is None:
+            leaderboard_ids = [
+                l.leaderboard_id
+                for server_config in self.server_configs.values()
+                for l in server_config.resource_data.leaderboards
+            ]
+        # Same leaderboard could be linked to several guilds, info is fetched once
+        unique_ids = list(dict.fromkeys(leaderboard_ids))
+        l_infos = await asyncio.gather(
+            *[actions.get_leaderboard_info(l_id=l_id) for l_id in unique_ids]
+        )
+        infos = {
+            l_id: l_info
+            for l_id, l_info in zip(unique_ids, l_infos)
+            if l_info is not None
+        }
+        self._config_store.set_leaderboards_info(infos)
 
-        return tasks
+        return len(infos)
 
     async def load_configs(self):
-        # TODO(kompotkot): Add pagination for resources
-        num_of_configs = await self.load_bugout_configs(semaphore=asyncio.Semaphore(1))
+        num_of_configs = await self.load_bugout_configs()
         logger.info(f"Loaded {num_of_configs} configurations")
 
-        semaphore = asyncio.Semaphore(4)
-        l_info_tasks = await self.load_leaderboards_info_tasks(semaphore=semaphore)
-        u_tasks = await self.load_bugout_users_tasks(semaphore=semaphore)
+        await self.load_configs_details()
+
+    async def load_configs_with_retries(self) -> None:
+        """
+        Retry failed initial load of server configurations with backoff until
+        it succeeds, then leaderboard infos with user identities are loaded.
+        Commands of renamed guilds are registered by load_bugout_configs.
+        """
+        delay = LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_DELAY
+        while not self.configs_loaded:
+            logger.warning(
+                f"Server configurations are not loaded, retry in {delay:.0f}s"
+            )
+            await asyncio.sleep(delay)
+            try:
+                await self.load_bugout_configs()
+            except Exception as e:
+                logger.error(f"Unable to load server configurations, err: {e}")
+            delay = min(delay * 2, LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_MAX_DELAY)
+
+        await self.load_configs_details()
+
+    async def load_configs_details(self):
+        """
+        Load leaderboard infos for known configurations and user identities.
+        """
+        # Concurrency is bounded by shared upstream limiters
+        u_tasks = await self.load_bugout_users_tasks()
+
+        await asyncio.gather(self.load_leaderboards_info(), *u_tasks)
+        logger.info("Loaded leaderboard infos and user identities")
+
+        await self.save_snapshot_async()
+
+    def load_snapshot(self) -> bool:
+        """
+        Restore server configurations, leaderboard infos and user identities
+        from local snapshot file.
+        """
+        if LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE == "":
+            return False
+
+        try:
+            with open(LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE) as ifp:
+                snapshot = data.BotSnapshot(**json.load(ifp))
+        except FileNotFoundError:
+            logger.info(
+                f"There is no snapshot at {LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE}, cold start"
+            )
+            return False
+        except Exception as e:
+            logger.warning(
+                f"Unable to load snapshot from {LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE}, err: {e}"
+            )
+            return False
+
+        self._config_store.replace_all(
+            {c.resource_data.discord_server_id: c for c in snapshot.server_configs}
+        )
+        if self.lazy_configs:
+            # Marked as expired, refreshed at first interaction of guild
+            self._server_configs_fetched_at = {
+                g_id: float("-inf") for g_id in self.server_configs
+            }
+        self._user_idents = IdentityStore.from_snapshot(
+            snapshot.user_idents, maxsize=self.users_maxsize
+        )
+        self.configs_loaded = True
+        self.users_loaded = True
+        self.snapshot_loaded = True
+
+        logger.info(
+            f"Loaded snapshot saved at {snapshot.saved_at} with {len(self._config_store)} configurations and {len(self._user_idents)} users"
+        )
+
+        return True
+
+    def dump_snapshot(self) -> str:
+        snapshot = data.BotSnapshot(
+            saved_at=datetime.now(timezone.utc),
+            server_configs=list(self.server_configs.values()),
+            user_idents=self._user_idents.to_snapshot(),
+        )
+        return snapshot.json()
+
+    def save_snapshot(self, dump: Optional[str] = None) -> None:
+        """
+        Atomically write snapshot to file.
+        """
+        # Do not override good snapshot with empty state if configurations never loaded
+        if LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE == "" or not self.configs_loaded:
+            return
 
-        await asyncio.gather(*[*l_info_tasks, *u_tasks])
+        try:
+            if dump is None:
+                dump = self.dump_snapshot()
+
+            snapshot_dir = os.path.dirname(LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE)
+            if snapshot_dir != "":
+                os.makedirs(snapshot_dir, exist_ok=True)
+            tmp_path = f"{LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE}.tmp"
+            with open(tmp_path, "w") as ofp:
+                ofp.write(dump)
+            os.replace(tmp_path, LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE)
+            logger.debug(f"Saved snapshot to {LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE}")
+        except Exception as e:
+            logger.error(
+                f"Unable to save snapshot to {LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE}, err: {e}"
+            )
+
+    async def save_snapshot_async(self) -> None:
+        # Dump consistent state in event loop, write file in thread
+        dump = self.dump_snapshot()
+        await asyncio.get_running_loop().run_in_executor(None, self.save_snapshot, dump)
+
+    async def save_snapshot_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(LEADERBOARD_DISCORD_BOT_SNAPSHOT_INTERVAL)
+            await self.save_snapshot_async()
+
+    async def log_metrics_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(LEADERBOARD_DISCORD_BOT_METRICS_INTERVAL)
+            logger.info(
+                f"Background tasks: {', '.join([str(m) for m in self.executor.metrics()])}"
+            )
+            logger.info(
+                f"Throttling buckets: {', '.join([str(m) for m in self.throttler.metrics()])}"
+            )
 
 
 class PingCog(commands.Cog):
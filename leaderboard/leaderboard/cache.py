@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+from . import data
+
+T = TypeVar("T")
+
+
+class CacheEntry(Generic[T]):
+    __slots__ = ("value", "version", "created_at")
+
+    def __init__(self, value: T, version: Optional[Any] = None) -> None:
+        self.value = value
+        self.version = version
+        self.created_at = time.monotonic()
+
+
+class TTLCache(Generic[T]):
+    """
+    In-memory LRU cache bounded by number of entries.
+
+    Entry is fresh during ttl seconds, after that during stale_ttl seconds
+    it could be served as stale while caller refreshes it. If version
+    provided at lookup, entry with another version is treated as missing.
+    """
+
+    def __init__(
+        self, name: str, maxsize: int, ttl: float, stale_ttl: float = 0
+    ) -> None:
+        self.name = name
+        self.maxsize = max(maxsize, 1)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries: "OrderedDict[Hashable, CacheEntry[T]]" = OrderedDict()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def lookup(
+        self, key: Hashable, version: Optional[Any] = None
+    ) -> Tuple[Optional[CacheEntry[T]], bool]:
+        """
+        Returns entry and its freshness, expired entries are evicted.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        if version is not None and entry.version != version:
+            del self._entries[key]
+            self.misses += 1
+            return None, False
+
+        age = time.monotonic() - entry.created_at
+        if age > self.ttl + self.stale_ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(key)
+        if age > self.ttl:
+            self.stale_hits += 1
+            return entry, False
+
+        self.hits += 1
+        return entry, True
+
+    def get(self, key: Hashable, version: Optional[Any] = None) -> Optional[T]:
+        """
+        Returns only fresh value.
+        """
+        entry, is_fresh = self.lookup(key, version=version)
+        if entry is None or not is_fresh:
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, value: T, version: Optional[Any] = None) -> None:
+        self._entries[key] = CacheEntry(value=value, version=version)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.pop(key, None)
+        return entry.value if entry is not None else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> data.CacheStats:
+        return data.CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            misses=self.misses,
+        )
@@ -2,11 +2,13 @@ import argparse
 import asyncio
 import json
 import logging
+import random
+import timeit
 from typing import Any, Dict, Optional
 
 from discord.ext import commands
 
-from . import actions
+from . import actions, data, tables
 from .bot import LeaderboardDiscordBot, configure_intents
 from .settings import (
     BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
@@ -130,8 +132,7 @@ def discord_run_handler(args: argparse.Namespace) -> None:
     intents = configure_intents()
     bot = LeaderboardDiscordBot(command_prefix=commands.when_mentioned, intents=intents)
 
-    asyncio.run(bot.load_configs())
-
+    # Configurations are loaded in setup_hook at bot event loop
     bot.run(token=LEADERBOARD_DISCORD_BOT_TOKEN)
 
 
@@ -150,6 +151,37 @@ def test_table_handler(args: argparse.Namespace) -> None:
         print(table.render_rst())
 
 
+def bench_table_handler(args: argparse.Namespace) -> None:
+    rand = random.Random(args.seed)
+    values = sorted([rand.randint(0, 10**12) for _ in range(args.rows)], reverse=True)
+    scores = [
+        data.Score(
+            address=f"0x{rand.getrandbits(160):040x}",
+            rank=i + 1,
+            score=value,
+            points_data={},
+        )
+        for i, value in enumerate(values)
+    ]
+
+    table = tables.ScoresTable(
+        columns=tables.score_columns(args.columns.split(",")),
+        layout=data.TableLayouts(args.layout),
+    )
+    if args.print:
+        print(table.render(scores))
+
+    timings = timeit.repeat(
+        lambda: table.render(scores), number=args.number, repeat=args.repeat
+    )
+    best = min(timings) / args.number
+    print(
+        f"Rendered {args.rows} rows with columns {args.columns} in {args.layout} layout: "
+        f"best {best * 1_000_000:.1f} us, "
+        f"mean {sum(timings) / len(timings) / args.number * 1_000_000:.1f} us per table"
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Moonstream leaderboard bot CLI")
     parser.set_defaults(func=lambda _: parser.print_help())
@@ -228,6 +260,41 @@ def main() -> None:
     )
     parser_test_table.set_defaults(func=test_table_handler)
 
+    parser_bench_table = subcommands.add_parser(
+        "bench-table", description="Micro-benchmark of scores table rendering"
+    )
+    parser_bench_table.add_argument(
+        "-r", "--rows", type=int, default=100, help="Number of score rows"
+    )
+    parser_bench_table.add_argument(
+        "-c",
+        "--columns",
+        type=str,
+        default="rank,address,score,delta",
+        help=f"Comma separated columns from: {', '.join(tables.SCORE_COLUMNS)}",
+    )
+    parser_bench_table.add_argument(
+        "-l",
+        "--layout",
+        type=str,
+        choices=[l.value for l in data.TableLayouts],
+        default=data.TableLayouts.MOBILE.value,
+        help="Width budget layout",
+    )
+    parser_bench_table.add_argument(
+        "-n", "--number", type=int, default=1000, help="Renders per repeat"
+    )
+    parser_bench_table.add_argument(
+        "--repeat", type=int, default=5, help="Number of repeats"
+    )
+    parser_bench_table.add_argument(
+        "--seed", type=int, default=42, help="Seed of generated scores"
+    )
+    parser_bench_table.add_argument(
+        "--print", action="store_true", help="Print rendered table"
+    )
+    parser_bench_table.set_defaults(func=bench_table_handler)
+
     args = parser.parse_args()
     args.func(args)
 
@@ -10,11 +10,7 @@ from discord.member import Member
 from discord.role import Role
 
 from .. import actions, data
-from ..settings import (
-    BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
-    LEADERBOARD_DISCORD_BOT_NAME,
-    MOONSTREAM_URL,
-)
+from ..settings import LEADERBOARD_DISCORD_BOT_NAME, MOONSTREAM_URL
 
 logger = logging.getLogger(__name__)
 
@@ -187,36 +183,31 @@ class ConfigureCog(commands.Cog):
             )
             return
 
-        new_leaderboard.leaderboard_info = l_info
-        if server_config is not None:
-            updated_leaderboards = server_config.resource_data.leaderboards[:]
+        if server_config is None or server_config.id is None:
+            resource = await actions.create_or_update_server_config(
+                discord_server_id=guild_id, leaderboards=[new_leaderboard]
+            )
         else:
-            updated_leaderboards = []
-        updated_leaderboards.append(new_leaderboard)
-
-        resource = await actions.create_or_update_server_config(
-            discord_server_id=guild_id,
-            leaderboards=updated_leaderboards,
-            resource_id=server_config.id if server_config is not None else None,
-        )
+            try:
+                resource = await actions.patch_server_config_leaderboards(
+                    resource_id=server_config.id,
+                    add_leaderboard=new_leaderboard,
+                    expected_updated_at=server_config.updated_at,
+                )
+            except actions.ServerConfigConflict as e:
+                logger.warning(e)
+                self.bot.set_server_configs_from_resource(resource=e.resource)
+                await interaction.followup.send(
+                    embed=discord.Embed(description=data.MESSAGE_CONFIG_CONFLICT),
+                )
+                return
         if resource is None:
             return
 
-        if server_config is None:
-            server_config = data.ResourceConfig(
-                id=resource.id,
-                resource_data=data.Config(
-                    type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
-                    discord_server_id=guild_id,
-                    discord_auth_roles=[],
-                    leaderboards=updated_leaderboards,
-                ),
-            )
-            self.bot.server_configs[guild_id] = server_config
-        else:
-            server_config.resource_data.leaderboards.clear()
-            server_config.resource_data.leaderboards = updated_leaderboards
-            self.bot.server_configs[guild_id] = server_config
+        self.bot.set_server_configs_from_resource(resource=resource)
+        self.bot.config_store.set_leaderboards_info(
+            {new_leaderboard.leaderboard_id: l_info}
+        )
 
         await interaction.followup.send(
             embed=actions.prepare_dynamic_embed(
@@ -244,23 +235,30 @@ class ConfigureCog(commands.Cog):
     async def background_process_unlink_leaderboard(
         self,
         interaction: discord.Interaction,
-        updated_leaderboards: List[data.ConfigLeaderboard],
-        unlink_leaderboard_id: str,
+        unlink_leaderboard_id: uuid.UUID,
         guild_id: int,
         server_config: data.ResourceConfig,
     ):
-        resource = await actions.create_or_update_server_config(
-            discord_server_id=guild_id,
-            leaderboards=updated_leaderboards,
-            resource_id=server_config.id if server_config is not None else None,
-        )
-        if resource is None:
+        if server_config.id is None:
             return
 
-        server_config.resource_data.leaderboards.clear()
-        server_config.resource_data.leaderboards = updated_leaderboards
+        try:
+            resource = await actions.patch_server_config_leaderboards(
+                resource_id=server_config.id,
+                remove_leaderboard_id=unlink_leaderboard_id,
+                expected_updated_at=server_config.updated_at,
+            )
+        except actions.ServerConfigConflict as e:
+            logger.warning(e)
+            self.bot.set_server_configs_from_resource(resource=e.resource)
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_CONFIG_CONFLICT),
+            )
+            return
+        if resource is None:
+            return
 
-        self.bot.server_configs[guild_id] = server_config
+        self.bot.set_server_configs_from_resource(resource=resource)
 
         await interaction.followup.send(
             embed=actions.prepare_dynamic_embed(
@@ -290,21 +288,7 @@ class ConfigureCog(commands.Cog):
         if resource is None:
             return
 
-        if server_config is None:
-            server_config = data.ResourceConfig(
-                id=resource.id,
-                resource_data=data.Config(
-                    type=BUGOUT_RESOURCE_TYPE_DISCORD_BOT_CONFIG,
-                    discord_server_id=guild_id,
-                    discord_auth_roles=updated_auth_roles,
-                    leaderboards=[],
-                ),
-            )
-            self.bot.server_configs[guild_id] = server_config
-        else:
-            server_config.resource_data.discord_auth_roles.clear()
-            server_config.resource_data.discord_auth_roles = updated_auth_roles
-            self.bot.server_configs[guild_id] = server_config
+        self.bot.set_server_configs_from_resource(resource=resource)
 
         await interaction.followup.send(
             embed=discord.Embed(
@@ -337,14 +321,20 @@ class ConfigureCog(commands.Cog):
                 )
                 updated_auth_role_ids.append(new_role["id"])
 
-        self.bot.loop.create_task(
+        is_submitted = self.bot.executor.submit(
+            data.BackgroundTaskKinds.CONFIGURE,
             self.background_process_update_auth_roles(
                 interaction=interaction,
                 guild_id=guild_id,
                 updated_auth_roles=updated_auth_roles,
                 server_config=server_config,
-            )
+            ),
         )
+        if not is_submitted:
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_BOT_BUSY),
+                ephemeral=True,
+            )
 
     async def handle_link_new_leaderboard(
         self,
@@ -395,14 +385,20 @@ class ConfigureCog(commands.Cog):
             channel_ids=channel_ids,
         )
 
-        self.bot.loop.create_task(
+        is_submitted = self.bot.executor.submit(
+            data.BackgroundTaskKinds.CONFIGURE,
             self.background_process_link_leaderboard(
                 interaction=interaction,
                 new_leaderboard=new_leaderboard,
                 guild_id=guild_id,
                 server_config=server_config,
-            )
+            ),
         )
+        if not is_submitted:
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_BOT_BUSY),
+                ephemeral=True,
+            )
 
     async def handle_unlink_leaderboard(
         self,
@@ -417,16 +413,13 @@ class ConfigureCog(commands.Cog):
         if server_config is None:
             return
 
-        is_unlink = False
-        updated_leaderboards: List[data.ConfigLeaderboard] = []
+        unlink_leaderboard_id: Optional[uuid.UUID] = None
         for l in server_config.resource_data.leaderboards:
             if str(l.leaderboard_id) == str(configure_view.unlink_leaderboard_id):
-                is_unlink = True
-                continue
+                unlink_leaderboard_id = l.leaderboard_id
+                break
 
-            updated_leaderboards.append(l)
-
-        if is_unlink is False:
+        if unlink_leaderboard_id is None:
             await interaction.followup.send(
                 embed=discord.Embed(
                     description=f"Leaderboard with ID: **{str(configure_view.unlink_leaderboard_id)}** not found in linked to this Discord server"
@@ -434,15 +427,20 @@ class ConfigureCog(commands.Cog):
             )
             return
 
-        self.bot.loop.create_task(
+        is_submitted = self.bot.executor.submit(
+            data.BackgroundTaskKinds.CONFIGURE,
             self.background_process_unlink_leaderboard(
                 interaction=interaction,
-                updated_leaderboards=updated_leaderboards,
-                unlink_leaderboard_id=str(configure_view.unlink_leaderboard_id),
+                unlink_leaderboard_id=unlink_leaderboard_id,
                 guild_id=guild_id,
                 server_config=server_config,
-            )
+            ),
         )
+        if not is_submitted:
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_BOT_BUSY),
+                ephemeral=True,
+            )
 
     # @app_commands.command(
     #     name="configure", description=f"Configure {LEADERBOARD_DISCORD_BOT_NAME} bot"
@@ -464,10 +462,18 @@ class ConfigureCog(commands.Cog):
             )
             return
 
-        server_config: Optional[data.ResourceConfig] = self.bot.server_configs.get(
+        server_config: Optional[data.ResourceConfig] = await self.bot.get_server_config(
             interaction.guild.id
         )
 
+        # Without loaded configurations new config could be created over existing one
+        if not self.bot.is_server_config_loaded(interaction.guild.id):
+            await interaction.response.send_message(
+                embed=discord.Embed(description=data.MESSAGE_DATA_LOADING),
+                ephemeral=True,
+            )
+            return
+
         is_allowed = actions.auth_middleware(
             user_id=interaction.user.id,
             user_roles=(
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 from typing import Any, List, Optional
@@ -34,6 +35,35 @@ class LeaderboardsCog(commands.Cog):
     def slash_command_data(self) -> data.SlashCommandData:
         return self._slash_command_data
 
+    async def get_leaderboard_info(
+        self, l_id: uuid.UUID
+    ) -> Optional[data.LeaderboardInfo]:
+        try:
+            return await actions.get_leaderboard_info(l_id)
+        except Exception as e:
+            logger.warning(f"Unable to get leaderboard info {str(l_id)}, err: {e}")
+            return None
+
+    def prepare_leaderboard_fields(
+        self,
+        l: data.ConfigLeaderboard,
+        l_info: Optional[data.LeaderboardInfo] = None,
+    ) -> List[Any]:
+        return [
+            {
+                "field_name": "Short name",
+                "field_value": l.short_name,
+            },
+            {
+                "field_name": "Title",
+                "field_value": f"[{l_info.title if l_info is not None else '-'}]({MOONSTREAM_URL}/leaderboards/?leaderboard_id={l.leaderboard_id})",
+            },
+            {
+                "field_name": "Description",
+                "field_value": (l_info.description if l_info is not None else "-"),
+            },
+        ]
+
     async def slash_command_handler(self, interaction: discord.Interaction):
         logger.info(
             actions.prepare_log_message(
@@ -51,9 +81,18 @@ class LeaderboardsCog(commands.Cog):
             )
             return
 
-        server_config: Optional[data.ResourceConfig] = self.bot.server_configs.get(
+        server_config: Optional[data.ResourceConfig] = await self.bot.get_server_config(
             interaction.guild.id
         )
+        if server_config is None and not self.bot.is_server_config_loaded(
+            interaction.guild.id
+        ):
+            await interaction.response.send_message(
+                embed=discord.Embed(description=data.MESSAGE_DATA_LOADING),
+                ephemeral=True,
+            )
+            return
+
         if server_config is None:
             await interaction.response.send_message(
                 embed=discord.Embed(description="Guild not configured")
@@ -66,32 +105,38 @@ class LeaderboardsCog(commands.Cog):
             )
             return
 
-        leaderboard_fields = [
-            [
-                {
-                    "field_name": "Short name",
-                    "field_value": l.short_name,
-                },
-                {
-                    "field_name": "Title",
-                    "field_value": f"[{l.leaderboard_info.title if l.leaderboard_info is not None else '-'}]({MOONSTREAM_URL}/leaderboards/?leaderboard_id={l.leaderboard_id})",
-                },
-                {
-                    "field_name": "Description",
-                    "field_value": (
-                        l.leaderboard_info.description
+        leaderboards = list(server_config.resource_data.leaderboards)
+
+        async def leaderboards_page(offset: int, limit: int) -> List[List[Any]]:
+            page = leaderboards[offset : offset + limit]
+            # Leaderboard info could be still loading in background, only
+            # infos of shown page are requested
+            missing_ids = [l.leaderboard_id for l in page if l.leaderboard_info is None]
+            fetched_infos = dict(
+                zip(
+                    missing_ids,
+                    await asyncio.gather(
+                        *[self.get_leaderboard_info(l_id) for l_id in missing_ids]
+                    ),
+                )
+            )
+            return [
+                self.prepare_leaderboard_fields(
+                    l,
+                    (
+                        l.leaderboard_info
                         if l.leaderboard_info is not None
-                        else "-"
+                        else fetched_infos.get(l.leaderboard_id)
                     ),
-                },
+                )
+                for l in page
             ]
-            for l in server_config.resource_data.leaderboards
-        ]
 
         leaderboards_view = LeaderboardsView(
             title="Linked leaderboards",
             description="",
-            wrapped_fields=leaderboard_fields,
+            page_provider=leaderboards_page,
+            total_items=len(leaderboards),
         )
 
         await leaderboards_view.send(interaction)
@@ -1,12 +1,14 @@
 import logging
 import uuid
-from typing import Any, List, Optional
+from typing import Any, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from .. import actions, data
+from ..identities import IdentityRecord
+from ..settings import LEADERBOARD_DISCORD_BOT_USER_LOAD_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +107,7 @@ class ProfileCog(commands.Cog):
         self,
         interaction: discord.Interaction,
         discord_user_id: int,
-        new_ident: data.UserIdentity,
+        new_ident: IdentityRecord,
     ) -> None:
         resource = await actions.push_user_identity(
             discord_user_id=discord_user_id,
@@ -123,10 +125,10 @@ class ProfileCog(commands.Cog):
 
         new_ident.resource_id = resource.id
 
-        if self.bot.user_idents.get(discord_user_id) is None:
-            self.bot.user_idents[discord_user_id] = [new_ident]
-        else:
-            self.bot.user_idents[discord_user_id].append(new_ident)
+        if not self.bot.user_idents.add(discord_user_id, new_ident):
+            logger.warning(
+                f"Identity: {new_ident.identifier} already added to user with ID: {discord_user_id}"
+            )
 
         await interaction.followup.send(
             embed=actions.prepare_dynamic_embed(
@@ -154,8 +156,7 @@ class ProfileCog(commands.Cog):
         self,
         interaction: discord.Interaction,
         discord_user_id: int,
-        ident_to_remove: data.UserIdentity,
-        updated_identities: List[data.UserIdentity],
+        ident_to_remove: IdentityRecord,
     ) -> None:
         removed_resource_id: Optional[uuid.UUID] = None
         if ident_to_remove.resource_id is not None:
@@ -171,7 +172,7 @@ class ProfileCog(commands.Cog):
             )
             return
 
-        self.bot.user_idents[discord_user_id] = updated_identities
+        self.bot.user_idents.remove(discord_user_id, ident_to_remove.identifier)
 
         await interaction.followup.send(
             embed=actions.prepare_dynamic_embed(
@@ -196,9 +197,11 @@ class ProfileCog(commands.Cog):
         user_view: UserView,
         interaction: discord.Interaction,
         discord_user_id: int,
-        user_identities: List[data.UserIdentity],
     ) -> None:
-        if str(user_view.ident_input) in [i.identifier for i in user_identities]:
+        if (
+            self.bot.user_idents.find(discord_user_id, str(user_view.ident_input))
+            is not None
+        ):
             await interaction.followup.send(
                 embed=discord.Embed(
                     description="Identity already attached to your profile"
@@ -207,28 +210,33 @@ class ProfileCog(commands.Cog):
             )
             return
 
-        new_ident = data.UserIdentity(
+        new_ident = IdentityRecord(
             resource_id=None,
             identifier=str(user_view.ident_input),
             name=str(user_view.name_input),
         )
 
-        self.bot.loop.create_task(
+        is_submitted = self.bot.executor.submit(
+            data.BackgroundTaskKinds.PROFILE,
             self.background_process_add_user_identity(
                 interaction=interaction,
                 discord_user_id=discord_user_id,
                 new_ident=new_ident,
-            )
+            ),
         )
+        if not is_submitted:
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_BOT_BUSY),
+                ephemeral=True,
+            )
 
     async def handle_remove_user_identity(
         self,
         user_view: UserView,
         interaction: discord.Interaction,
         discord_user_id: int,
-        user_identities: List[data.UserIdentity],
     ) -> None:
-        if len(user_identities) == 0:
+        if discord_user_id not in self.bot.user_idents:
             await interaction.followup.send(
                 embed=discord.Embed(
                     description="User does not have any identity linked to Discord account"
@@ -237,15 +245,9 @@ class ProfileCog(commands.Cog):
             )
             return
 
-        ident_to_remove: Optional[data.UserIdentity] = None
-        updated_identities: List[data.UserIdentity] = []
-        for i in user_identities:
-            if str(user_view.remove_ident_input) == i.identifier:
-                ident_to_remove = i
-                continue
-
-            updated_identities.append(i)
-
+        ident_to_remove = self.bot.user_idents.find(
+            discord_user_id, str(user_view.remove_ident_input)
+        )
         if ident_to_remove is None:
             await interaction.followup.send(
                 embed=discord.Embed(
@@ -255,14 +257,19 @@ class ProfileCog(commands.Cog):
             )
             return
 
-        self.bot.loop.create_task(
+        is_submitted = self.bot.executor.submit(
+            data.BackgroundTaskKinds.PROFILE,
             self.background_process_remove_user_identity(
                 interaction=interaction,
                 discord_user_id=discord_user_id,
                 ident_to_remove=ident_to_remove,
-                updated_identities=updated_identities,
-            )
+            ),
         )
+        if not is_submitted:
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_BOT_BUSY),
+                ephemeral=True,
+            )
 
     # @app_commands.command(name="user", description=f"User settings")
     async def slash_command_handler(self, interaction: discord.Interaction):
@@ -276,10 +283,24 @@ class ProfileCog(commands.Cog):
             )
         )
 
+        if not self.bot.users_loaded:
+            await interaction.response.send_message(
+                embed=discord.Embed(description=data.MESSAGE_DATA_LOADING),
+                ephemeral=True,
+            )
+            return
+
         discord_user_id = interaction.user.id
-        user_identities: List[data.UserIdentity] = self.bot.user_idents.get(
-            discord_user_id, []
-        )
+        if not await self.bot.load_user_identities(
+            discord_user_id, timeout=LEADERBOARD_DISCORD_BOT_USER_LOAD_TIMEOUT
+        ):
+            await interaction.response.send_message(
+                embed=discord.Embed(description=data.MESSAGE_DATA_LOADING),
+                ephemeral=True,
+            )
+            return
+
+        user_identities = self.bot.user_idents.get(discord_user_id)
 
         identity_fields = [
             [
@@ -319,7 +340,6 @@ class ProfileCog(commands.Cog):
                 user_view=user_view,
                 interaction=interaction,
                 discord_user_id=discord_user_id,
-                user_identities=user_identities,
             )
             return
 
@@ -328,6 +348,5 @@ class ProfileCog(commands.Cog):
                 user_view=user_view,
                 interaction=interaction,
                 discord_user_id=discord_user_id,
-                user_identities=user_identities,
             )
             return
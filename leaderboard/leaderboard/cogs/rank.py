@@ -6,8 +6,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from .. import actions, data
-from ..settings import MOONSTREAM_LOGO_URL
+from .. import actions, data, formatters
+from ..settings import (
+    LEADERBOARD_DISCORD_BOT_USER_LOAD_TIMEOUT,
+    MOONSTREAM_LOGO_URL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,44 +72,15 @@ class RankCog(commands.Cog):
     def prepare_embed(
         self, l_score: data.Score, l_info: Optional[data.LeaderboardInfo] = None
     ) -> discord.Embed:
-        # TODO(kompotkot): Write normal score_details parser
-
-        score_details_raw = l_score.points_data.get("score_details", {})
-
-        address_name = "Identity"
-        score = str(l_score.score)
-        try:
-            # Score field render
-            score_details = data.ScoreDetails(**score_details_raw)
-            score_updated = ""
-            if score_details.prefix is not None:
-                score_updated += score_details.prefix
-            if (
-                score_details.conversion is not None
-                and score_details.conversion_vector is not None
-            ):
-                score_converted = actions.score_converter(
-                    source=l_score.score,
-                    conversion=score_details.conversion,
-                    conversion_vector=score_details.conversion_vector,
-                )
-                score_updated += str(score_converted)
-            else:
-                score_updated += str(l_score.score)
-
-            if score_details.postfix is not None:
-                score_updated += score_details.postfix
-
-            score = score_updated
-        except:
-            pass
+        formatter = formatters.get_score_formatter(
+            l_info.id if l_info is not None else None,
+            l_score.points_data.get("score_details"),
+        )
 
-        try:
-            # Identity render
-            if score_details.address_name is not None:
-                address_name = score_details.address_name
-        except:
-            pass
+        address_name = (
+            formatter.address_name if formatter.address_name is not None else "Identity"
+        )
+        score = formatter.format(l_score.score)
 
         description = ""
         is_complete = l_score.points_data.get("complete")
@@ -117,46 +91,19 @@ class RankCog(commands.Cog):
         must_reach_counter = l_score.points_data.get("must_reach_counter")
         must_reach_line = ""
         if must_reach is not None and must_reach_counter is not None:
-            must_reach_line += f"Must Reach: {must_reach_counter} / {must_reach}"
+            if formatter.is_converted:
+                must_reach_line += f"Must Reach: {formatter.convert(must_reach_counter)} / {int(formatter.convert(must_reach))}{formatter.postfix}"
+            else:
+                must_reach_line += f"Must Reach: {must_reach_counter} / {must_reach}"
             must_reach_line += "\n"
 
         cap = l_score.points_data.get("cap")
         cap_line = ""
         if cap is not None:
-            cap_line += f"Cap: {cap}"
-
-        try:
-            # Description render
-            score_details = data.ScoreDetails(**score_details_raw)
-            if (
-                score_details.conversion is not None
-                and score_details.conversion_vector is not None
-            ):
-                if must_reach is not None and must_reach_counter is not None:
-                    must_reach_converted = actions.score_converter(
-                        source=must_reach,
-                        conversion=score_details.conversion,
-                        conversion_vector=score_details.conversion_vector,
-                    )
-                    must_reach_counter_converted = actions.score_converter(
-                        source=must_reach_counter,
-                        conversion=score_details.conversion,
-                        conversion_vector=score_details.conversion_vector,
-                    )
-                cap_converted = actions.score_converter(
-                    source=cap,
-                    conversion=score_details.conversion,
-                    conversion_vector=score_details.conversion_vector,
-                )
-
-                must_reach_line = f"Must Reach: {must_reach_counter_converted} / {int(must_reach_converted)}"
-                cap_line = f"Cap: {int(cap_converted)}"
-                if score_details.postfix is not None:
-                    must_reach_line += score_details.postfix
-                    cap_line += score_details.postfix
-                must_reach_line += "\n"
-        except:
-            pass
+            if formatter.is_converted:
+                cap_line += f"Cap: {int(formatter.convert(cap))}{formatter.postfix}"
+            else:
+                cap_line += f"Cap: {cap}"
 
         description += must_reach_line
         description += cap_line
@@ -189,13 +136,22 @@ class RankCog(commands.Cog):
 
         server_config: Optional[data.ResourceConfig] = None
         if interaction.guild is not None:
-            server_config = self.bot.server_configs.get(interaction.guild.id)
+            server_config = await self.bot.get_server_config(interaction.guild.id)
         else:
             await interaction.response.send_message(
                 embed=discord.Embed(description=data.MESSAGE_GUILD_NOT_FOUND)
             )
             return
 
+        if server_config is None and not self.bot.is_server_config_loaded(
+            interaction.guild.id
+        ):
+            await interaction.response.send_message(
+                embed=discord.Embed(description=data.MESSAGE_DATA_LOADING),
+                ephemeral=True,
+            )
+            return
+
         if server_config is None:
             await interaction.response.send_message(
                 embed=discord.Embed(description=data.MESSAGE_LEADERBOARD_NOT_FOUND)
@@ -208,11 +164,9 @@ class RankCog(commands.Cog):
             )
             return
 
-        leaderboards: List[data.ConfigLeaderboard] = []
-        for l in server_config.resource_data.leaderboards:
-            for ch in l.channel_ids:
-                if interaction.channel.id == ch:
-                    leaderboards.append(l)
+        leaderboards = self.bot.channel_index.get(
+            interaction.guild.id, interaction.channel.id
+        )
 
         leaderboard_id: Optional[uuid.UUID] = None
         leaderboards_len = len(leaderboards)
@@ -285,23 +239,19 @@ class RankCog(commands.Cog):
         if interaction.user is None:
             return autocompletion
 
-        user_identities: List[data.UserIdentity] = self.bot.user_idents.get(
-            interaction.user.id, []
-        )
+        if not await self.bot.load_user_identities(
+            interaction.user.id, timeout=LEADERBOARD_DISCORD_BOT_USER_LOAD_TIMEOUT
+        ):
+            return autocompletion
 
-        cnt = 0
+        user_identities = self.bot.user_idents.search(
+            interaction.user.id, query=current, limit=20
+        )
         for i in user_identities:
-            if cnt >= 20:
-                break
-            if (
-                current.lower() in i.name.lower()
-                or current.lower() in i.identifier.lower()
-            ):
-                autocompletion.append(
-                    app_commands.Choice(
-                        name=f"{i.identifier} - {i.name}"[:99],
-                        value=i.identifier,
-                    )
+            autocompletion.append(
+                app_commands.Choice(
+                    name=f"{i.identifier} - {i.name}"[:99],
+                    value=i.identifier,
                 )
-                cnt += 1
+            )
         return autocompletion
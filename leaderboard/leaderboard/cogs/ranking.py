@@ -5,7 +5,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from .. import actions, data
+from .. import actions, data, formatters, tables
 from ..settings import LEADERBOARD_DISCORD_BOT_NAME, MOONSTREAM_URL
 
 logger = logging.getLogger(__name__)
@@ -29,11 +29,36 @@ class RankingCog(commands.Cog):
         self,
         l_info: Optional[data.LeaderboardInfo] = None,
         l_scores: Optional[List[data.Score]] = None,
+    ) -> discord.Embed:
+        """
+        Embed with top scores table, rendered payload is cached until
+        leaderboard data changes.
+        """
+        if l_info is None:
+            return self.render_embed(l_info=l_info, l_scores=l_scores)
+
+        version = actions.ranking_embed_version(l_info=l_info, l_scores=l_scores)
+        payload = actions.ranking_embeds_cache.get(l_info.id, version=version)
+        if payload is None:
+            payload = self.render_embed(l_info=l_info, l_scores=l_scores).to_dict()
+            actions.ranking_embeds_cache.set(l_info.id, payload, version=version)
+
+        return discord.Embed.from_dict(payload)
+
+    def render_embed(
+        self,
+        l_info: Optional[data.LeaderboardInfo] = None,
+        l_scores: Optional[List[data.Score]] = None,
     ) -> discord.Embed:
         table: Optional[str] = None
         if l_scores is not None:
+            formatter = formatters.get_scores_formatter(
+                l_info.id if l_info is not None else None, l_scores
+            )
             tabular = actions.TabularData()
-            tabular.set_columns(["rank", "address", "score"])
+            tabular.set_columns(
+                ["rank", "address", tables.converted_score_column(formatter)]
+            )
             tabular.add_scores(l_scores)
             table = tabular.render_rst()
 
@@ -57,6 +82,20 @@ class RankingCog(commands.Cog):
 
         return embed
 
+    def throttled_response(
+        self, interaction: discord.Interaction
+    ) -> Optional[discord.Embed]:
+        """
+        Cached ranking for throttled command, None if leaderboard is not cached.
+        """
+        l_id = actions.get_interaction_option(interaction, "id")
+        if l_id is None:
+            return None
+        l_info, l_scores = actions.get_cached_leaderboard_info_with_scores(str(l_id))
+        if l_info is None or l_scores is None:
+            return None
+        return self.prepare_embed(l_info=l_info, l_scores=l_scores)
+
     async def background_process_ranking(
         self,
         user: Any,
@@ -76,6 +115,9 @@ class RankingCog(commands.Cog):
             await channel.send(
                 embed=self.prepare_embed(l_info=l_info, l_scores=l_scores)
             )
+            logger.debug(
+                f"Leaderboard caches: {', '.join([str(s) for s in actions.caches_stats()])}"
+            )
         except discord.errors.Forbidden:
             await user.send(
                 embed=discord.Embed(
@@ -109,11 +151,17 @@ class RankingCog(commands.Cog):
             embed=discord.Embed(description=f"Processing leaderboard with ID {id}")
         )
 
-        self.bot.loop.create_task(
+        is_submitted = self.bot.executor.submit(
+            data.BackgroundTaskKinds.RANKING,
             self.background_process_ranking(
                 user=interaction.user, channel=interaction.channel, l_id=id
-            )
+            ),
         )
+        if not is_submitted:
+            await interaction.followup.send(
+                embed=discord.Embed(description=data.MESSAGE_BOT_BUSY),
+                ephemeral=True,
+            )
 
     # @ranking.autocomplete("id")
     async def slash_command_autocompletion(
@@ -125,18 +173,17 @@ class RankingCog(commands.Cog):
         if interaction.guild is None:
             return autocompletion
 
-        server_config = self.bot.server_configs.get(interaction.guild.id)
+        server_config = await self.bot.get_server_config(interaction.guild.id)
 
-        cnt = 0
         if server_config is not None:
-            for l in server_config.resource_data.leaderboards:
-                if cnt >= 20:
-                    break
-                if current.lower() in l.short_name.lower():
-                    autocompletion.append(
-                        app_commands.Choice(
-                            name=l.short_name, value=str(l.leaderboard_id)
-                        )
-                    )
-                    cnt += 1
+            leaderboards = self.bot.leaderboards_search.search(
+                owner=interaction.guild.id,
+                items=server_config.resource_data.leaderboards,
+                query=current,
+                limit=20,
+            )
+            for l in leaderboards:
+                autocompletion.append(
+                    app_commands.Choice(name=l.short_name, value=str(l.leaderboard_id))
+                )
         return autocompletion
@@ -0,0 +1,194 @@
+import logging
+import uuid
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+
+from . import data
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigChange:
+    """
+    Change of server configurations. Without guild_id all configurations
+    were replaced at once.
+    """
+
+    __slots__ = ("guild_id", "old", "new")
+
+    def __init__(
+        self,
+        guild_id: Optional[int] = None,
+        old: Optional[data.ResourceConfig] = None,
+        new: Optional[data.ResourceConfig] = None,
+    ) -> None:
+        self.guild_id = guild_id
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        return f"ConfigChange(guild_id={self.guild_id!r})"
+
+
+ConfigListener = Callable[[ConfigChange], None]
+
+
+def with_leaderboards(
+    server_config: data.ResourceConfig, leaderboards: List[data.ConfigLeaderboard]
+) -> data.ResourceConfig:
+    return server_config.copy(
+        update={
+            "resource_data": server_config.resource_data.copy(
+                update={"leaderboards": list(leaderboards)}
+            )
+        }
+    )
+
+
+def with_leaderboards_info(
+    server_config: data.ResourceConfig,
+    infos: Mapping[uuid.UUID, data.LeaderboardInfo],
+) -> Optional[data.ResourceConfig]:
+    """
+    Copy of configuration with new leaderboard infos, None if nothing changed.
+    """
+    changed = False
+    leaderboards: List[data.ConfigLeaderboard] = []
+    for l in server_config.resource_data.leaderboards:
+        info = infos.get(l.leaderboard_id)
+        if info is not None and info != l.leaderboard_info:
+            l = l.copy(update={"leaderboard_info": info})
+            changed = True
+        leaderboards.append(l)
+
+    if not changed:
+        return None
+    return with_leaderboards(server_config, leaderboards)
+
+
+def is_same_config(
+    server_config: data.ResourceConfig, other_config: data.ResourceConfig
+) -> bool:
+    """
+    Compare configurations ignoring leaderboard infos, they are not managed
+    by configuration owners.
+    """
+    exclude = {"resource_data": {"leaderboards": {"__all__": {"leaderboard_info"}}}}
+    return server_config.dict(exclude=exclude) == other_config.dict(exclude=exclude)
+
+
+class ConfigStore:
+    """
+    Server configurations by guild ID published as immutable snapshots.
+
+    Every write builds new mapping and new configuration objects instead of
+    mutating published ones, so readers can keep a snapshot across awaits
+    without locks. Subscribers are notified synchronously after each write.
+    """
+
+    def __init__(self) -> None:
+        self._configs: Dict[int, data.ResourceConfig] = {}
+        self._snapshot: Mapping[int, data.ResourceConfig] = MappingProxyType(
+            self._configs
+        )
+        self._listeners: List[ConfigListener] = []
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._configs
+
+    @property
+    def snapshot(self) -> Mapping[int, data.ResourceConfig]:
+        return self._snapshot
+
+    def get(self, guild_id: int) -> Optional[data.ResourceConfig]:
+        return self._configs.get(guild_id)
+
+    def subscribe(self, listener: ConfigListener) -> Callable[[], None]:
+        """
+        Register change listener, returns function to unsubscribe.
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _publish(
+        self, configs: Dict[int, data.ResourceConfig], changes: List[ConfigChange]
+    ) -> None:
+        self._configs = configs
+        self._snapshot = MappingProxyType(configs)
+        for change in changes:
+            for listener in list(self._listeners):
+                try:
+                    listener(change)
+                except Exception as e:
+                    logger.error(f"Configuration listener failed on {change}, err: {e}")
+
+    def set(self, guild_id: int, server_config: data.ResourceConfig) -> None:
+        self.apply({guild_id: server_config})
+
+    def remove(self, guild_id: int) -> None:
+        self.apply({guild_id: None})
+
+    def apply(self, updates: Mapping[int, Optional[data.ResourceConfig]]) -> int:
+        """
+        Set or remove (with None) configurations of several guilds in one
+        write, returns number of changed configurations.
+        """
+        configs = dict(self._configs)
+        changes: List[ConfigChange] = []
+        for guild_id, server_config in updates.items():
+            old = configs.get(guild_id)
+            if old is server_config:
+                continue
+            if server_config is None:
+                del configs[guild_id]
+            else:
+                configs[guild_id] = server_config
+            changes.append(ConfigChange(guild_id=guild_id, old=old, new=server_config))
+
+        if len(changes) != 0:
+            self._publish(configs, changes)
+        return len(changes)
+
+    def replace_all(self, configs: Mapping[int, data.ResourceConfig]) -> None:
+        self._publish(dict(configs), [ConfigChange()])
+
+    def set_leaderboards_info(
+        self, infos: Mapping[uuid.UUID, data.LeaderboardInfo]
+    ) -> int:
+        """
+        Apply leaderboard infos to all configurations in one write, returns
+        number of changed configurations.
+        """
+        if len(infos) == 0:
+            return 0
+
+        configs = dict(self._configs)
+        changes: List[ConfigChange] = []
+        for guild_id, server_config in self._configs.items():
+            updated_config = with_leaderboards_info(server_config, infos)
+            if updated_config is None:
+                continue
+            configs[guild_id] = updated_config
+            changes.append(
+                ConfigChange(guild_id=guild_id, old=server_config, new=updated_config)
+            )
+
+        if len(changes) != 0:
+            self._publish(configs, changes)
+        return len(changes)
+
+    def leaderboard_infos(self) -> Dict[uuid.UUID, data.LeaderboardInfo]:
+        infos: Dict[uuid.UUID, data.LeaderboardInfo] = {}
+        for server_config in self._configs.values():
+            for l in server_config.resource_data.leaderboards:
+                if l.leaderboard_info is not None:
+                    infos[l.leaderboard_id] = l.leaderboard_info
+        return infos
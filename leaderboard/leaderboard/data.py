@@ -11,6 +11,12 @@ MESSAGE_RANK_NOT_FOUND = "Rank not found"
 MESSAGE_CHANNEL_NOT_FOUND = "Discord channel not found"
 MESSAGE_GUILD_NOT_FOUND = "Discord guild not found"
 MESSAGE_ACCESS_DENIED = "Access denied"
+MESSAGE_DATA_LOADING = "Bot is still loading data, please try again in a moment"
+MESSAGE_CONFIG_CONFLICT = (
+    "Server configuration was changed meanwhile, please check it and try again"
+)
+MESSAGE_BOT_BUSY = "Bot is busy at the moment, please try again later"
+MESSAGE_THROTTLED = "Too many commands, please slow down and try again in a moment"
 MESSAGE_INTERNAL_SERVER_ERROR = (
     "Internal server error, please try again later or talk to administrator"
 )
@@ -23,6 +29,89 @@ class RequestMethods(Enum):
     DELETE = "delete"
 
 
+class Upstreams(Enum):
+    ENGINE_API = "engine_api"
+    BROOD = "brood"
+    DISCORD = "discord"
+
+
+class UpstreamLimiterMetrics(BaseModel):
+    upstream: str
+    limit: int
+    in_flight: int
+    waiting: int
+    max_waiting: int
+    acquired: int
+    rejected: int
+    avg_wait: float
+
+
+class BackgroundTaskKinds(Enum):
+    RANKING = "ranking"
+    PROFILE = "profile"
+    CONFIGURE = "configure"
+
+
+class BackgroundTaskKindMetrics(BaseModel):
+    kind: str
+    limit: int
+    in_flight: int
+    queued: int
+    max_queued: int
+    submitted: int
+    shed: int
+    completed: int
+    failed: int
+    avg_wait: float
+    avg_run: float
+
+
+class ThrottleScopes(Enum):
+    USER = "user"
+    GUILD = "guild"
+    GLOBAL = "global"
+
+
+class ThrottleScopeMetrics(BaseModel):
+    scope: str
+    rate: float
+    burst: int
+    buckets: int
+    max_buckets: int
+    allowed: int
+    throttled: int
+
+
+class TableLayouts(Enum):
+    MOBILE = "mobile"
+    DESKTOP = "desktop"
+
+
+class CircuitStates(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreakerMetrics(BaseModel):
+    host: str
+    state: CircuitStates
+    consecutive_failures: int
+    failures: int
+    rejected: int
+    last_error: Optional[str] = None
+    opened_at: Optional[datetime] = None
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    maxsize: int
+    hits: int
+    stale_hits: int
+    misses: int
+
+
 class SlashCommandData(BaseModel):
     name: str
     description: str
@@ -91,9 +180,27 @@ class Config(BaseModel):
 class ResourceConfig(BaseModel):
     id: Optional[uuid.UUID] = None
     resource_data: Config
+    # Version of Brood resource for optimistic update checks
+    updated_at: Optional[datetime] = None
 
 
 class UserIdentity(BaseModel):
     resource_id: Optional[uuid.UUID] = None
     identifier: str
     name: str
+
+
+class SnapshotUserIdentities(BaseModel):
+    discord_user_id: int
+    identities: List[UserIdentity] = Field(default_factory=list)
+
+
+class BotSnapshot(BaseModel):
+    saved_at: datetime
+    server_configs: List[ResourceConfig] = Field(default_factory=list)
+    user_idents: List[SnapshotUserIdentities] = Field(default_factory=list)
+
+
+class CommandsFingerprints(BaseModel):
+    application_id: Optional[int] = None
+    fingerprints: Dict[str, str] = Field(default_factory=dict)
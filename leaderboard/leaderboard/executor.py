@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from typing import Coroutine, Dict, List, Optional, Tuple
+
+from . import data
+from .settings import (
+    LEADERBOARD_DISCORD_BOT_CONFIGURE_CONCURRENCY,
+    LEADERBOARD_DISCORD_BOT_PROFILE_CONCURRENCY,
+    LEADERBOARD_DISCORD_BOT_RANKING_CONCURRENCY,
+    LEADERBOARD_DISCORD_BOT_TASK_QUEUE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_TASK_CONCURRENCY: Dict[data.BackgroundTaskKinds, int] = {
+    data.BackgroundTaskKinds.RANKING: LEADERBOARD_DISCORD_BOT_RANKING_CONCURRENCY,
+    data.BackgroundTaskKinds.PROFILE: LEADERBOARD_DISCORD_BOT_PROFILE_CONCURRENCY,
+    data.BackgroundTaskKinds.CONFIGURE: LEADERBOARD_DISCORD_BOT_CONFIGURE_CONCURRENCY,
+}
+
+
+class KindWorkers:
+    """
+    Bounded queue of one kind of work processed by fixed number of workers.
+    """
+
+    def __init__(self, kind: data.BackgroundTaskKinds, limit: int, max_queued: int):
+        self.kind = kind
+        self.limit = max(limit, 1)
+        self.max_queued = max(max_queued, 1)
+
+        self.in_flight = 0
+        self.submitted = 0
+        self.shed = 0
+        self.completed = 0
+        self.failed = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+        self._queue: Optional["asyncio.Queue[Tuple[Coroutine, float]]"] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [asyncio.create_task(self.work()) for _ in range(self.limit)]
+
+    def submit(self, coro: Coroutine) -> bool:
+        if self._queue is None:
+            coro.close()
+            self.shed += 1
+            return False
+
+        try:
+            self._queue.put_nowait((coro, time.monotonic()))
+        except asyncio.QueueFull:
+            # Coroutine is never awaited, close it to free its resources
+            coro.close()
+            self.shed += 1
+            return False
+
+        self.submitted += 1
+        return True
+
+    async def work(self) -> None:
+        assert self._queue is not None
+        while True:
+            coro, enqueued_at = await self._queue.get()
+            started_at = time.monotonic()
+            self._total_wait += started_at - enqueued_at
+            self.in_flight += 1
+            try:
+                await coro
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(
+                    f"Background task of kind {self.kind.value} failed, err: {e}"
+                )
+            finally:
+                self.in_flight -= 1
+                self._total_run += time.monotonic() - started_at
+                self._queue.task_done()
+
+    async def join(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+
+        if self._queue is not None:
+            # Close coroutines which never started
+            while not self._queue.empty():
+                coro, _ = self._queue.get_nowait()
+                coro.close()
+                self.shed += 1
+                self._queue.task_done()
+            self._queue = None
+
+    def metrics(self) -> data.BackgroundTaskKindMetrics:
+        finished = self.completed + self.failed
+        started = finished + self.in_flight
+        return data.BackgroundTaskKindMetrics(
+            kind=self.kind.value,
+            limit=self.limit,
+            in_flight=self.in_flight,
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            max_queued=self.max_queued,
+            submitted=self.submitted,
+            shed=self.shed,
+            completed=self.completed,
+            failed=self.failed,
+            avg_wait=self._total_wait / started if started else 0.0,
+            avg_run=self._total_run / finished if finished else 0.0,
+        )
+
+
+class BackgroundExecutor:
+    """
+    Supervised workers for slash command background work.
+
+    Work is queued per kind, every kind has own concurrency limit and bounded
+    queue. When queue is full work is shed immediately, so caller could answer
+    user instead of piling up timed out interactions.
+    """
+
+    def __init__(
+        self,
+        concurrency: Dict[data.BackgroundTaskKinds, int] = BACKGROUND_TASK_CONCURRENCY,
+        max_queued: int = LEADERBOARD_DISCORD_BOT_TASK_QUEUE_SIZE,
+    ) -> None:
+        self._kinds: Dict[data.BackgroundTaskKinds, KindWorkers] = {
+            kind: KindWorkers(kind=kind, limit=limit, max_queued=max_queued)
+            for kind, limit in concurrency.items()
+        }
+        self.accepting = False
+
+    def start(self) -> None:
+        """
+        Start workers, should be called at running event loop.
+        """
+        for kind_workers in self._kinds.values():
+            kind_workers.start()
+        self.accepting = True
+
+    def submit(self, kind: data.BackgroundTaskKinds, coro: Coroutine) -> bool:
+        """
+        Queue coroutine, returns False if it was shed.
+        """
+        kind_workers = self._kinds.get(kind)
+        if kind_workers is None:
+            coro.close()
+            raise ValueError(f"Unknown background task kind {kind}")
+
+        if not self.accepting:
+            coro.close()
+            kind_workers.shed += 1
+            logger.warning(
+                f"Background task of kind {kind.value} shed, executor is stopped"
+            )
+            return False
+
+        is_submitted = kind_workers.submit(coro)
+        if not is_submitted:
+            logger.warning(
+                f"Background task of kind {kind.value} shed, queue is full with {kind_workers.max_queued} tasks"
+            )
+        return is_submitted
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting work, wait for queued work until timeout and cancel
+        the rest.
+        """
+        self.accepting = False
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*[k.join() for k in self._kinds.values()]),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Background tasks are not finished in {timeout} seconds, cancelling"
+            )
+        for kind_workers in self._kinds.values():
+            kind_workers.stop()
+
+        logger.info(
+            f"Background tasks drained: {', '.join([str(m) for m in self.metrics()])}"
+        )
+
+    def metrics(self) -> List[data.BackgroundTaskKindMetrics]:
+        return [k.metrics() for k in self._kinds.values()]
@@ -0,0 +1,159 @@
+import logging
+import uuid
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from . import cache, data
+from .settings import LEADERBOARD_SCORE_FORMATTERS_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+Number = Union[int, float]
+
+# Versioned by raw score details, so entry never expires by time
+score_formatters_cache: cache.TTLCache["ScoreFormatter"] = cache.TTLCache(
+    name="score_formatters",
+    maxsize=LEADERBOARD_SCORE_FORMATTERS_CACHE_SIZE,
+    ttl=float("inf"),
+)
+
+
+def compile_converter(
+    conversion: Optional[int], conversion_vector: Optional[str]
+) -> Optional[Callable[[Number], Number]]:
+    """
+    Converter of score values, None if values are shown as is.
+    """
+    if conversion is None or conversion_vector is None:
+        return None
+    if conversion_vector == "divide":
+        if conversion == 0:
+            logger.warning("Score details conversion by zero is ignored")
+            return None
+        return lambda value: value / conversion
+    return None
+
+
+def round_number(value: Number, precision: int) -> str:
+    """
+    Float rounded to precision decimals without trailing zeros, integers
+    are kept as is.
+    """
+    if not isinstance(value, float):
+        return str(value)
+    rounded = f"{value:.{max(precision, 0)}f}"
+    if "." in rounded:
+        rounded = rounded.rstrip("0").rstrip(".")
+    return "0" if rounded == "-0" else rounded
+
+
+class ScoreFormatter:
+    """
+    Score details of leaderboard parsed once, applies conversion, prefix
+    and postfix to single value or to whole list of scores.
+    """
+
+    __slots__ = ("prefix", "postfix", "address_name", "_convert")
+
+    def __init__(
+        self,
+        prefix: str = "",
+        postfix: str = "",
+        address_name: Optional[str] = None,
+        convert: Optional[Callable[[Number], Number]] = None,
+    ) -> None:
+        self.prefix = prefix
+        self.postfix = postfix
+        self.address_name = address_name
+        self._convert = convert
+
+    def __repr__(self) -> str:
+        return f"ScoreFormatter(prefix={self.prefix!r}, postfix={self.postfix!r}, address_name={self.address_name!r}, is_converted={self.is_converted!r})"
+
+    @classmethod
+    def from_details(cls, score_details_raw: Mapping[str, Any]) -> "ScoreFormatter":
+        try:
+            score_details = data.ScoreDetails(**score_details_raw)
+        except Exception as e:
+            logger.warning(f"Unable to parse score details, err: {e}")
+            return cls()
+
+        return cls(
+            prefix=score_details.prefix or "",
+            postfix=score_details.postfix or "",
+            address_name=score_details.address_name,
+            convert=compile_converter(
+                score_details.conversion, score_details.conversion_vector
+            ),
+        )
+
+    @property
+    def is_converted(self) -> bool:
+        return self._convert is not None
+
+    def convert(self, value: Number) -> Number:
+        return value if self._convert is None else self._convert(value)
+
+    def format(self, value: Number) -> str:
+        return f"{self.prefix}{self.convert(value)}{self.postfix}"
+
+    def convert_many(
+        self, values: Sequence[Number], precision: Optional[int] = None
+    ) -> List[str]:
+        """
+        Converted values without prefix and postfix, with precision converted
+        floats are rounded to that number of decimals.
+        """
+        if self._convert is None:
+            return [str(v) for v in values]
+        convert = self._convert
+        if precision is None:
+            return [str(convert(v)) for v in values]
+        return [round_number(convert(v), precision) for v in values]
+
+    def format_many(self, values: Sequence[Number]) -> List[str]:
+        if self.prefix == "" and self.postfix == "":
+            return self.convert_many(values)
+        prefix, postfix = self.prefix, self.postfix
+        return [f"{prefix}{v}{postfix}" for v in self.convert_many(values)]
+
+    def convert_scores(
+        self, scores: Sequence[data.Score], precision: Optional[int] = None
+    ) -> List[str]:
+        return self.convert_many([s.score for s in scores], precision=precision)
+
+    def format_scores(self, scores: Sequence[data.Score]) -> List[str]:
+        return self.format_many([s.score for s in scores])
+
+
+PLAIN_SCORE_FORMATTER = ScoreFormatter()
+
+
+def get_score_formatter(
+    l_id: Optional[uuid.UUID], score_details_raw: Optional[Mapping[str, Any]]
+) -> ScoreFormatter:
+    """
+    Cached formatter of leaderboard, it is compiled again only if score
+    details of leaderboard changed.
+    """
+    if not isinstance(score_details_raw, Mapping) or len(score_details_raw) == 0:
+        return PLAIN_SCORE_FORMATTER
+    if l_id is None:
+        return ScoreFormatter.from_details(score_details_raw)
+
+    version: Dict[str, Any] = dict(score_details_raw)
+    formatter = score_formatters_cache.get(l_id, version=version)
+    if formatter is None:
+        formatter = ScoreFormatter.from_details(score_details_raw)
+        score_formatters_cache.set(l_id, formatter, version=version)
+    return formatter
+
+
+def get_scores_formatter(
+    l_id: Optional[uuid.UUID], scores: Sequence[data.Score]
+) -> ScoreFormatter:
+    """
+    Score details are same for all scores of leaderboard, first one is used.
+    """
+    if len(scores) == 0:
+        return PLAIN_SCORE_FORMATTER
+    return get_score_formatter(l_id, scores[0].points_data.get("score_details"))
@@ -0,0 +1,211 @@
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from . import data
+from .indexes import SearchIndexes
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityRecord:
+    """
+    Compact user identity, pydantic model is used only at snapshot boundary.
+    """
+
+    __slots__ = ("resource_id", "identifier", "name")
+
+    def __init__(
+        self, identifier: str, name: str, resource_id: Optional[uuid.UUID] = None
+    ) -> None:
+        self.resource_id = resource_id
+        self.identifier = identifier
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"IdentityRecord(identifier={self.identifier!r}, name={self.name!r}, resource_id={self.resource_id!r})"
+
+    @classmethod
+    def from_model(cls, identity: data.UserIdentity) -> "IdentityRecord":
+        return cls(
+            identifier=identity.identifier,
+            name=identity.name,
+            resource_id=identity.resource_id,
+        )
+
+    def to_model(self) -> data.UserIdentity:
+        return data.UserIdentity(
+            resource_id=self.resource_id, identifier=self.identifier, name=self.name
+        )
+
+
+class IdentityStore:
+    """
+    Discord user identities kept in insertion ordered maps by identifier.
+
+    Mutations do not await, so add and remove are atomic for the event loop.
+
+    With maxsize store holds only least recently used users and is partial,
+    absent user should be loaded with set_user before it is used.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self._users: "OrderedDict[int, Dict[str, IdentityRecord]]" = OrderedDict()
+        self._search: SearchIndexes[IdentityRecord] = SearchIndexes(
+            keys_func=lambda i: [i.identifier, i.name]
+        )
+        self._changed_users: Optional[Set[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, discord_user_id: int) -> bool:
+        """
+        User has linked identities, not loaded user of partial store is
+        absent until it is loaded with set_user.
+        """
+        return len(self._users.get(discord_user_id) or {}) != 0
+
+    @property
+    def is_partial(self) -> bool:
+        return self.maxsize is not None
+
+    def is_loaded(self, discord_user_id: int) -> bool:
+        return not self.is_partial or discord_user_id in self._users
+
+    def _touch(self, discord_user_id: int) -> Optional[Dict[str, IdentityRecord]]:
+        identities = self._users.get(discord_user_id)
+        if identities is not None and self.is_partial:
+            self._users.move_to_end(discord_user_id)
+        return identities
+
+    def _changed(self, discord_user_id: int) -> None:
+        self._search.invalidate(discord_user_id)
+        if self._changed_users is not None:
+            self._changed_users.add(discord_user_id)
+
+    def track_changes(self) -> None:
+        """
+        Start recording users changed by writes, e.g. while replacement
+        store is fetched.
+        """
+        self._changed_users = set()
+
+    def stop_tracking_changes(self) -> Set[int]:
+        changed_users = self._changed_users or set()
+        self._changed_users = None
+        return changed_users
+
+    def replay_users(
+        self, other: "IdentityStore", discord_user_ids: Iterable[int]
+    ) -> None:
+        """
+        Copy current identities of users from other store, over fetched ones.
+        """
+        for discord_user_id in discord_user_ids:
+            if other.is_partial and not other.is_loaded(discord_user_id):
+                continue
+            self.set_user(discord_user_id, other.get(discord_user_id))
+
+    def _evict(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._users) > self.maxsize:
+            discord_user_id, _ = self._users.popitem(last=False)
+            self._search.invalidate(discord_user_id)
+
+    def set_user(self, discord_user_id: int, records: Iterable[IdentityRecord]) -> None:
+        """
+        Replace all identities of user, in partial store empty records mark
+        user as loaded.
+        """
+        identities = {r.identifier: r for r in records}
+        if len(identities) == 0 and not self.is_partial:
+            self._users.pop(discord_user_id, None)
+        else:
+            self._users[discord_user_id] = identities
+            self._users.move_to_end(discord_user_id)
+            self._evict()
+        self._changed(discord_user_id)
+
+    def users(self) -> Iterator[int]:
+        return iter(self._users)
+
+    def num_of_identities(self) -> int:
+        return sum(len(idents) for idents in self._users.values())
+
+    def get(self, discord_user_id: int) -> List[IdentityRecord]:
+        """
+        Copy of user identities, safe to iterate across awaits.
+        """
+        return list((self._touch(discord_user_id) or {}).values())
+
+    def find(self, discord_user_id: int, identifier: str) -> Optional[IdentityRecord]:
+        return (self._touch(discord_user_id) or {}).get(identifier)
+
+    def add(self, discord_user_id: int, record: IdentityRecord) -> bool:
+        """
+        Add identity, returns False if user already has identity with same identifier.
+        """
+        identities = self._users.get(discord_user_id)
+        if identities is None:
+            # Not loaded user of partial store gets identity with next load
+            if self.is_partial:
+                return True
+            identities = self._users[discord_user_id] = {}
+        if record.identifier in identities:
+            return False
+        identities[record.identifier] = record
+        self._changed(discord_user_id)
+        self._evict()
+        return True
+
+    def remove(self, discord_user_id: int, identifier: str) -> Optional[IdentityRecord]:
+        identities = self._users.get(discord_user_id)
+        if identities is None:
+            return None
+        record = identities.pop(identifier, None)
+        if record is None:
+            return None
+        # Partial store keeps empty user as loaded one
+        if len(identities) == 0 and not self.is_partial:
+            del self._users[discord_user_id]
+        self._changed(discord_user_id)
+        return record
+
+    def search(
+        self, discord_user_id: int, query: str, limit: int = 20
+    ) -> List[IdentityRecord]:
+        identities = self._touch(discord_user_id)
+        if identities is None:
+            return []
+        return self._search.search(
+            owner=discord_user_id,
+            items=identities.values(),
+            query=query,
+            limit=limit,
+        )
+
+    def to_snapshot(self) -> List[data.SnapshotUserIdentities]:
+        return [
+            data.SnapshotUserIdentities(
+                discord_user_id=u_id,
+                identities=[i.to_model() for i in identities.values()],
+            )
+            for u_id, identities in self._users.items()
+        ]
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        user_idents: List[data.SnapshotUserIdentities],
+        maxsize: Optional[int] = None,
+    ) -> "IdentityStore":
+        store = cls(maxsize=maxsize)
+        for u in user_idents:
+            store.set_user(
+                u.discord_user_id, [IdentityRecord.from_model(i) for i in u.identities]
+            )
+        return store
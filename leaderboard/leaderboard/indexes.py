@@ -0,0 +1,160 @@
+import logging
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from . import data
+from .settings import LEADERBOARD_DISCORD_BOT_SEARCH_INDEXES_SIZE
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ChannelLeaderboardsIndex:
+    """
+    Index of guild and channel to leaderboards linked to channel.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[int, Dict[int, List[data.ConfigLeaderboard]]] = {}
+
+    def rebuild(self, server_configs: Mapping[int, data.ResourceConfig]) -> None:
+        index: Dict[int, Dict[int, List[data.ConfigLeaderboard]]] = {}
+        for guild_id, server_config in server_configs.items():
+            index[guild_id] = self.index_guild(server_config)
+        self._index = index
+
+    def update_guild(
+        self, guild_id: int, server_config: Optional[data.ResourceConfig]
+    ) -> None:
+        if server_config is None:
+            self._index.pop(guild_id, None)
+            return
+        self._index[guild_id] = self.index_guild(server_config)
+
+    @staticmethod
+    def index_guild(
+        server_config: data.ResourceConfig,
+    ) -> Dict[int, List[data.ConfigLeaderboard]]:
+        channels: Dict[int, List[data.ConfigLeaderboard]] = {}
+        for l in server_config.resource_data.leaderboards:
+            for ch in set(l.channel_ids):
+                channels.setdefault(ch, []).append(l)
+        return channels
+
+    def get(self, guild_id: int, channel_id: int) -> List[data.ConfigLeaderboard]:
+        return self._index.get(guild_id, {}).get(channel_id, [])
+
+
+class SearchIndex(Generic[T]):
+    """
+    Search over pre-lowercased item keys, prefix matches are ranked
+    before substring matches.
+    """
+
+    def __init__(
+        self, items: Iterable[T], keys_func: Callable[[T], Sequence[str]]
+    ) -> None:
+        self._items = list(items)
+
+        # Keys in items order for substring matches
+        self._keys: List[Tuple[str, int]] = [
+            (k.lower(), pos)
+            for pos, item in enumerate(self._items)
+            for k in keys_func(item)
+        ]
+        # Sorted keys for prefix matches with binary search
+        self._sorted_keys = sorted(self._keys)
+        self._sorted_values = [k for k, _ in self._sorted_keys]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def search(self, query: str, limit: int = 20) -> List[T]:
+        if limit <= 0:
+            return []
+
+        query = query.lower()
+        if query == "":
+            return self._items[:limit]
+
+        found: List[int] = []
+        seen: Set[int] = set()
+
+        i = bisect_left(self._sorted_values, query)
+        while i < len(self._sorted_values) and len(found) < limit:
+            key, pos = self._sorted_keys[i]
+            if not key.startswith(query):
+                break
+            if pos not in seen:
+                seen.add(pos)
+                found.append(pos)
+            i += 1
+
+        if len(found) < limit:
+            for key, pos in self._keys:
+                if pos in seen or query not in key:
+                    continue
+                seen.add(pos)
+                found.append(pos)
+                if len(found) >= limit:
+                    break
+
+        return [self._items[pos] for pos in found]
+
+
+class SearchIndexes(Generic[T]):
+    """
+    Search indexes per owner (guild or user), built on first search and
+    dropped when owner items change. Only maxsize most recently searched
+    owners keep their indexes.
+    """
+
+    def __init__(
+        self,
+        keys_func: Callable[[T], Sequence[str]],
+        maxsize: int = LEADERBOARD_DISCORD_BOT_SEARCH_INDEXES_SIZE,
+    ) -> None:
+        self.keys_func = keys_func
+        self.maxsize = max(maxsize, 1)
+        self._indexes: "OrderedDict[Hashable, SearchIndex[T]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, owner: Hashable, items: Iterable[T]) -> SearchIndex[T]:
+        index = self._indexes.get(owner)
+        if index is not None:
+            self._indexes.move_to_end(owner)
+            return index
+
+        index = SearchIndex(items=items, keys_func=self.keys_func)
+        self._indexes[owner] = index
+        while len(self._indexes) > self.maxsize:
+            self._indexes.popitem(last=False)
+        return index
+
+    def search(
+        self, owner: Hashable, items: Iterable[T], query: str, limit: int = 20
+    ) -> List[T]:
+        return self.get(owner=owner, items=items).search(query=query, limit=limit)
+
+    def invalidate(self, owner: Hashable) -> None:
+        self._indexes.pop(owner, None)
+
+    def clear(self) -> None:
+        self._indexes.clear()
@@ -28,6 +28,36 @@ if LEADERBOARD_DISCORD_BOT_DEBUG is True:
     LOG_LEVEL = 10
 
 
+def get_env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except:
+        raise Exception(f"Could not parse {name} {raw} as int")
+
+
+def get_env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        return float(raw)
+    except:
+        raise Exception(f"Could not parse {name} {raw} as float")
+
+
+def get_env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        return bool(strtobool(raw))
+    except:
+        raise Exception(f"Could not parse {name} {raw} as bool")
+
+
 # Bugout
 BUGOUT_BROOD_URL = os.environ.get("BUGOUT_BROOD_URL", "https://auth.bugout.dev")
 BUGOUT_SPIRE_URL = os.environ.get("BUGOUT_SPIRE_URL", "https://spire.bugout.dev")
@@ -63,4 +93,180 @@ MOONSTREAM_DISCORD_BOT_ACCESS_TOKEN = os.environ.get(
 )
 MOONSTREAM_APPLICATION_ID = os.environ.get("MOONSTREAM_APPLICATION_ID", "")
 
-DISCORD_API_URL = " https://discord.com/api/v10"
+DISCORD_API_URL = "https://discord.com/api/v10"
+
+# Shared HTTP client connection pool
+LEADERBOARD_HTTP_POOL_LIMIT = get_env_int("LEADERBOARD_HTTP_POOL_LIMIT", 100)
+LEADERBOARD_HTTP_POOL_LIMIT_PER_HOST = get_env_int(
+    "LEADERBOARD_HTTP_POOL_LIMIT_PER_HOST", 20
+)
+LEADERBOARD_HTTP_DNS_CACHE_TTL = get_env_int("LEADERBOARD_HTTP_DNS_CACHE_TTL", 300)
+LEADERBOARD_HTTP_KEEPALIVE_TIMEOUT = get_env_float(
+    "LEADERBOARD_HTTP_KEEPALIVE_TIMEOUT", 60
+)
+
+# Upstream concurrency limits, max wait is in seconds (0 - wait without limit)
+LEADERBOARD_ENGINE_API_CONCURRENCY = get_env_int(
+    "LEADERBOARD_ENGINE_API_CONCURRENCY", 8
+)
+LEADERBOARD_BROOD_CONCURRENCY = get_env_int("LEADERBOARD_BROOD_CONCURRENCY", 4)
+LEADERBOARD_DISCORD_API_CONCURRENCY = get_env_int(
+    "LEADERBOARD_DISCORD_API_CONCURRENCY", 4
+)
+LEADERBOARD_UPSTREAM_MAX_WAIT = get_env_float("LEADERBOARD_UPSTREAM_MAX_WAIT", 10)
+
+# Leaderboard info cache, TTLs are in seconds
+LEADERBOARD_INFO_CACHE_SIZE = get_env_int("LEADERBOARD_INFO_CACHE_SIZE", 1024)
+LEADERBOARD_INFO_CACHE_TTL = get_env_float("LEADERBOARD_INFO_CACHE_TTL", 60)
+LEADERBOARD_INFO_CACHE_STALE_TTL = get_env_float(
+    "LEADERBOARD_INFO_CACHE_STALE_TTL", 3600
+)
+
+# Top scores cache, entry is valid until leaderboard last_updated_at changes or TTL in seconds passed
+LEADERBOARD_SCORES_CACHE_SIZE = get_env_int("LEADERBOARD_SCORES_CACHE_SIZE", 1024)
+LEADERBOARD_SCORES_CACHE_TTL = get_env_float("LEADERBOARD_SCORES_CACHE_TTL", 600)
+
+# Rendered /ranking embeds, entry is valid until leaderboard data changes or TTL in seconds passed
+LEADERBOARD_RANKING_EMBEDS_CACHE_SIZE = get_env_int(
+    "LEADERBOARD_RANKING_EMBEDS_CACHE_SIZE", 1024
+)
+LEADERBOARD_RANKING_EMBEDS_CACHE_TTL = get_env_float(
+    "LEADERBOARD_RANKING_EMBEDS_CACHE_TTL", 600
+)
+
+# Compiled score details formatters by leaderboard
+LEADERBOARD_SCORE_FORMATTERS_CACHE_SIZE = get_env_int(
+    "LEADERBOARD_SCORE_FORMATTERS_CACHE_SIZE", 1024
+)
+
+# Width budgets of rendered score tables, sum of column widths in characters
+LEADERBOARD_TABLE_MOBILE_WIDTH = get_env_int("LEADERBOARD_TABLE_MOBILE_WIDTH", 30)
+LEADERBOARD_TABLE_DESKTOP_WIDTH = get_env_int("LEADERBOARD_TABLE_DESKTOP_WIDTH", 60)
+LEADERBOARD_TABLE_SCORE_PRECISION = get_env_int("LEADERBOARD_TABLE_SCORE_PRECISION", 2)
+
+# Retries of idempotent upstream requests, delays are in seconds
+LEADERBOARD_HTTP_RETRIES = get_env_int("LEADERBOARD_HTTP_RETRIES", 2)
+LEADERBOARD_HTTP_RETRY_BACKOFF = get_env_float("LEADERBOARD_HTTP_RETRY_BACKOFF", 0.5)
+LEADERBOARD_HTTP_RETRY_MAX_DELAY = get_env_float("LEADERBOARD_HTTP_RETRY_MAX_DELAY", 10)
+
+# Circuit breaker per upstream host, opens after number of consecutive failures
+LEADERBOARD_CIRCUIT_FAILURE_THRESHOLD = get_env_int(
+    "LEADERBOARD_CIRCUIT_FAILURE_THRESHOLD", 5
+)
+LEADERBOARD_CIRCUIT_RECOVERY_TIMEOUT = get_env_float(
+    "LEADERBOARD_CIRCUIT_RECOVERY_TIMEOUT", 30
+)
+
+# Brood resources pagination at configs and identities loading
+LEADERBOARD_BROOD_RESOURCES_PAGE_SIZE = get_env_int(
+    "LEADERBOARD_BROOD_RESOURCES_PAGE_SIZE", 500
+)
+LEADERBOARD_BROOD_RESOURCES_PAGES_IN_FLIGHT = get_env_int(
+    "LEADERBOARD_BROOD_RESOURCES_PAGES_IN_FLIGHT", 3
+)
+
+# Local bot state directory for warm start
+LEADERBOARD_DISCORD_BOT_STATE_DIR = os.environ.get(
+    "LEADERBOARD_DISCORD_BOT_STATE_DIR",
+    os.path.join(os.path.expanduser("~"), ".leaderboard-bot"),
+)
+# Snapshot of configurations and identities, set empty string to disable
+LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE = os.environ.get(
+    "LEADERBOARD_DISCORD_BOT_SNAPSHOT_FILE",
+    os.path.join(LEADERBOARD_DISCORD_BOT_STATE_DIR, "snapshot.json"),
+)
+LEADERBOARD_DISCORD_BOT_SNAPSHOT_INTERVAL = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_SNAPSHOT_INTERVAL", 300
+)
+
+# Fingerprints of synced command sets, set empty string to sync all at every start
+LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE = os.environ.get(
+    "LEADERBOARD_DISCORD_BOT_COMMANDS_FINGERPRINTS_FILE",
+    os.path.join(LEADERBOARD_DISCORD_BOT_STATE_DIR, "commands_fingerprints.json"),
+)
+LEADERBOARD_DISCORD_BOT_SYNC_CONCURRENCY = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_SYNC_CONCURRENCY", 4
+)
+
+# Fetch user identities on first use instead of loading all of them at start
+LEADERBOARD_DISCORD_BOT_LAZY_USERS = get_env_bool(
+    "LEADERBOARD_DISCORD_BOT_LAZY_USERS", False
+)
+LEADERBOARD_DISCORD_BOT_USERS_CACHE_SIZE = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_USERS_CACHE_SIZE", 10000
+)
+# Max number of users and guilds with built autocomplete search index
+LEADERBOARD_DISCORD_BOT_SEARCH_INDEXES_SIZE = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_SEARCH_INDEXES_SIZE", 1000
+)
+LEADERBOARD_DISCORD_BOT_USER_LOAD_TIMEOUT = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_USER_LOAD_TIMEOUT", 2
+)
+
+# Fetch server configuration of guild at its first interaction instead of loading all at start
+LEADERBOARD_DISCORD_BOT_LAZY_CONFIGS = get_env_bool(
+    "LEADERBOARD_DISCORD_BOT_LAZY_CONFIGS", False
+)
+LEADERBOARD_DISCORD_BOT_CONFIGS_TTL = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_CONFIGS_TTL", 600
+)
+LEADERBOARD_DISCORD_BOT_CONFIG_LOAD_TIMEOUT = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_CONFIG_LOAD_TIMEOUT", 2
+)
+
+# Retry of failed initial load of server configurations, delay doubles up to max
+LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_DELAY = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_DELAY", 10
+)
+LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_MAX_DELAY = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_CONFIGS_LOAD_RETRY_MAX_DELAY", 300
+)
+
+# Poll Brood for changed server configurations, set 0 to disable, not used in lazy mode
+LEADERBOARD_DISCORD_BOT_CONFIGS_REFRESH_INTERVAL = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_CONFIGS_REFRESH_INTERVAL", 300
+)
+
+# Background work started by slash commands, each kind has own workers and bounded queue
+LEADERBOARD_DISCORD_BOT_RANKING_CONCURRENCY = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_RANKING_CONCURRENCY", 8
+)
+LEADERBOARD_DISCORD_BOT_PROFILE_CONCURRENCY = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_PROFILE_CONCURRENCY", 4
+)
+LEADERBOARD_DISCORD_BOT_CONFIGURE_CONCURRENCY = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_CONFIGURE_CONCURRENCY", 2
+)
+LEADERBOARD_DISCORD_BOT_TASK_QUEUE_SIZE = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_TASK_QUEUE_SIZE", 100
+)
+LEADERBOARD_DISCORD_BOT_TASK_DRAIN_TIMEOUT = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_TASK_DRAIN_TIMEOUT", 10
+)
+# Seconds between logs of background tasks metrics, set 0 to disable
+LEADERBOARD_DISCORD_BOT_METRICS_INTERVAL = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_METRICS_INTERVAL", 60
+)
+
+# Slash commands token buckets, rate is commands per second refilled up to burst, set rate 0 to disable scope
+LEADERBOARD_DISCORD_BOT_USER_RATE = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_USER_RATE", 0.2
+)
+LEADERBOARD_DISCORD_BOT_USER_BURST = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_USER_BURST", 3
+)
+LEADERBOARD_DISCORD_BOT_GUILD_RATE = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_GUILD_RATE", 2
+)
+LEADERBOARD_DISCORD_BOT_GUILD_BURST = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_GUILD_BURST", 20
+)
+LEADERBOARD_DISCORD_BOT_GLOBAL_RATE = get_env_float(
+    "LEADERBOARD_DISCORD_BOT_GLOBAL_RATE", 20
+)
+LEADERBOARD_DISCORD_BOT_GLOBAL_BURST = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_GLOBAL_BURST", 100
+)
+LEADERBOARD_DISCORD_BOT_THROTTLE_BUCKETS_SIZE = get_env_int(
+    "LEADERBOARD_DISCORD_BOT_THROTTLE_BUCKETS_SIZE", 100000
+)
@@ -0,0 +1,220 @@
+from typing import Callable, Dict, List, Optional, Sequence
+
+from . import data
+from .formatters import ScoreFormatter
+from .settings import (
+    LEADERBOARD_TABLE_DESKTOP_WIDTH,
+    LEADERBOARD_TABLE_MOBILE_WIDTH,
+    LEADERBOARD_TABLE_SCORE_PRECISION,
+)
+
+SHORTCUT = "..."
+
+# Width budget for sum of column widths, Discord mobile max width is 30 if thumbnail not set
+TABLE_WIDTHS: Dict[data.TableLayouts, int] = {
+    data.TableLayouts.MOBILE: LEADERBOARD_TABLE_MOBILE_WIDTH,
+    data.TableLayouts.DESKTOP: LEADERBOARD_TABLE_DESKTOP_WIDTH,
+}
+
+
+class TableColumn:
+    """
+    Table column rendered from whole list of scores at once, so column could
+    depend on neighbour rows (delta) or on leaderboard (percentile).
+
+    Only shrinkable columns are truncated in the middle to fit width budget.
+    """
+
+    __slots__ = ("name", "values", "align", "shrinkable")
+
+    def __init__(
+        self,
+        name: str,
+        values: Callable[[Sequence[data.Score]], List[str]],
+        align: str = "^",
+        shrinkable: bool = False,
+    ) -> None:
+        self.name = name
+        self.values = values
+        self.align = align
+        self.shrinkable = shrinkable
+
+    def __repr__(self) -> str:
+        return f"TableColumn(name={self.name!r}, align={self.align!r}, shrinkable={self.shrinkable!r})"
+
+
+def rank_column(name: str = "rank") -> TableColumn:
+    return TableColumn(name=name, values=lambda scores: [str(s.rank) for s in scores])
+
+
+def address_column(name: str = "address") -> TableColumn:
+    return TableColumn(
+        name=name,
+        values=lambda scores: [s.address for s in scores],
+        shrinkable=True,
+    )
+
+
+def score_column(name: str = "score") -> TableColumn:
+    return TableColumn(name=name, values=lambda scores: [str(s.score) for s in scores])
+
+
+def converted_score_column(
+    formatter: ScoreFormatter,
+    name: str = "score",
+    precision: int = LEADERBOARD_TABLE_SCORE_PRECISION,
+) -> TableColumn:
+    """
+    Scores converted by leaderboard formatter in one batch, prefix and
+    postfix are omitted and converted floats are rounded to save table width.
+    """
+    return TableColumn(
+        name=name,
+        values=lambda scores: formatter.convert_scores(scores, precision=precision),
+    )
+
+
+def score_delta_column(name: str = "delta") -> TableColumn:
+    """
+    Difference with score of previous row, empty for first row.
+    """
+
+    def values(scores: Sequence[data.Score]) -> List[str]:
+        deltas: List[str] = []
+        previous: Optional[int] = None
+        for s in scores:
+            deltas.append("" if previous is None else str(s.score - previous))
+            previous = s.score
+        return deltas
+
+    return TableColumn(name=name, values=values)
+
+
+def percentile_column(users_count: int, name: str = "top %") -> TableColumn:
+    """
+    Share of leaderboard users with rank not lower than row rank.
+    """
+
+    def values(scores: Sequence[data.Score]) -> List[str]:
+        if users_count <= 0:
+            return ["" for _ in scores]
+        return [f"{s.rank * 100 / users_count:.1f}" for s in scores]
+
+    return TableColumn(name=name, values=values)
+
+
+SCORE_COLUMNS: Dict[str, Callable[[], TableColumn]] = {
+    "rank": rank_column,
+    "address": address_column,
+    "score": score_column,
+    "delta": score_delta_column,
+}
+
+
+def score_columns(names: Sequence[str]) -> List[TableColumn]:
+    """
+    Columns by names from SCORE_COLUMNS, columns with leaderboard context
+    should be created with factories.
+    """
+    columns: List[TableColumn] = []
+    for name in names:
+        factory = SCORE_COLUMNS.get(name)
+        if factory is None:
+            raise ValueError(
+                f"Unknown score column {name}, available: {', '.join(SCORE_COLUMNS)}"
+            )
+        columns.append(factory())
+    return columns
+
+
+def fit_widths(
+    widths: Sequence[int], shrinkable: Sequence[bool], max_width: int
+) -> List[int]:
+    """
+    Narrow widest shrinkable columns until sum of widths fits max_width.
+    Shrinkable column is never narrower than shortcut plus two characters.
+    """
+    fitted = list(widths)
+    excess = sum(fitted) - max_width
+    min_width = len(SHORTCUT) + 2
+    while excess > 0:
+        candidates = [
+            i for i, w in enumerate(fitted) if shrinkable[i] and w > min_width
+        ]
+        if len(candidates) == 0:
+            break
+        widest = max(candidates, key=lambda i: fitted[i])
+        others = [fitted[i] for i in candidates if i != widest]
+        # Narrow to next widest column at once, it is done per table not per row
+        step = max(min(excess, fitted[widest] - max(others + [min_width])), 1)
+        fitted[widest] -= step
+        excess -= step
+    return fitted
+
+
+def truncate(value: str, width: int) -> str:
+    if len(value) <= width:
+        return value
+    available = width - len(SHORTCUT)
+    if available <= 0:
+        return value[:width]
+    head = available // 2
+    return f"{value[:head]}{SHORTCUT}{value[head - available:]}"
+
+
+def render_rst(
+    columns: Sequence[TableColumn],
+    values: Sequence[List[str]],
+    max_width: Optional[int] = None,
+) -> str:
+    """
+    Renders a table in rST format from column-major values.
+
+    +----+---------------------+-----+
+     rank        address        score
+    +----+---------------------+-----+
+      1    0x15650b...ffb56321   16
+      2    0x825080...3052a123    9
+    """
+    widths = [
+        max(len(c.name), max(map(len, v), default=0)) for c, v in zip(columns, values)
+    ]
+    if max_width is not None:
+        fitted = fit_widths(widths, [c.shrinkable for c in columns], max_width)
+        values = [
+            [truncate(x, f) for x in v] if f < w else v
+            for v, w, f in zip(values, widths, fitted)
+        ]
+        widths = fitted
+
+    sep = "+" + "+".join("-" * w for w in widths) + "+"
+    row_format = (
+        " " + " ".join(f"{{:{c.align}{w}}}" for c, w in zip(columns, widths)) + " "
+    )
+
+    header = row_format.format(*[truncate(c.name, w) for c, w in zip(columns, widths)])
+    lines = [sep, header, sep]
+    lines.extend(row_format.format(*row) for row in zip(*values))
+    return "\n".join(lines)
+
+
+class ScoresTable:
+    """
+    Scores table with configurable columns and width budget of layout.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[TableColumn],
+        layout: data.TableLayouts = data.TableLayouts.MOBILE,
+        max_width: Optional[int] = None,
+    ) -> None:
+        self.columns = list(columns)
+        self.max_width = max_width if max_width is not None else TABLE_WIDTHS[layout]
+
+    def render(self, scores: Sequence[data.Score]) -> str:
+        return render_rst(
+            self.columns,
+            [c.values(scores) for c in self.columns],
+            max_width=self.max_width,
+        )
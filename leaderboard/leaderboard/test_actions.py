@@ -0,0 +1,240 @@
+import asyncio
+import unittest
+import uuid
+from typing import Any, List, Tuple
+from unittest import mock
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from . import actions, data
+
+
+class TestCallerCoalescing(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+        async def limited_caller(**kwargs):
+            self.calls += 1
+            await self.release.wait()
+            return {"calls": self.calls}
+
+        patcher = mock.patch.object(actions, "limited_caller", limited_caller)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_identical_requests_share_response(self):
+        tasks = [
+            asyncio.create_task(actions.caller(url="https://example.com/a"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await asyncio.gather(*tasks), [{"calls": 1}] * 3)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(actions._inflight_requests), 0)
+
+    async def test_other_credentials_are_not_coalesced(self):
+        tasks = [
+            asyncio.create_task(
+                actions.caller(url="https://example.com/a", token=token)
+            )
+            for token in ["t1", "t2"]
+        ]
+        await asyncio.sleep(0)
+        self.release.set()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(self.calls, 2)
+
+    async def test_not_get_requests_are_not_coalesced(self):
+        tasks = [
+            asyncio.create_task(
+                actions.caller(
+                    url="https://example.com/a", method=data.RequestMethods.PUT
+                )
+            )
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        self.release.set()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(self.calls, 2)
+
+    async def test_cancelled_waiter_does_not_cancel_request(self):
+        cancelled = asyncio.create_task(actions.caller(url="https://example.com/a"))
+        waiting = asyncio.create_task(actions.caller(url="https://example.com/a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await waiting, {"calls": 1})
+        self.assertTrue(cancelled.cancelled())
+
+
+class TestRetriedDelete(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.responses = []
+        self.calls = 0
+
+        async def session_request(**kwargs):
+            self.calls += 1
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        for patcher in [
+            mock.patch.object(actions, "session_request", session_request),
+            mock.patch.object(actions, "LEADERBOARD_HTTP_RETRY_BACKOFF", 0),
+            mock.patch.object(actions.upstreams, "_breakers", {}),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def not_found(self) -> aiohttp.ClientResponseError:
+        url = URL("https://example.com/resources")
+        request_info = aiohttp.RequestInfo(
+            url, "DELETE", CIMultiDictProxy(CIMultiDict()), url
+        )
+        return aiohttp.ClientResponseError(request_info, (), status=404)
+
+    async def test_not_found_after_lost_response_is_removal(self):
+        resource_id = uuid.uuid4()
+        self.responses = [asyncio.TimeoutError(), self.not_found()]
+
+        self.assertEqual(await actions.remove_user_identity(resource_id), resource_id)
+        self.assertEqual(self.calls, 2)
+
+    async def test_not_found_at_first_attempt_is_failure(self):
+        self.responses = [self.not_found()]
+
+        self.assertIsNone(await actions.remove_user_identity(uuid.uuid4()))
+        self.assertEqual(self.calls, 1)
+
+
+def wrapped_field(num: int) -> List[Any]:
+    return [{"field_name": f"Field {num}", "field_value": str(num)}]
+
+
+class TestPaginationView(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.items = [wrapped_field(i) for i in range(7)]
+        self.requests: List[Tuple[int, int]] = []
+
+    async def page_provider(self, offset: int, limit: int) -> List[List[Any]]:
+        self.requests.append((offset, limit))
+        return self.items[offset : offset + limit]
+
+    def view(self, **kwargs) -> actions.PaginationView:
+        view = actions.PaginationView(
+            title="Leaderboards",
+            description="",
+            page_provider=self.page_provider,
+            page_size=3,
+            **kwargs,
+        )
+        view.message = mock.AsyncMock()
+        return view
+
+    async def settle(self) -> None:
+        # Page loads and their done callbacks run at next loop iterations
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    def shown_fields(self, view: actions.PaginationView) -> List[str]:
+        embed = view.message.edit.call_args.kwargs["embed"]
+        return [f.value for f in embed.fields]
+
+    async def test_next_page_is_prefetched(self):
+        view = self.view(total_items=len(self.items))
+
+        await view.show_page(1)
+        await self.settle()
+        self.assertEqual(self.requests, [(0, 3), (3, 3)])
+        self.assertEqual(self.shown_fields(view), ["0", "1", "2"])
+
+        await view.show_page(2)
+        await self.settle()
+        self.assertEqual(self.requests, [(0, 3), (3, 3), (6, 3)])
+        self.assertEqual(self.shown_fields(view), ["3", "4", "5"])
+        self.assertFalse(view.button_next.disabled)
+
+        await view.show_page(3)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(view.total_pages, 3)
+        self.assertTrue(view.button_next.disabled)
+
+    async def test_number_of_pages_is_found_by_empty_page(self):
+        self.items = self.items[:6]
+        view = self.view()
+
+        await view.show_page(1)
+        await view.show_page(2)
+        self.assertIsNone(view.total_pages)
+        await view.show_page(3)
+
+        self.assertEqual(view.total_pages, 2)
+        self.assertEqual(view.current_page, 2)
+        self.assertEqual(self.shown_fields(view), ["3", "4", "5"])
+        self.assertTrue(view.button_next.disabled)
+
+    async def test_recent_pages_are_cached(self):
+        view = self.view(total_items=len(self.items), pages_cache_size=1)
+
+        await view.show_page(1)
+        await self.settle()
+        # Prefetched second page evicted the first one
+        self.assertEqual(list(view._pages), [2])
+
+        await view.show_page(1)
+        self.assertEqual(self.requests, [(0, 3), (3, 3), (0, 3)])
+
+    async def test_failed_page_keeps_current_page(self):
+        view = self.view(total_items=len(self.items))
+        await view.show_page(1)
+        await self.settle()
+
+        async def failing_provider(offset: int, limit: int) -> List[List[Any]]:
+            raise ValueError("boom")
+
+        view.page_provider = failing_provider
+        view._pages.pop(2, None)
+        with self.assertLogs("leaderboard.actions", level="WARNING"):
+            await view.show_page(2)
+            await self.settle()
+
+        self.assertEqual(view.current_page, 1)
+        self.assertEqual(self.shown_fields(view), ["0", "1", "2"])
+
+    async def test_pages_are_sliced_from_wrapped_fields(self):
+        view = actions.PaginationView(
+            title="Leaderboards", description="", wrapped_fields=self.items
+        )
+        view.message = mock.AsyncMock()
+
+        await view.show_page(2)
+
+        self.assertEqual(view.total_pages, 2)
+        self.assertEqual(self.shown_fields(view), ["5", "6"])
+
+    async def test_timeout_drops_pages(self):
+        view = self.view(total_items=len(self.items))
+        await view.show_page(1)
+
+        prefetch = view._page_loads[2]
+        await view.on_timeout()
+        await self.settle()
+
+        self.assertTrue(prefetch.cancelled())
+        self.assertEqual(len(view._pages), 0)
+        self.assertEqual(len(view._page_loads), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
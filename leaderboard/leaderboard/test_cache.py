@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from .cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch("time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cache: TTLCache[str] = TTLCache(
+            name="test", maxsize=2, ttl=10, stale_ttl=5
+        )
+
+    def test_fresh_entry(self):
+        self.cache.set("a", "value")
+        self.now += 10
+
+        entry, is_fresh = self.cache.lookup("a")
+        self.assertEqual(entry.value, "value")
+        self.assertTrue(is_fresh)
+        self.assertEqual(self.cache.get("a"), "value")
+
+    def test_stale_entry(self):
+        self.cache.set("a", "value")
+        self.now += 12
+
+        entry, is_fresh = self.cache.lookup("a")
+        self.assertEqual(entry.value, "value")
+        self.assertFalse(is_fresh)
+        # Only fresh value is returned by get, stale one stays for lookup
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIn("a", self.cache)
+        self.assertEqual(self.cache.stats().stale_hits, 2)
+
+    def test_expired_entry_is_evicted(self):
+        self.cache.set("a", "value")
+        self.now += 16
+
+        self.assertEqual(self.cache.lookup("a"), (None, False))
+        self.assertNotIn("a", self.cache)
+        self.assertEqual(self.cache.stats().misses, 1)
+
+    def test_entry_of_other_version_is_missing(self):
+        self.cache.set("a", "value", version=1)
+
+        self.assertEqual(self.cache.get("a", version=1), "value")
+        self.assertIsNone(self.cache.get("a", version=2))
+        self.assertNotIn("a", self.cache)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", "a")
+        self.cache.set("b", "b")
+        self.cache.get("a")
+        self.cache.set("c", "c")
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
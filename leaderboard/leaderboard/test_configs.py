@@ -0,0 +1,122 @@
+import unittest
+import uuid
+from typing import List
+
+from . import data
+from .configs import ConfigChange, ConfigStore, is_same_config
+
+LEADERBOARD_ID = uuid.UUID("4c3d9f5e-8d71-4d7a-a7a5-0d1c8d0b1a2e")
+
+
+def server_config(guild_id: int, short_name: str = "top") -> data.ResourceConfig:
+    return data.ResourceConfig(
+        resource_data=data.Config(
+            type="discord-bot-leaderboard-config",
+            discord_server_id=guild_id,
+            leaderboards=[
+                data.ConfigLeaderboard(
+                    leaderboard_id=LEADERBOARD_ID,
+                    short_name=short_name,
+                    channel_ids=[10],
+                )
+            ],
+        )
+    )
+
+
+def leaderboard_info(title: str = "Top") -> data.LeaderboardInfo:
+    return data.LeaderboardInfo(
+        id=LEADERBOARD_ID, title=title, description="", users_count=10
+    )
+
+
+class TestConfigStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = ConfigStore()
+        self.changes: List[ConfigChange] = []
+        self.store.subscribe(self.changes.append)
+
+    def test_write_publishes_new_snapshot(self):
+        self.store.set(1, server_config(1))
+        snapshot = self.store.snapshot
+
+        self.store.set(2, server_config(2))
+
+        self.assertEqual(list(snapshot), [1])
+        self.assertEqual(list(self.store.snapshot), [1, 2])
+        with self.assertRaises(TypeError):
+            snapshot[3] = server_config(3)  # type: ignore
+
+    def test_apply_notifies_about_changed_guilds(self):
+        config = server_config(1)
+        self.store.set(1, config)
+        self.changes.clear()
+
+        num_of_changed = self.store.apply({1: config, 2: server_config(2)})
+        self.assertEqual(num_of_changed, 1)
+        self.assertEqual([c.guild_id for c in self.changes], [2])
+
+        self.store.remove(1)
+        self.assertEqual(self.changes[-1].guild_id, 1)
+        self.assertIs(self.changes[-1].old, config)
+        self.assertIsNone(self.changes[-1].new)
+        self.assertNotIn(1, self.store)
+
+    def test_replace_all_notifies_once_without_guild(self):
+        self.store.replace_all({1: server_config(1), 2: server_config(2)})
+
+        self.assertEqual(len(self.changes), 1)
+        self.assertIsNone(self.changes[0].guild_id)
+        self.assertEqual(len(self.store), 2)
+
+    def test_leaderboards_info_does_not_mutate_published_config(self):
+        config = server_config(1)
+        self.store.set(1, config)
+        self.changes.clear()
+
+        self.assertEqual(
+            self.store.set_leaderboards_info({LEADERBOARD_ID: leaderboard_info()}), 1
+        )
+        self.assertIsNone(config.resource_data.leaderboards[0].leaderboard_info)
+        self.assertEqual(self.store.leaderboard_infos()[LEADERBOARD_ID].title, "Top")
+        self.assertIs(self.changes[0].old, config)
+
+        # Same info again is not a change
+        self.assertEqual(
+            self.store.set_leaderboards_info({LEADERBOARD_ID: leaderboard_info()}), 0
+        )
+        self.assertEqual(len(self.changes), 1)
+
+    def test_failed_listener_does_not_stop_others(self):
+        def failing_listener(change: ConfigChange) -> None:
+            raise ValueError("boom")
+
+        store = ConfigStore()
+        changes: List[ConfigChange] = []
+        store.subscribe(failing_listener)
+        store.subscribe(changes.append)
+
+        with self.assertLogs("leaderboard.configs", level="ERROR"):
+            store.set(1, server_config(1))
+        self.assertEqual(len(changes), 1)
+
+    def test_unsubscribed_listener_is_not_notified(self):
+        changes: List[ConfigChange] = []
+        unsubscribe = self.store.subscribe(changes.append)
+        unsubscribe()
+
+        self.store.set(1, server_config(1))
+        self.assertEqual(changes, [])
+
+
+class TestIsSameConfig(unittest.TestCase):
+    def test_leaderboard_infos_are_ignored(self):
+        with_info = server_config(1)
+        with_info.resource_data.leaderboards[0].leaderboard_info = leaderboard_info()
+
+        self.assertTrue(is_same_config(server_config(1), with_info))
+        self.assertFalse(is_same_config(server_config(1), server_config(1, "other")))
+
+
+if __name__ == "__main__":
+    unittest.main()
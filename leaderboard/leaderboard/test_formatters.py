@@ -0,0 +1,100 @@
+import unittest
+import uuid
+
+from . import data, formatters, tables
+from .formatters import ScoreFormatter, get_score_formatter, round_number
+
+SCORE_DETAILS = {
+    "prefix": "$",
+    "postfix": " ETH",
+    "conversion": 4,
+    "conversion_vector": "divide",
+}
+
+
+class TestScoreFormatter(unittest.TestCase):
+    def test_plain_scores(self):
+        formatter = ScoreFormatter.from_details({})
+
+        self.assertFalse(formatter.is_converted)
+        self.assertEqual(formatter.format(10), "10")
+        self.assertEqual(formatter.format_many([1, 2]), ["1", "2"])
+
+    def test_converted_scores(self):
+        formatter = ScoreFormatter.from_details(SCORE_DETAILS)
+
+        self.assertTrue(formatter.is_converted)
+        self.assertEqual(formatter.format(10), "$2.5 ETH")
+        self.assertEqual(formatter.convert_many([10, 4]), ["2.5", "1.0"])
+        self.assertEqual(formatter.format_many([10]), ["$2.5 ETH"])
+
+    def test_converted_scores_with_precision(self):
+        formatter = ScoreFormatter.from_details({**SCORE_DETAILS, "conversion": 3})
+
+        self.assertEqual(formatter.convert_many([10], precision=2), ["3.33"])
+        self.assertEqual(formatter.convert_many([9], precision=2), ["3"])
+        # Full value is kept for single score
+        self.assertEqual(formatter.format(10), "$3.3333333333333335 ETH")
+
+    def test_unknown_conversion_and_zero_division_are_ignored(self):
+        details = {"conversion": 2, "conversion_vector": "multiply"}
+        self.assertFalse(ScoreFormatter.from_details(details).is_converted)
+
+        details = {"conversion": 0, "conversion_vector": "divide"}
+        with self.assertLogs("leaderboard.formatters", level="WARNING"):
+            self.assertFalse(ScoreFormatter.from_details(details).is_converted)
+
+    def test_malformed_details(self):
+        with self.assertLogs("leaderboard.formatters", level="WARNING"):
+            formatter = ScoreFormatter.from_details({"conversion": "many"})
+
+        self.assertFalse(formatter.is_converted)
+        self.assertEqual(formatter.format(10), "10")
+
+
+class TestRoundNumber(unittest.TestCase):
+    def test_round_number(self):
+        self.assertEqual(round_number(1 / 3, 2), "0.33")
+        self.assertEqual(round_number(2.0, 2), "2")
+        self.assertEqual(round_number(-0.001, 2), "0")
+        self.assertEqual(round_number(1.5, 0), "2")
+        self.assertEqual(round_number(12345, 2), "12345")
+
+
+class TestGetScoreFormatter(unittest.TestCase):
+    def setUp(self) -> None:
+        formatters.score_formatters_cache.clear()
+
+    def test_formatter_is_cached_by_details(self):
+        l_id = uuid.uuid4()
+        formatter = get_score_formatter(l_id, SCORE_DETAILS)
+
+        self.assertIs(get_score_formatter(l_id, dict(SCORE_DETAILS)), formatter)
+        self.assertIsNot(
+            get_score_formatter(l_id, {**SCORE_DETAILS, "prefix": ""}), formatter
+        )
+
+    def test_empty_details(self):
+        self.assertIs(
+            get_score_formatter(uuid.uuid4(), {}), formatters.PLAIN_SCORE_FORMATTER
+        )
+        self.assertIs(
+            get_score_formatter(uuid.uuid4(), None), formatters.PLAIN_SCORE_FORMATTER
+        )
+
+
+class TestConvertedScoreColumn(unittest.TestCase):
+    def test_converted_scores_are_rounded(self):
+        formatter = ScoreFormatter.from_details({**SCORE_DETAILS, "conversion": 7})
+        column = tables.converted_score_column(formatter, precision=2)
+
+        scores = [
+            data.Score(address="0x1", rank=1, score=1234567, points_data={}),
+            data.Score(address="0x2", rank=2, score=7, points_data={}),
+        ]
+
+        self.assertEqual(column.values(scores), ["176366.71", "1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from .identities import IdentityRecord, IdentityStore
+
+
+class TestIdentityStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = IdentityStore()
+
+    def test_add_identity(self):
+        self.assertNotIn(1, self.store)
+        self.assertTrue(self.store.add(1, IdentityRecord(identifier="0xa", name="a")))
+
+        self.assertIn(1, self.store)
+        self.assertEqual(self.store.find(1, "0xa").name, "a")
+        self.assertEqual(len(self.store), 1)
+
+    def test_add_duplicated_identifier(self):
+        self.store.add(1, IdentityRecord(identifier="0xa", name="a"))
+
+        self.assertFalse(self.store.add(1, IdentityRecord(identifier="0xa", name="b")))
+        self.assertEqual(self.store.find(1, "0xa").name, "a")
+
+    def test_remove_last_identity_removes_user(self):
+        self.store.add(1, IdentityRecord(identifier="0xa", name="a"))
+        self.store.add(1, IdentityRecord(identifier="0xb", name="b"))
+
+        self.assertEqual(self.store.remove(1, "0xa").identifier, "0xa")
+        self.assertIn(1, self.store)
+        self.assertEqual(self.store.remove(1, "0xb").identifier, "0xb")
+        self.assertNotIn(1, self.store)
+        self.assertEqual(len(self.store), 0)
+        self.assertIsNone(self.store.remove(1, "0xb"))
+
+    def test_search_sees_added_and_removed_identities(self):
+        self.store.add(1, IdentityRecord(identifier="0xa", name="whale"))
+        self.assertEqual(len(self.store.search(1, "wha")), 1)
+
+        self.store.add(1, IdentityRecord(identifier="0xb", name="whale shark"))
+        self.assertEqual(len(self.store.search(1, "wha")), 2)
+
+        self.store.remove(1, "0xa")
+        self.assertEqual([i.identifier for i in self.store.search(1, "wha")], ["0xb"])
+
+    def test_get_returns_copy(self):
+        self.store.add(1, IdentityRecord(identifier="0xa", name="a"))
+        identities = self.store.get(1)
+        self.store.remove(1, "0xa")
+
+        self.assertEqual(len(identities), 1)
+
+    def test_snapshot_round_trip(self):
+        self.store.add(1, IdentityRecord(identifier="0xa", name="a"))
+        restored = IdentityStore.from_snapshot(self.store.to_snapshot())
+
+        self.assertIn(1, restored)
+        self.assertEqual(restored.find(1, "0xa").name, "a")
+
+
+class TestIdentityStorePartial(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = IdentityStore(maxsize=2)
+        self.store.set_user(1, [IdentityRecord(identifier="0xa", name="a")])
+
+    def test_not_loaded_user_is_absent(self):
+        self.assertFalse(self.store.is_loaded(2))
+        self.assertNotIn(2, self.store)
+        self.assertIsNone(self.store.remove(2, "0xa"))
+
+    def test_remove_identity(self):
+        self.assertIn(1, self.store)
+        record = self.store.remove(1, "0xa")
+
+        self.assertEqual(record.identifier, "0xa")
+        self.assertNotIn(1, self.store)
+        # User without identities stays loaded and is not fetched again
+        self.assertTrue(self.store.is_loaded(1))
+        self.assertEqual(self.store.get(1), [])
+
+    def test_remove_unknown_identity(self):
+        self.assertIsNone(self.store.remove(1, "0xb"))
+        self.assertIn(1, self.store)
+
+    def test_evicted_user_is_absent(self):
+        self.store.set_user(2, [IdentityRecord(identifier="0xb", name="b")])
+        self.store.set_user(3, [IdentityRecord(identifier="0xc", name="c")])
+
+        self.assertFalse(self.store.is_loaded(1))
+        self.assertNotIn(1, self.store)
+        self.assertIn(3, self.store)
+
+
+if __name__ == "__main__":
+    unittest.main()
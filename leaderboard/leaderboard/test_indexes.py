@@ -0,0 +1,75 @@
+import unittest
+from typing import Tuple
+
+from .indexes import SearchIndex, SearchIndexes
+
+Item = Tuple[str, str]
+
+
+def item_keys(item: Item) -> Tuple[str, str]:
+    return item
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.items = [
+            ("0xabc", "Big Whale"),
+            ("0xdef", "whale watcher"),
+            ("0x123", "Sea Horse"),
+        ]
+        self.index = SearchIndex(items=self.items, keys_func=item_keys)
+
+    def test_prefix_matches_before_substring_matches(self):
+        self.assertEqual(self.index.search("whale"), [self.items[1], self.items[0]])
+
+    def test_search_is_case_insensitive(self):
+        self.assertEqual(self.index.search("SEA"), [self.items[2]])
+        self.assertEqual(self.index.search("0XAB"), [self.items[0]])
+
+    def test_prefix_matches_are_sorted_by_key(self):
+        self.assertEqual(
+            self.index.search("0x"), [self.items[2], self.items[0], self.items[1]]
+        )
+
+    def test_item_matched_by_several_keys_is_found_once(self):
+        item = ("whale", "whale")
+        index = SearchIndex(items=[item], keys_func=item_keys)
+        self.assertEqual(index.search("wha"), [item])
+        self.assertEqual(index.search("hal"), [item])
+
+    def test_empty_query_returns_items_in_order(self):
+        self.assertEqual(self.index.search("", limit=2), self.items[:2])
+
+    def test_limit(self):
+        self.assertEqual(self.index.search("whale", limit=1), [self.items[1]])
+        self.assertEqual(self.index.search("whale", limit=0), [])
+
+    def test_no_matches(self):
+        self.assertEqual(self.index.search("dolphin"), [])
+
+
+class TestSearchIndexes(unittest.TestCase):
+    def test_index_is_built_once_until_invalidated(self):
+        indexes: SearchIndexes[Item] = SearchIndexes(keys_func=item_keys)
+        items = [("0xabc", "whale")]
+
+        self.assertEqual(indexes.search(1, items, "wh"), items)
+        items.append(("0xdef", "whale shark"))
+        self.assertEqual(len(indexes.search(1, items, "wh")), 1)
+
+        indexes.invalidate(1)
+        self.assertEqual(len(indexes.search(1, items, "wh")), 2)
+
+    def test_least_recently_searched_owner_is_evicted(self):
+        indexes: SearchIndexes[Item] = SearchIndexes(keys_func=item_keys, maxsize=2)
+        items = [("0xabc", "whale")]
+        for owner in [1, 2, 1, 3]:
+            indexes.search(owner, items, "wh")
+
+        self.assertEqual(len(indexes), 2)
+        self.assertIn(1, indexes._indexes)
+        self.assertNotIn(2, indexes._indexes)
+
+
+if __name__ == "__main__":
+    unittest.main()
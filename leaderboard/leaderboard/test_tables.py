@@ -0,0 +1,90 @@
+import unittest
+from typing import List
+
+from . import data, tables
+
+
+def scores(num: int) -> List[data.Score]:
+    return [
+        data.Score(
+            address=f"0x{i:040x}",
+            rank=i,
+            score=100 - i,
+            points_data={},
+        )
+        for i in range(1, num + 1)
+    ]
+
+
+class TestFitWidths(unittest.TestCase):
+    def test_widths_within_budget_are_kept(self):
+        self.assertEqual(
+            tables.fit_widths([4, 10, 5], [False, True, False], 30), [4, 10, 5]
+        )
+
+    def test_widest_shrinkable_column_is_narrowed(self):
+        self.assertEqual(
+            tables.fit_widths([4, 42, 5], [False, True, False], 30), [4, 21, 5]
+        )
+
+    def test_shrinkable_columns_are_narrowed_to_same_width(self):
+        self.assertEqual(tables.fit_widths([20, 10], [True, True], 20), [10, 10])
+
+    def test_column_is_not_narrower_than_minimum(self):
+        min_width = len(tables.SHORTCUT) + 2
+        self.assertEqual(
+            tables.fit_widths([28, 42], [False, True], 30), [28, min_width]
+        )
+
+
+class TestTruncate(unittest.TestCase):
+    def test_short_value_is_kept(self):
+        self.assertEqual(tables.truncate("0x1234", 6), "0x1234")
+
+    def test_value_is_truncated_in_middle(self):
+        self.assertEqual(tables.truncate("0x123456789", 9), "0x1...789")
+
+    def test_value_is_cut_when_shortcut_does_not_fit(self):
+        self.assertEqual(tables.truncate("0x123456789", 2), "0x")
+
+
+class TestScoresTable(unittest.TestCase):
+    def test_mobile_table_fits_width_budget(self):
+        table = tables.ScoresTable(
+            tables.score_columns(["rank", "address", "score"]),
+            layout=data.TableLayouts.MOBILE,
+        )
+        lines = table.render(scores(3)).splitlines()
+
+        # Separator wraps widths with "+" and rows with spaces on each side
+        columns_width = len(lines[0]) - 4
+        self.assertLessEqual(
+            columns_width, tables.TABLE_WIDTHS[data.TableLayouts.MOBILE]
+        )
+        self.assertEqual(len({len(line) for line in lines}), 1)
+        self.assertIn(tables.SHORTCUT, lines[3])
+        self.assertEqual(lines[3].split()[0], "1")
+        self.assertEqual(lines[3].split()[-1], "99")
+
+    def test_desktop_table_keeps_full_addresses(self):
+        table = tables.ScoresTable(
+            tables.score_columns(["rank", "address"]),
+            layout=data.TableLayouts.DESKTOP,
+        )
+        rendered = table.render(scores(2))
+
+        self.assertIn(f"0x{1:040x}", rendered)
+        self.assertNotIn(tables.SHORTCUT, rendered)
+
+    def test_delta_column(self):
+        self.assertEqual(
+            tables.score_delta_column().values(scores(3)), ["", "-1", "-1"]
+        )
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            tables.score_columns(["rank", "unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+from . import data
+from .throttling import CommandThrottler, TokenBuckets
+
+
+class TestTokenBuckets(unittest.TestCase):
+    def setUp(self) -> None:
+        self.buckets = TokenBuckets(
+            data.ThrottleScopes.USER, rate=0.5, burst=2, maxsize=2
+        )
+
+    def test_burst_then_refill(self):
+        self.buckets.take(1, now=0)
+        self.buckets.take(1, now=0)
+        self.assertEqual(self.buckets.tokens(1, now=0), 0)
+
+        self.assertEqual(self.buckets.tokens(1, now=1), 0.5)
+        self.assertEqual(self.buckets.tokens(1, now=2), 1)
+        # Bucket is never refilled above burst
+        self.assertEqual(self.buckets.tokens(1, now=100), 2)
+
+    def test_refilled_buckets_are_dropped(self):
+        self.buckets.take(1, now=0)
+        self.buckets.take(2, now=3)
+
+        self.assertEqual(len(self.buckets), 1)
+        self.assertEqual(self.buckets.tokens(1, now=3), 2)
+
+    def test_buckets_are_bounded(self):
+        for key in range(5):
+            self.buckets.take(key, now=0)
+
+        self.assertEqual(len(self.buckets), 2)
+        self.assertEqual(self.buckets.metrics().buckets, 2)
+        self.assertEqual(self.buckets.metrics().allowed, 5)
+
+
+class TestCommandThrottler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        patcher = mock.patch("time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.throttler = CommandThrottler(
+            user_rate=1,
+            user_burst=1,
+            guild_rate=1,
+            guild_burst=2,
+            global_rate=0,
+            global_burst=1,
+            maxsize=10,
+        )
+
+    def test_user_is_throttled_until_refill(self):
+        self.assertIsNone(self.throttler.acquire(user_id=1, guild_id=10))
+        self.assertEqual(
+            self.throttler.acquire(user_id=1, guild_id=10), data.ThrottleScopes.USER
+        )
+
+        self.now += 1
+        self.assertIsNone(self.throttler.acquire(user_id=1, guild_id=10))
+
+    def test_guild_is_throttled_for_other_users(self):
+        self.throttler.acquire(user_id=1, guild_id=10)
+        self.throttler.acquire(user_id=2, guild_id=10)
+
+        self.assertEqual(
+            self.throttler.acquire(user_id=3, guild_id=10), data.ThrottleScopes.GUILD
+        )
+        self.assertIsNone(self.throttler.acquire(user_id=3, guild_id=20))
+
+    def test_throttled_command_does_not_take_tokens(self):
+        self.throttler.acquire(user_id=1, guild_id=10)
+        self.throttler.acquire(user_id=1, guild_id=10)
+
+        # Only first command of user 1 took guild token
+        self.assertIsNone(self.throttler.acquire(user_id=2, guild_id=10))
+
+    def test_disabled_scope_is_not_tracked(self):
+        for user_id in range(5):
+            self.throttler.acquire(user_id=user_id)
+
+        metrics = {m.scope: m for m in self.throttler.metrics()}
+        self.assertEqual(metrics["global"].buckets, 0)
+        self.assertEqual(metrics["global"].allowed, 0)
+        self.assertEqual(metrics["user"].allowed, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from . import data
+from .upstreams import (
+    CircuitBreaker,
+    CircuitOpen,
+    UpstreamLimiter,
+    UpstreamLimitExceeded,
+)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch("time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.breaker = CircuitBreaker(
+            host="example.com", failure_threshold=2, recovery_timeout=30
+        )
+
+    def open_circuit(self) -> None:
+        for _ in range(2):
+            self.breaker.before_request()
+            self.breaker.record_failure(Exception("boom"))
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure(Exception("boom"))
+        self.breaker.record_success()
+        self.breaker.record_failure(Exception("boom"))
+        self.assertEqual(self.breaker.state, data.CircuitStates.CLOSED)
+
+        self.breaker.record_failure(Exception("boom"))
+        self.assertEqual(self.breaker.state, data.CircuitStates.OPEN)
+        self.assertEqual(self.breaker.last_error, "Exception: boom")
+
+    def test_open_circuit_rejects_requests(self):
+        self.open_circuit()
+        self.now += 29
+
+        with self.assertRaises(CircuitOpen):
+            self.breaker.before_request()
+        self.assertEqual(self.breaker.rejected, 1)
+
+    def test_half_open_circuit_allows_one_probe(self):
+        self.open_circuit()
+        self.now += 30
+
+        self.assertTrue(self.breaker.before_request())
+        self.assertEqual(self.breaker.state, data.CircuitStates.HALF_OPEN)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.before_request()
+
+    def test_successful_probe_closes_circuit(self):
+        self.open_circuit()
+        self.now += 30
+        self.breaker.before_request()
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, data.CircuitStates.CLOSED)
+        self.assertFalse(self.breaker.before_request())
+
+    def test_failed_probe_opens_circuit(self):
+        self.open_circuit()
+        self.now += 30
+        self.breaker.before_request()
+        self.breaker.record_failure(Exception("boom"))
+
+        self.assertEqual(self.breaker.state, data.CircuitStates.OPEN)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.before_request()
+
+    def test_aborted_probe_is_released(self):
+        self.open_circuit()
+        self.now += 30
+        self.breaker.before_request()
+        self.breaker.abort_probe()
+
+        self.assertTrue(self.breaker.before_request())
+
+
+class TestUpstreamLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_limits_concurrent_requests(self):
+        limiter = UpstreamLimiter(name="test", limit=2)
+        release = asyncio.Event()
+        max_in_flight = 0
+
+        async def request() -> None:
+            nonlocal max_in_flight
+            async with limiter:
+                max_in_flight = max(max_in_flight, limiter.in_flight)
+                await release.wait()
+
+        tasks = [asyncio.create_task(request()) for _ in range(4)]
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.in_flight, 2)
+        self.assertEqual(limiter.waiting, 2)
+
+        release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(max_in_flight, 2)
+        self.assertEqual(limiter.metrics().acquired, 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_rejects_request_after_max_wait(self):
+        limiter = UpstreamLimiter(name="test", limit=1, max_wait=0.01)
+        await limiter.acquire()
+
+        with self.assertRaises(UpstreamLimitExceeded):
+            await limiter.acquire()
+        self.assertEqual(limiter.rejected, 1)
+        self.assertEqual(limiter.waiting, 0)
+
+        limiter.release()
+        await limiter.acquire()
+        self.assertEqual(limiter.in_flight, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+from . import data
+from .settings import (
+    LEADERBOARD_DISCORD_BOT_GLOBAL_BURST,
+    LEADERBOARD_DISCORD_BOT_GLOBAL_RATE,
+    LEADERBOARD_DISCORD_BOT_GUILD_BURST,
+    LEADERBOARD_DISCORD_BOT_GUILD_RATE,
+    LEADERBOARD_DISCORD_BOT_THROTTLE_BUCKETS_SIZE,
+    LEADERBOARD_DISCORD_BOT_USER_BURST,
+    LEADERBOARD_DISCORD_BOT_USER_RATE,
+)
+
+
+class TokenBuckets:
+    """
+    Token buckets by key kept in LRU bounded map.
+
+    Bucket is (tokens, updated_at) tuple stored only while it is not full,
+    absent key means full bucket. Map is ordered by updated_at, so refilled
+    buckets are dropped from its head. Evicted key of not refilled bucket at
+    worst gets its burst back earlier.
+    """
+
+    def __init__(
+        self, scope: data.ThrottleScopes, rate: float, burst: int, maxsize: int
+    ) -> None:
+        self.scope = scope
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.maxsize = max(maxsize, 1)
+
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+        self.allowed = 0
+        self.throttled = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.rate > 0
+
+    def tokens(self, key: Hashable, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(self.burst)
+        tokens, updated_at = bucket
+        return min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+    def take(self, key: Hashable, now: float) -> None:
+        self._buckets[key] = (self.tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize or (
+            self.tokens(next(iter(self._buckets)), now) >= self.burst
+        ):
+            self._buckets.popitem(last=False)
+        self.allowed += 1
+
+    def metrics(self) -> data.ThrottleScopeMetrics:
+        return data.ThrottleScopeMetrics(
+            scope=self.scope.value,
+            rate=self.rate,
+            burst=self.burst,
+            buckets=len(self._buckets),
+            max_buckets=self.maxsize,
+            allowed=self.allowed,
+            throttled=self.throttled,
+        )
+
+
+class CommandThrottler:
+    """
+    Slash commands limits per user, per guild and global.
+
+    Command takes token from every scope only if all of them have one, so
+    throttled command does not drain other scopes.
+    """
+
+    def __init__(
+        self,
+        user_rate: float = LEADERBOARD_DISCORD_BOT_USER_RATE,
+        user_burst: int = LEADERBOARD_DISCORD_BOT_USER_BURST,
+        guild_rate: float = LEADERBOARD_DISCORD_BOT_GUILD_RATE,
+        guild_burst: int = LEADERBOARD_DISCORD_BOT_GUILD_BURST,
+        global_rate: float = LEADERBOARD_DISCORD_BOT_GLOBAL_RATE,
+        global_burst: int = LEADERBOARD_DISCORD_BOT_GLOBAL_BURST,
+        maxsize: int = LEADERBOARD_DISCORD_BOT_THROTTLE_BUCKETS_SIZE,
+    ) -> None:
+        self.user_buckets = TokenBuckets(
+            data.ThrottleScopes.USER, user_rate, user_burst, maxsize
+        )
+        self.guild_buckets = TokenBuckets(
+            data.ThrottleScopes.GUILD, guild_rate, guild_burst, maxsize
+        )
+        self.global_buckets = TokenBuckets(
+            data.ThrottleScopes.GLOBAL, global_rate, global_burst, 1
+        )
+
+    def acquire(
+        self, user_id: int, guild_id: Optional[int] = None
+    ) -> Optional[data.ThrottleScopes]:
+        """
+        Take tokens for command, returns scope which throttled it or None
+        if command is allowed.
+        """
+        now = time.monotonic()
+        checks: List[Tuple[TokenBuckets, Hashable]] = [
+            (self.user_buckets, user_id),
+            (self.global_buckets, None),
+        ]
+        if guild_id is not None:
+            checks.insert(1, (self.guild_buckets, guild_id))
+        checks = [(b, k) for b, k in checks if b.is_enabled]
+
+        for buckets, key in checks:
+            if buckets.tokens(key, now) < 1:
+                buckets.throttled += 1
+                return buckets.scope
+
+        for buckets, key in checks:
+            buckets.take(key, now)
+        return None
+
+    def metrics(self) -> List[data.ThrottleScopeMetrics]:
+        return [
+            self.user_buckets.metrics(),
+            self.guild_buckets.metrics(),
+            self.global_buckets.metrics(),
+        ]
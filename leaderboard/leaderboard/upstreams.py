@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from . import data
+from .settings import (
+    BUGOUT_BROOD_URL,
+    DISCORD_API_URL,
+    LEADERBOARD_BROOD_CONCURRENCY,
+    LEADERBOARD_CIRCUIT_FAILURE_THRESHOLD,
+    LEADERBOARD_CIRCUIT_RECOVERY_TIMEOUT,
+    LEADERBOARD_DISCORD_API_CONCURRENCY,
+    LEADERBOARD_ENGINE_API_CONCURRENCY,
+    LEADERBOARD_UPSTREAM_MAX_WAIT,
+    MOONSTREAM_ENGINE_API_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_URLS: Dict[data.Upstreams, str] = {
+    data.Upstreams.ENGINE_API: MOONSTREAM_ENGINE_API_URL,
+    data.Upstreams.BROOD: BUGOUT_BROOD_URL,
+    data.Upstreams.DISCORD: DISCORD_API_URL,
+}
+
+UPSTREAM_CONCURRENCY: Dict[data.Upstreams, int] = {
+    data.Upstreams.ENGINE_API: LEADERBOARD_ENGINE_API_CONCURRENCY,
+    data.Upstreams.BROOD: LEADERBOARD_BROOD_CONCURRENCY,
+    data.Upstreams.DISCORD: LEADERBOARD_DISCORD_API_CONCURRENCY,
+}
+
+
+class UpstreamLimitExceeded(Exception):
+    """
+    Raised when request waited for upstream slot longer than allowed.
+    """
+
+
+class CircuitOpen(Exception):
+    """
+    Raised when upstream host circuit is open and request fails fast.
+    """
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of upstream host. When threshold reached
+    circuit opens and requests are rejected until recovery timeout passed,
+    then one probe request is allowed to close it back.
+    """
+
+    def __init__(
+        self, host: str, failure_threshold: int, recovery_timeout: float
+    ) -> None:
+        self.host = host
+        self.failure_threshold = max(failure_threshold, 1)
+        self.recovery_timeout = recovery_timeout
+
+        self.state = data.CircuitStates.CLOSED
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+        self._opened_at: Optional[float] = None
+        self._opened_at_dt: Optional[datetime] = None
+        self._probe_in_flight = False
+
+    def before_request(self) -> bool:
+        """
+        Raises CircuitOpen if request is not allowed, returns True if request
+        is probe of half-open circuit.
+        """
+        if self.state == data.CircuitStates.OPEN:
+            if (
+                self._opened_at is not None
+                and time.monotonic() - self._opened_at < self.recovery_timeout
+            ):
+                self.rejected += 1
+                raise CircuitOpen(f"Circuit for {self.host} is open, request rejected")
+            self.state = data.CircuitStates.HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == data.CircuitStates.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpen(
+                    f"Circuit for {self.host} is half-open, probe request in flight"
+                )
+            self._probe_in_flight = True
+            return True
+
+        return False
+
+    def abort_probe(self) -> None:
+        """
+        Release probe which finished without outcome, e.g. was cancelled,
+        so next request could probe host.
+        """
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != data.CircuitStates.CLOSED:
+            logger.info(f"Circuit for {self.host} closed")
+            self.state = data.CircuitStates.CLOSED
+            self._opened_at = None
+            self._opened_at_dt = None
+
+    def record_failure(self, error: Exception) -> None:
+        self.consecutive_failures += 1
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self._probe_in_flight = False
+        if (
+            self.state == data.CircuitStates.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != data.CircuitStates.OPEN:
+                logger.warning(
+                    f"Circuit for {self.host} opened after {self.consecutive_failures} failures, last error: {self.last_error}"
+                )
+            self.state = data.CircuitStates.OPEN
+            self._opened_at = time.monotonic()
+            self._opened_at_dt = datetime.now(timezone.utc)
+
+    def metrics(self) -> data.CircuitBreakerMetrics:
+        return data.CircuitBreakerMetrics(
+            host=self.host,
+            state=self.state,
+            consecutive_failures=self.consecutive_failures,
+            failures=self.failures,
+            rejected=self.rejected,
+            last_error=self.last_error,
+            opened_at=self._opened_at_dt,
+        )
+
+
+class UpstreamLimiter:
+    """
+    Limits number of concurrent requests to upstream and tracks queue depth.
+
+    Semaphore is created lazily for running event loop, so limiter could be
+    defined at import time and used by cli and bot loops.
+    """
+
+    def __init__(self, name: str, limit: int, max_wait: float = 0) -> None:
+        self.name = name
+        self.limit = max(limit, 1)
+        self.max_wait = max_wait
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    async def acquire(self) -> None:
+        semaphore = self._get_semaphore()
+
+        started_at = time.monotonic()
+        self.waiting += 1
+        if self.waiting > self.max_waiting:
+            self.max_waiting = self.waiting
+        try:
+            if self.max_wait > 0 and semaphore.locked():
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait)
+            else:
+                await semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise UpstreamLimitExceeded(
+                f"Waited more than {self.max_wait}s for free {self.name} upstream slot, {self.waiting} requests in queue"
+            )
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.acquired += 1
+        self.total_wait += time.monotonic() - started_at
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    async def __aenter__(self) -> "UpstreamLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.release()
+
+    def metrics(self) -> data.UpstreamLimiterMetrics:
+        return data.UpstreamLimiterMetrics(
+            upstream=self.name,
+            limit=self.limit,
+            in_flight=self.in_flight,
+            waiting=self.waiting,
+            max_waiting=self.max_waiting,
+            acquired=self.acquired,
+            rejected=self.rejected,
+            avg_wait=self.total_wait / self.acquired if self.acquired != 0 else 0,
+        )
+
+
+_limiters: Dict[data.Upstreams, UpstreamLimiter] = {
+    upstream: UpstreamLimiter(
+        name=upstream.value,
+        limit=limit,
+        max_wait=LEADERBOARD_UPSTREAM_MAX_WAIT,
+    )
+    for upstream, limit in UPSTREAM_CONCURRENCY.items()
+}
+
+
+def detect_upstream(url: str) -> Optional[data.Upstreams]:
+    for upstream, upstream_url in UPSTREAM_URLS.items():
+        if url.startswith(upstream_url):
+            return upstream
+    return None
+
+
+def get_limiter(upstream: data.Upstreams) -> UpstreamLimiter:
+    return _limiters[upstream]
+
+
+def limiters_metrics() -> List[data.UpstreamLimiterMetrics]:
+    return [l.metrics() for l in _limiters.values()]
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    host = urlparse(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            host=host,
+            failure_threshold=LEADERBOARD_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=LEADERBOARD_CIRCUIT_RECOVERY_TIMEOUT,
+        )
+        _breakers[host] = breaker
+    return breaker
+
+
+def breakers_metrics() -> List[data.CircuitBreakerMetrics]:
+    return [b.metrics() for b in _breakers.values()]